@@ -0,0 +1,67 @@
+"""add best-seller scores
+
+Revision ID: bestsellers
+Revises: sales_rollups
+Create Date: 2026-04-20 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bestsellers'
+down_revision: Union[str, None] = 'sales_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_sales_scores',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_table(
+        'category_sales_scores',
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('category_id')
+    )
+    op.create_table(
+        'ranking_watermarks',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('position', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('decay_epoch', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('half_life_seconds', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('name')
+    )
+    # The first refresh scores the last 60 days of sales; older ones would
+    # weigh little after this many half-lives anyway. The decay epoch and
+    # half-life are set by that refresh.
+    op.execute("INSERT INTO ranking_watermarks (name, position) VALUES ('bestsellers', NOW() - interval '60 days')")
+
+    with op.get_context().autocommit_block():
+        # Each refresh reads the payments completed since the watermark
+        op.create_index(
+            'ix_payments_completed_at', 'payments', ['completed_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_payments_completed_at', table_name='payments',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_table('ranking_watermarks')
+    op.drop_table('category_sales_scores')
+    op.drop_table('product_sales_scores')
@@ -0,0 +1,113 @@
+"""add set-based product card refresh for bulk loads
+
+Revision ID: bulk_load
+Revises: outbox
+Create Date: 2026-02-23 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bulk_load'
+down_revision: Union[str, None] = 'outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CARD_COLUMNS = """
+    product_id, sku, name, category_id, brand, gender,
+    age_min_months, age_max_months, mrp, selling_price, discount_percent,
+    primary_image_url, rating_avg, rating_count, order_count, stock_available,
+    is_active, is_featured, created_at, refreshed_at
+"""
+
+CARD_SELECT = """
+    SELECT p.id, p.sku, p.name, p.category_id, p.brand, p.gender,
+           p.age_min_months, p.age_max_months, p.mrp, p.selling_price, p.discount_percent,
+           (SELECT pi.image_url FROM product_images pi
+             WHERE pi.product_id = p.id AND pi.is_primary = TRUE
+             ORDER BY pi.display_order, pi.id LIMIT 1),
+           p.rating_avg, p.rating_count, p.order_count,
+           COALESCE(GREATEST(0, i.quantity_available - i.quantity_reserved), 0),
+           p.is_active, p.is_featured, p.created_at, NOW()
+    FROM products p
+    LEFT JOIN inventory i ON i.product_id = p.id
+"""
+
+# Bulk loaders SET LOCAL app.bulk_load = 'on' to skip the per-row card
+# triggers, then call refresh_product_cards() once for the ids they touched
+SKIP_IN_BULK_LOAD = """
+            IF current_setting('app.bulk_load', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+"""
+
+
+def _sync_functions(guard: str) -> None:
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION product_cards_sync_product()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN{guard}
+            PERFORM refresh_product_card(NEW.id);
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION product_cards_sync_child()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN{guard}
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM refresh_product_card(OLD.product_id);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE')
+               AND (TG_OP = 'INSERT' OR NEW.product_id IS DISTINCT FROM OLD.product_id) THEN
+                PERFORM refresh_product_card(NEW.product_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    updates = ",\n                ".join(
+        f"{c} = EXCLUDED.{c}" for c in (c.strip() for c in CARD_COLUMNS.split(",")) if c != "product_id"
+    )
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION refresh_product_cards(p_product_ids INTEGER[])
+        RETURNS INTEGER
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_count INTEGER;
+        BEGIN
+            INSERT INTO product_cards ({CARD_COLUMNS})
+            {CARD_SELECT}
+            WHERE p.id = ANY(p_product_ids)
+            ON CONFLICT (product_id) DO UPDATE SET
+                {updates};
+            GET DIAGNOSTICS v_count = ROW_COUNT;
+
+            DELETE FROM product_cards c
+            WHERE c.product_id = ANY(p_product_ids)
+              AND NOT EXISTS (SELECT 1 FROM products p WHERE p.id = c.product_id);
+
+            RETURN v_count;
+        END;
+        $$;
+    """)
+    _sync_functions(SKIP_IN_BULK_LOAD.rstrip())
+
+
+def downgrade() -> None:
+    _sync_functions("")
+    op.execute("DROP FUNCTION IF EXISTS refresh_product_cards(INTEGER[])")
@@ -0,0 +1,48 @@
+"""add catalog generation counter
+
+Revision ID: catalog_generation
+Revises: category_paths
+Create Date: 2026-02-09 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'catalog_generation'
+down_revision: Union[str, None] = 'category_paths'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A sequence rather than a counter row: nextval() never blocks concurrent
+    # writers, and a bump from a rolled-back statement only costs a revalidation.
+    op.execute("CREATE SEQUENCE IF NOT EXISTS catalog_generation_seq")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_generation()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            PERFORM nextval('catalog_generation_seq');
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    for table in ('product_cards', 'categories'):
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_catalog_generation
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_generation()
+        """)
+
+
+def downgrade() -> None:
+    for table in ('categories', 'product_cards'):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_catalog_generation ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_generation()")
+    op.execute("DROP SEQUENCE IF EXISTS catalog_generation_seq")
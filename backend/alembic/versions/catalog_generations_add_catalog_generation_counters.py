@@ -0,0 +1,151 @@
+"""version the catalog on committed per-scope counters
+
+Revision ID: catalog_generations
+Revises: bestsellers
+Create Date: 2026-04-27 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'catalog_generations'
+down_revision: Union[str, None] = 'bestsellers'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# What a listing shows and filters on. order_count and stock_available change
+# with every order and stock movement and are covered per product by the
+# `product` invalidation; refreshed_at changes on every card refresh.
+CARD_CONTENT_COLUMNS = [
+    'sku', 'name', 'category_id', 'brand', 'gender', 'age_min_months', 'age_max_months',
+    'mrp', 'selling_price', 'discount_percent', 'primary_image_url', 'rating_avg',
+    'rating_count', 'is_active', 'is_featured', 'created_at',
+]
+
+# (trigger, event, transition tables)
+CARD_TRIGGERS = [
+    ('trg_product_cards_generation_insert', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('trg_product_cards_generation_update', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('trg_product_cards_generation_delete', 'DELETE', 'OLD TABLE AS old_rows'),
+]
+
+
+def upgrade() -> None:
+    # A counter row rather than a sequence: nextval() is visible before the
+    # writer commits, so a reader could cache old rows under the new value.
+    # An UPDATE becomes visible exactly when the change does, at the price of
+    # serializing concurrent catalog edits on the row until they commit.
+    op.create_table(
+        'catalog_generations',
+        sa.Column('scope', sa.String(length=20), nullable=False),
+        sa.Column('generation', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('scope')
+    )
+    op.execute("""
+        INSERT INTO catalog_generations (scope, generation)
+        SELECT scope, last_value FROM catalog_generation_seq, (VALUES ('products'), ('categories')) AS s(scope)
+    """)
+
+    for table in ('categories', 'product_cards'):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_catalog_generation ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_generation()")
+    op.execute("DROP SEQUENCE IF EXISTS catalog_generation_seq")
+
+    # TG_ARGV[0] is the scope; the notification is delivered on commit
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_generation()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE catalog_generations SET generation = generation + 1 WHERE scope = TG_ARGV[0];
+            PERFORM notify_invalidation('catalog', TG_ARGV[0]);
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_categories_catalog_generation
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categories
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_generation('categories')
+    """)
+
+    # Card refreshes rewrite every column, so only bump when a statement
+    # inserted, deleted or changed the content of some card
+    old = ", ".join(f"o.{c}" for c in CARD_CONTENT_COLUMNS)
+    new = ", ".join(f"n.{c}" for c in CARD_CONTENT_COLUMNS)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION bump_catalog_generation_on_card_change()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                IF NOT EXISTS (SELECT 1 FROM new_rows) THEN
+                    RETURN NULL;
+                END IF;
+            ELSIF TG_OP = 'DELETE' THEN
+                IF NOT EXISTS (SELECT 1 FROM old_rows) THEN
+                    RETURN NULL;
+                END IF;
+            ELSIF NOT EXISTS (
+                SELECT 1 FROM old_rows o JOIN new_rows n USING (product_id)
+                WHERE ({old}) IS DISTINCT FROM ({new})
+            ) THEN
+                RETURN NULL;
+            END IF;
+            UPDATE catalog_generations SET generation = generation + 1 WHERE scope = 'products';
+            PERFORM notify_invalidation('catalog', 'products');
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    # A trigger with transition tables takes a single event
+    for name, event, tables in CARD_TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER {event} ON product_cards
+            REFERENCING {tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_generation_on_card_change()
+        """)
+    op.execute("""
+        CREATE TRIGGER trg_product_cards_generation_truncate
+        AFTER TRUNCATE ON product_cards
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_generation('products')
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_product_cards_generation_truncate ON product_cards")
+    for name, _, _ in reversed(CARD_TRIGGERS):
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON product_cards")
+    op.execute("DROP TRIGGER IF EXISTS trg_categories_catalog_generation ON categories")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_generation_on_card_change()")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_generation()")
+
+    op.execute("CREATE SEQUENCE IF NOT EXISTS catalog_generation_seq")
+    op.execute("SELECT setval('catalog_generation_seq', (SELECT MAX(generation) + 1 FROM catalog_generations))")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_generation()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            PERFORM nextval('catalog_generation_seq');
+            PERFORM notify_invalidation('catalog', '');
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    for table in ('product_cards', 'categories'):
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_catalog_generation
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_generation()
+        """)
+    op.drop_table('catalog_generations')
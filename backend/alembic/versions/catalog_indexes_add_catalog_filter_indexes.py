@@ -0,0 +1,80 @@
+"""add catalog filter indexes
+
+Revision ID: catalog_indexes
+Revises: product_cards
+Create Date: 2026-01-19 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'catalog_indexes'
+down_revision: Union[str, None] = 'product_cards'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Listing queries read product_cards and always filter on is_active, so every
+# index is partial on active rows and ends with product_id for stable paging.
+INDEXES = [
+    ('ix_product_cards_category_created', ['category_id', sa.text('created_at DESC'), 'product_id']),
+    ('ix_product_cards_category_price', ['category_id', 'selling_price', 'product_id']),
+    ('ix_product_cards_category_rating', ['category_id', sa.text('rating_avg DESC'), 'product_id']),
+    ('ix_product_cards_gender_created', ['gender', sa.text('created_at DESC'), 'product_id']),
+    ('ix_product_cards_price', ['selling_price', 'product_id']),
+]
+
+
+# int4range() raises on a lower bound above the upper one, which would fail
+# the age index build and every later card write, so inverted windows are
+# swapped and then ruled out on products and on the cards copied from them
+AGE_WINDOW_CHECKS = [
+    ('ck_products_age_window', 'products'),
+    ('ck_product_cards_age_window', 'product_cards'),
+]
+
+
+def upgrade() -> None:
+    for name, table in AGE_WINDOW_CHECKS:
+        op.execute(f"""
+            UPDATE {table} SET age_min_months = age_max_months, age_max_months = age_min_months
+            WHERE age_min_months > age_max_months
+        """)
+        # NOT VALID then VALIDATE: the scan only takes a SHARE UPDATE EXCLUSIVE lock
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} CHECK (age_min_months <= age_max_months) NOT VALID")
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name, 'product_cards', columns,
+                postgresql_where=sa.text('is_active'),
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+        # Age window overlap: int4range(age_min, age_max, '[]') @> :age_months
+        op.create_index(
+            'ix_product_cards_age_range', 'product_cards',
+            [sa.text("int4range(age_min_months, age_max_months, '[]')")],
+            postgresql_using='gist',
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_product_cards_age_range', table_name='product_cards',
+                      postgresql_concurrently=True, if_exists=True)
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='product_cards',
+                          postgresql_concurrently=True, if_exists=True)
+
+    for name, table in reversed(AGE_WINDOW_CHECKS):
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
@@ -0,0 +1,105 @@
+"""add category materialized path
+
+Revision ID: category_paths
+Revises: product_sorts
+Create Date: 2026-02-02 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'category_paths'
+down_revision: Union[str, None] = 'product_sorts'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # path is '/<root id>/.../<own id>/', so a subtree is a prefix match
+    op.add_column('categories', sa.Column('path', sa.String(length=255), nullable=True))
+
+    op.execute("""
+        WITH RECURSIVE tree AS (
+            SELECT id, '/' || id || '/' AS path
+            FROM categories
+            WHERE parent_id IS NULL
+            UNION ALL
+            SELECT c.id, t.path || c.id || '/'
+            FROM categories c
+            JOIN tree t ON c.parent_id = t.id
+        )
+        UPDATE categories c
+        SET path = tree.path
+        FROM tree
+        WHERE tree.id = c.id
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION categories_set_path()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_parent_path VARCHAR(255);
+        BEGIN
+            IF NEW.parent_id IS NULL THEN
+                NEW.path := '/' || NEW.id || '/';
+                RETURN NEW;
+            END IF;
+
+            SELECT path INTO v_parent_path FROM categories WHERE id = NEW.parent_id;
+            IF v_parent_path IS NULL THEN
+                RAISE EXCEPTION 'Parent category % not found', NEW.parent_id;
+            END IF;
+            IF v_parent_path LIKE '%/' || NEW.id || '/%' THEN
+                RAISE EXCEPTION 'Category % cannot be moved under its own descendant', NEW.id;
+            END IF;
+
+            NEW.path := v_parent_path || NEW.id || '/';
+            RETURN NEW;
+        END;
+        $$;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION categories_move_subtree()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF NEW.path IS DISTINCT FROM OLD.path THEN
+                UPDATE categories
+                SET path = NEW.path || substring(path FROM length(OLD.path) + 1)
+                WHERE path LIKE OLD.path || '%' AND id <> NEW.id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_categories_set_path
+        BEFORE INSERT OR UPDATE OF parent_id ON categories
+        FOR EACH ROW EXECUTE FUNCTION categories_set_path()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_categories_move_subtree
+        AFTER UPDATE OF parent_id ON categories
+        FOR EACH ROW EXECUTE FUNCTION categories_move_subtree()
+    """)
+
+    op.create_index(
+        'ix_categories_path', 'categories',
+        [sa.text('path varchar_pattern_ops')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_categories_path', table_name='categories')
+    op.execute("DROP TRIGGER IF EXISTS trg_categories_move_subtree ON categories")
+    op.execute("DROP TRIGGER IF EXISTS trg_categories_set_path ON categories")
+    op.execute("DROP FUNCTION IF EXISTS categories_move_subtree()")
+    op.execute("DROP FUNCTION IF EXISTS categories_set_path()")
+    op.drop_column('categories', 'path')
@@ -0,0 +1,100 @@
+"""add invalidation notifications
+
+Revision ID: invalidation_bus
+Revises: token_revocation
+Create Date: 2026-03-09 10:00:00
+
+"""
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'invalidation_bus'
+down_revision: Union[str, None] = 'token_revocation'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROCEDURES_DIR = Path(__file__).resolve().parents[2] / 'procedures'
+
+
+def _bump_catalog_generation(notify: str) -> None:
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION bump_catalog_generation()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            PERFORM nextval('catalog_generation_seq');{notify}
+            RETURN NULL;
+        END;
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    op.execute((PROCEDURES_DIR / 'notify_invalidation.sql').read_text())
+    # Dispatchers are woken by every appended event from now on
+    op.execute((PROCEDURES_DIR / 'append_outbox_event.sql').read_text())
+
+    _bump_catalog_generation("""
+            PERFORM notify_invalidation('catalog', '');""")
+
+    # Every stock change (the inventory procedures, order, payment and refund
+    # procedures, admin edits) invalidates that product's cached detail. Bulk
+    # loaders skip the per-row trigger and publish the ids they touched.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION inventory_notify_invalidation()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF current_setting('app.bulk_load', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM notify_invalidation('product', OLD.product_id::TEXT);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM notify_invalidation('product', NEW.product_id::TEXT);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_inventory_invalidation
+        AFTER INSERT OR UPDATE OR DELETE ON inventory
+        FOR EACH ROW EXECUTE FUNCTION inventory_notify_invalidation()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_inventory_invalidation ON inventory")
+    op.execute("DROP FUNCTION IF EXISTS inventory_notify_invalidation()")
+    _bump_catalog_generation("")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION append_outbox_event(
+            p_aggregate_type VARCHAR(30),
+            p_aggregate_id INTEGER,
+            p_event_type VARCHAR(50),
+            p_payload JSONB
+        )
+        RETURNS BIGINT
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_event_id BIGINT;
+        BEGIN
+            INSERT INTO outbox (aggregate_type, aggregate_id, event_type, payload)
+            VALUES (p_aggregate_type, p_aggregate_id, p_event_type, COALESCE(p_payload, '{}'::JSONB))
+            RETURNING id INTO v_event_id;
+
+            RETURN v_event_id;
+        END;
+        $$;
+    """)
+    op.execute("DROP FUNCTION IF EXISTS notify_invalidation(VARCHAR, TEXT)")
@@ -0,0 +1,175 @@
+"""add order archive tables
+
+Revision ID: order_archive
+Revises: partitioning
+Create Date: 2026-03-30 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'order_archive'
+down_revision: Union[str, None] = 'partitioning'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ORDER_COLUMNS = (
+    "id, order_number, user_id, address_id, subtotal, discount_amount, coupon_id, "
+    "delivery_fee, platform_fee, total_amount, status, payment_status, "
+    "shipping_address_snapshot, notes, estimated_delivery, shipped_at, delivered_at, "
+    "cancelled_at, cancellation_reason, created_at, updated_at"
+)
+ITEM_COLUMNS = (
+    "id, order_id, product_id, product_name, product_sku, product_image_url, "
+    "quantity, unit_price, discount_percent, total_price, created_at"
+)
+
+# Rows that keep their order_id when the order moves to the archive. Their
+# foreign keys to orders are replaced by constraint triggers that accept an
+# id in orders or orders_archive.
+ORDER_REFERENCES = [
+    ('payments_order_id_fkey', 'payments'),
+    ('refunds_order_id_fkey', 'refunds'),
+    ('coupon_usage_order_id_fkey', 'coupon_usage'),
+]
+ORDER_TABLES = ('orders', 'orders_archive')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'orders_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_number', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('address_id', sa.Integer(), nullable=False),
+        sa.Column('subtotal', sa.Numeric(10, 2), nullable=False),
+        sa.Column('discount_amount', sa.Numeric(10, 2), nullable=True),
+        sa.Column('coupon_id', sa.Integer(), nullable=True),
+        sa.Column('delivery_fee', sa.Numeric(10, 2), nullable=True),
+        sa.Column('platform_fee', sa.Numeric(10, 2), nullable=True),
+        sa.Column('total_amount', sa.Numeric(10, 2), nullable=False),
+        sa.Column('status', postgresql.ENUM(name='orderstatus', create_type=False), nullable=False),
+        sa.Column('payment_status', sa.String(length=20), nullable=True),
+        sa.Column('shipping_address_snapshot', sa.Text(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('estimated_delivery', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('shipped_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('cancelled_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('cancellation_reason', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('order_number')
+    )
+    op.create_index(
+        'ix_orders_archive_user_id_created_at', 'orders_archive', ['user_id', 'created_at', 'id'], unique=False
+    )
+    op.create_table(
+        'order_items_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('product_name', sa.String(length=255), nullable=False),
+        sa.Column('product_sku', sa.String(length=50), nullable=False),
+        sa.Column('product_image_url', sa.String(length=500), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('discount_percent', sa.Numeric(5, 2), nullable=True),
+        sa.Column('total_price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['orders_archive.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_order_items_archive_order_id', 'order_items_archive', ['order_id'], unique=False)
+
+    # Like a foreign key, the referenced row is locked FOR KEY SHARE so it
+    # cannot be deleted before this transaction ends. An order being archived
+    # is locked by the archive job; the lock waits for it and the archive
+    # lookup then finds the moved row.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION check_order_reference()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF NEW.order_id IS NULL THEN
+                RETURN NULL;
+            END IF;
+            PERFORM 1 FROM orders WHERE id = NEW.order_id FOR KEY SHARE;
+            IF NOT FOUND THEN
+                PERFORM 1 FROM orders_archive WHERE id = NEW.order_id FOR KEY SHARE;
+            END IF;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'insert or update on table "%" violates foreign key constraint "%"',
+                    TG_TABLE_NAME, TG_NAME
+                    USING ERRCODE = 'foreign_key_violation',
+                          DETAIL = format('Key (order_id)=(%s) is not present in orders or orders_archive.', NEW.order_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    # Deferred to commit, so moving an order between the two tables in one
+    # transaction (the archive job, the downgrade) never sees it missing
+    op.execute("""
+        CREATE OR REPLACE FUNCTION check_order_unreferenced()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM orders WHERE id = OLD.id)
+               AND NOT EXISTS (SELECT 1 FROM orders_archive WHERE id = OLD.id)
+               AND (EXISTS (SELECT 1 FROM payments WHERE order_id = OLD.id)
+                    OR EXISTS (SELECT 1 FROM refunds WHERE order_id = OLD.id)
+                    OR EXISTS (SELECT 1 FROM coupon_usage WHERE order_id = OLD.id)) THEN
+                RAISE EXCEPTION 'update or delete on table "%" violates foreign key constraint "%"',
+                    TG_TABLE_NAME, TG_NAME
+                    USING ERRCODE = 'foreign_key_violation',
+                          DETAIL = format('Key (id)=(%s) is still referenced by payments, refunds or coupon_usage.', OLD.id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    for name, table in ORDER_REFERENCES:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        op.execute(f"""
+            CREATE CONSTRAINT TRIGGER {name}
+            AFTER INSERT OR UPDATE OF order_id ON {table}
+            FOR EACH ROW EXECUTE FUNCTION check_order_reference()
+        """)
+    for table in ORDER_TABLES:
+        op.execute(f"""
+            CREATE CONSTRAINT TRIGGER {table}_referenced_check
+            AFTER DELETE OR UPDATE OF id ON {table}
+            DEFERRABLE INITIALLY DEFERRED
+            FOR EACH ROW EXECUTE FUNCTION check_order_unreferenced()
+        """)
+
+
+def downgrade() -> None:
+    for table in ORDER_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_referenced_check ON {table}")
+    for name, table in ORDER_REFERENCES:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS check_order_unreferenced()")
+    op.execute("DROP FUNCTION IF EXISTS check_order_reference()")
+
+    # Bring archived orders back so the foreign keys can be restored
+    op.execute(f"INSERT INTO orders ({ORDER_COLUMNS}) SELECT {ORDER_COLUMNS} FROM orders_archive")
+    op.execute(f"INSERT INTO order_items ({ITEM_COLUMNS}) SELECT {ITEM_COLUMNS} FROM order_items_archive")
+    for name, table in ORDER_REFERENCES:
+        op.create_foreign_key(name, table, 'orders', ['order_id'], ['id'])
+
+    op.drop_index('ix_order_items_archive_order_id', table_name='order_items_archive')
+    op.drop_table('order_items_archive')
+    op.drop_index('ix_orders_archive_user_id_created_at', table_name='orders_archive')
+    op.drop_table('orders_archive')
@@ -0,0 +1,60 @@
+"""add order history indexes
+
+Revision ID: order_history_indexes
+Revises: order_archive
+Create Date: 2026-04-06 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'order_history_indexes'
+down_revision: Union[str, None] = 'order_archive'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # A user's orders newest first: the LIMIT stops after one page instead
+        # of sorting the whole history, and the count is an index-only scan
+        op.create_index(
+            'ix_orders_user_id_created_at', 'orders',
+            ['user_id', sa.text('created_at DESC')],
+            postgresql_include=['status', 'total_amount'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_orders_user_id_status_created_at', 'orders',
+            ['user_id', 'status', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        # Orders are inserted in created_at order, so a BRIN index of a few
+        # pages serves admin date-range scans (exports, archiving)
+        op.create_index(
+            'ix_orders_created_at_brin', 'orders', ['created_at'],
+            postgresql_using='brin',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        # Covered by ix_orders_user_id_created_at
+        op.drop_index('ix_orders_user_id', table_name='orders',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_orders_user_id', 'orders', ['user_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_orders_created_at_brin', table_name='orders',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_orders_user_id_status_created_at', table_name='orders',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_orders_user_id_created_at', table_name='orders',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,57 @@
+"""add transactional outbox
+
+Revision ID: outbox
+Revises: catalog_generation
+Create Date: 2026-02-16 10:00:00
+
+"""
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'outbox'
+down_revision: Union[str, None] = 'catalog_generation'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROCEDURES_DIR = Path(__file__).resolve().parents[2] / 'procedures'
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('aggregate_type', sa.String(length=30), nullable=False),
+        sa.Column('aggregate_id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('available_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('dispatched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Only undispatched rows are indexed, so the dispatcher's scan stays small
+    # no matter how much delivered history accumulates
+    op.create_index(
+        'ix_outbox_pending', 'outbox', ['available_at', 'id'],
+        postgresql_where=sa.text('dispatched_at IS NULL')
+    )
+    op.create_index('ix_outbox_aggregate', 'outbox', ['aggregate_type', 'aggregate_id'])
+
+    # The procedures that append events are (re)deployed by run_procedures.py;
+    # the helper they call is created here so it exists as soon as the table does
+    op.execute((PROCEDURES_DIR / 'append_outbox_event.sql').read_text())
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS append_outbox_event(VARCHAR, INTEGER, VARCHAR, JSONB)")
+    op.drop_index('ix_outbox_aggregate', table_name='outbox')
+    op.drop_index('ix_outbox_pending', table_name='outbox')
+    op.drop_table('outbox')
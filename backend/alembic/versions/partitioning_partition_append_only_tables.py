@@ -0,0 +1,127 @@
+"""range-partition append-only tables by creation time
+
+Revision ID: partitioning
+Revises: scheduler
+Create Date: 2026-03-23 10:00:00
+
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'partitioning'
+down_revision: Union[str, None] = 'scheduler'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> (partition key, period, indexes, foreign keys). Partition names
+# and bounds follow app/services/partition_service.py, whose job takes over
+# creating and dropping them after this migration.
+TABLES = {
+    'otp_verifications': (
+        'created_at', 'day',
+        {'ix_otp_verifications_phone': ['phone', 'created_at']},
+        [],
+    ),
+    'refresh_tokens': (
+        'created_at', 'day',
+        {'ix_refresh_tokens_token': ['token'], 'ix_refresh_tokens_user_id': ['user_id']},
+        [('refresh_tokens_user_id_fkey', 'user_id', 'users', 'CASCADE')],
+    ),
+    'payment_attempts': (
+        'created_at', 'month',
+        {'ix_payment_attempts_payment_id': ['payment_id']},
+        [('payment_attempts_payment_id_fkey', 'payment_id', 'payments', None)],
+    ),
+    'coupon_usage': (
+        'used_at', 'month',
+        {
+            'ix_coupon_usage_coupon_id_user_id': ['coupon_id', 'user_id'],
+            'ix_coupon_usage_user_id': ['user_id'],
+            'ix_coupon_usage_order_id': ['order_id'],
+        },
+        [
+            ('coupon_usage_coupon_id_fkey', 'coupon_id', 'coupons', None),
+            ('coupon_usage_user_id_fkey', 'user_id', 'users', None),
+            ('coupon_usage_order_id_fkey', 'order_id', 'orders', None),
+        ],
+    ),
+}
+
+PREMAKE = 4
+
+
+def _floor(ts: datetime, period: str) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    if period == 'day':
+        return datetime(ts.year, ts.month, ts.day, tzinfo=timezone.utc)
+    return datetime(ts.year, ts.month, 1, tzinfo=timezone.utc)
+
+
+def _next(start: datetime, period: str) -> datetime:
+    if period == 'day':
+        return start + timedelta(days=1)
+    return datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Copy `table` into a new partitioned (or plain) table and swap it in"""
+    key, period, indexes, foreign_keys = TABLES[table]
+    new = f'{table}_new'
+    conn = op.get_bind()
+
+    op.execute(f"UPDATE {table} SET {key} = NOW() WHERE {key} IS NULL")
+    partition_by = f" PARTITION BY RANGE ({key})" if partitioned else ""
+    op.execute(f"CREATE TABLE {new} (LIKE {table} INCLUDING DEFAULTS){partition_by}")
+    op.execute(f"ALTER TABLE {new} ALTER COLUMN {key} SET NOT NULL")
+    # A partitioned table's primary key must include the partition key
+    pk = f"id, {key}" if partitioned else "id"
+    op.execute(f"ALTER TABLE {new} ADD CONSTRAINT {new}_pkey PRIMARY KEY ({pk})")
+
+    if partitioned:
+        oldest = conn.execute(sa.text(f"SELECT MIN({key}) FROM {table}")).scalar()
+        now = datetime.now(timezone.utc)
+        start = _floor(oldest or now, period)
+        until = _floor(now, period)
+        for _ in range(PREMAKE):
+            until = _next(until, period)
+        while start < until:
+            end = _next(start, period)
+            name = f"{table}_p{start.strftime('%Y%m%d' if period == 'day' else '%Y%m')}"
+            op.execute(
+                f"CREATE TABLE {name} PARTITION OF {new} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            start = end
+
+    op.execute(f"INSERT INTO {new} SELECT * FROM {table}")
+    sequence = conn.execute(sa.text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": table}).scalar()
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {new}.id")
+    op.execute(f"DROP TABLE {table}")
+    op.execute(f"ALTER TABLE {new} RENAME TO {table}")
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {new}_pkey TO {table}_pkey")
+
+    for name, columns in indexes.items():
+        op.create_index(name, table, columns)
+    for name, column, target, ondelete in foreign_keys:
+        op.create_foreign_key(name, table, target, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    # Rewrites each table under an exclusive lock; run in a quiet window
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
+    # Unique again once it no longer has to include the partition key
+    op.drop_index('ix_refresh_tokens_token', table_name='refresh_tokens')
+    op.create_index('ix_refresh_tokens_token', 'refresh_tokens', ['token'], unique=True)
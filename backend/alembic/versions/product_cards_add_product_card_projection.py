@@ -0,0 +1,185 @@
+"""add product card projection
+
+Revision ID: product_cards
+Revises: add_enhanced_auth
+Create Date: 2026-01-12 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'product_cards'
+down_revision: Union[str, None] = 'add_enhanced_auth'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CARD_COLUMNS = """
+    product_id, sku, name, category_id, brand, gender,
+    age_min_months, age_max_months, mrp, selling_price, discount_percent,
+    primary_image_url, rating_avg, rating_count, stock_available,
+    is_active, is_featured, created_at, refreshed_at
+"""
+
+CARD_SELECT = """
+    SELECT p.id, p.sku, p.name, p.category_id, p.brand, p.gender,
+           p.age_min_months, p.age_max_months, p.mrp, p.selling_price, p.discount_percent,
+           (SELECT pi.image_url FROM product_images pi
+             WHERE pi.product_id = p.id AND pi.is_primary = TRUE
+             ORDER BY pi.display_order, pi.id LIMIT 1),
+           p.rating_avg, p.rating_count,
+           COALESCE(GREATEST(0, i.quantity_available - i.quantity_reserved), 0),
+           p.is_active, p.is_featured, p.created_at, NOW()
+    FROM products p
+    LEFT JOIN inventory i ON i.product_id = p.id
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_cards',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('sku', sa.String(length=50), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('brand', sa.String(length=100), nullable=True),
+        sa.Column('gender', sa.String(length=10), nullable=True),
+        sa.Column('age_min_months', sa.Integer(), nullable=True),
+        sa.Column('age_max_months', sa.Integer(), nullable=True),
+        sa.Column('mrp', sa.Numeric(10, 2), nullable=False),
+        sa.Column('selling_price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('discount_percent', sa.Numeric(5, 2), nullable=True),
+        sa.Column('primary_image_url', sa.String(length=500), nullable=True),
+        sa.Column('rating_avg', sa.Numeric(2, 1), nullable=True),
+        sa.Column('rating_count', sa.Integer(), nullable=True),
+        sa.Column('stock_available', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_featured', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_index(
+        'ix_product_cards_active_created', 'product_cards', ['created_at', 'product_id'],
+        postgresql_where=sa.text('is_active')
+    )
+
+    # Upsert one card from its source rows; removes the card if the product is gone
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION refresh_product_card(p_product_id INTEGER)
+        RETURNS VOID
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            INSERT INTO product_cards ({CARD_COLUMNS})
+            {CARD_SELECT}
+            WHERE p.id = p_product_id
+            ON CONFLICT (product_id) DO UPDATE SET
+                sku = EXCLUDED.sku,
+                name = EXCLUDED.name,
+                category_id = EXCLUDED.category_id,
+                brand = EXCLUDED.brand,
+                gender = EXCLUDED.gender,
+                age_min_months = EXCLUDED.age_min_months,
+                age_max_months = EXCLUDED.age_max_months,
+                mrp = EXCLUDED.mrp,
+                selling_price = EXCLUDED.selling_price,
+                discount_percent = EXCLUDED.discount_percent,
+                primary_image_url = EXCLUDED.primary_image_url,
+                rating_avg = EXCLUDED.rating_avg,
+                rating_count = EXCLUDED.rating_count,
+                stock_available = EXCLUDED.stock_available,
+                is_active = EXCLUDED.is_active,
+                is_featured = EXCLUDED.is_featured,
+                created_at = EXCLUDED.created_at,
+                refreshed_at = EXCLUDED.refreshed_at;
+
+            IF NOT FOUND THEN
+                DELETE FROM product_cards WHERE product_id = p_product_id;
+            END IF;
+        END;
+        $$;
+    """)
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION rebuild_product_cards()
+        RETURNS INTEGER
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_count INTEGER;
+        BEGIN
+            LOCK TABLE product_cards IN EXCLUSIVE MODE;
+            DELETE FROM product_cards;
+            INSERT INTO product_cards ({CARD_COLUMNS})
+            {CARD_SELECT};
+            GET DIAGNOSTICS v_count = ROW_COUNT;
+            RETURN v_count;
+        END;
+        $$;
+    """)
+
+    # Trigger functions: products keyed on id, images/inventory on product_id
+    op.execute("""
+        CREATE OR REPLACE FUNCTION product_cards_sync_product()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            PERFORM refresh_product_card(NEW.id);
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION product_cards_sync_child()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM refresh_product_card(OLD.product_id);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE')
+               AND (TG_OP = 'INSERT' OR NEW.product_id IS DISTINCT FROM OLD.product_id) THEN
+                PERFORM refresh_product_card(NEW.product_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_product_cards_products
+        AFTER INSERT OR UPDATE ON products
+        FOR EACH ROW EXECUTE FUNCTION product_cards_sync_product()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_product_cards_images
+        AFTER INSERT OR UPDATE OR DELETE ON product_images
+        FOR EACH ROW EXECUTE FUNCTION product_cards_sync_child()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_product_cards_inventory
+        AFTER INSERT OR UPDATE OR DELETE ON inventory
+        FOR EACH ROW EXECUTE FUNCTION product_cards_sync_child()
+    """)
+
+    op.execute("SELECT rebuild_product_cards()")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_product_cards_inventory ON inventory")
+    op.execute("DROP TRIGGER IF EXISTS trg_product_cards_images ON product_images")
+    op.execute("DROP TRIGGER IF EXISTS trg_product_cards_products ON products")
+    op.execute("DROP FUNCTION IF EXISTS product_cards_sync_child()")
+    op.execute("DROP FUNCTION IF EXISTS product_cards_sync_product()")
+    op.execute("DROP FUNCTION IF EXISTS rebuild_product_cards()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_product_card(INTEGER)")
+
+    op.drop_index('ix_product_cards_active_created', table_name='product_cards')
+    op.drop_table('product_cards')
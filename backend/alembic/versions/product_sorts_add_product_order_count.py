@@ -0,0 +1,154 @@
+"""add product order count and sort indexes
+
+Revision ID: product_sorts
+Revises: catalog_indexes
+Create Date: 2026-01-26 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'product_sorts'
+down_revision: Union[str, None] = 'catalog_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CARD_COLUMNS = """
+    product_id, sku, name, category_id, brand, gender,
+    age_min_months, age_max_months, mrp, selling_price, discount_percent,
+    primary_image_url, rating_avg, rating_count, order_count, stock_available,
+    is_active, is_featured, created_at, refreshed_at
+"""
+
+CARD_SELECT = """
+    SELECT p.id, p.sku, p.name, p.category_id, p.brand, p.gender,
+           p.age_min_months, p.age_max_months, p.mrp, p.selling_price, p.discount_percent,
+           (SELECT pi.image_url FROM product_images pi
+             WHERE pi.product_id = p.id AND pi.is_primary = TRUE
+             ORDER BY pi.display_order, pi.id LIMIT 1),
+           p.rating_avg, p.rating_count, p.order_count,
+           COALESCE(GREATEST(0, i.quantity_available - i.quantity_reserved), 0),
+           p.is_active, p.is_featured, p.created_at, NOW()
+    FROM products p
+    LEFT JOIN inventory i ON i.product_id = p.id
+"""
+
+# Partial on active rows; column order matches SORT_OPTIONS in product_repository
+SORT_INDEXES = [
+    ('ix_product_cards_active_created', [sa.text('created_at DESC'), 'product_id']),
+    ('ix_product_cards_rating', [sa.text('rating_avg DESC'), 'product_id']),
+    ('ix_product_cards_popularity', [sa.text('order_count DESC'), 'product_id']),
+    ('ix_product_cards_category_popularity', ['category_id', sa.text('order_count DESC'), 'product_id']),
+]
+
+
+def _card_functions(columns: str, select_sql: str) -> None:
+    """(Re)create refresh_product_card/rebuild_product_cards for a column list"""
+    updates = ",\n                ".join(
+        f"{c} = EXCLUDED.{c}" for c in (c.strip() for c in columns.split(",")) if c != "product_id"
+    )
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION refresh_product_card(p_product_id INTEGER)
+        RETURNS VOID
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            INSERT INTO product_cards ({columns})
+            {select_sql}
+            WHERE p.id = p_product_id
+            ON CONFLICT (product_id) DO UPDATE SET
+                {updates};
+
+            IF NOT FOUND THEN
+                DELETE FROM product_cards WHERE product_id = p_product_id;
+            END IF;
+        END;
+        $$;
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION rebuild_product_cards()
+        RETURNS INTEGER
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_count INTEGER;
+        BEGIN
+            LOCK TABLE product_cards IN EXCLUSIVE MODE;
+            DELETE FROM product_cards;
+            INSERT INTO product_cards ({columns})
+            {select_sql};
+            GET DIAGNOSTICS v_count = ROW_COUNT;
+            RETURN v_count;
+        END;
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('order_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('product_cards', sa.Column('order_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from order history, then keep it current per placed order line
+    op.execute("""
+        UPDATE products p
+        SET order_count = oi.cnt
+        FROM (SELECT product_id, COUNT(*) AS cnt FROM order_items GROUP BY product_id) oi
+        WHERE oi.product_id = p.id
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION products_bump_order_count()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE products SET order_count = order_count + 1 WHERE id = NEW.product_id;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_products_order_count
+        AFTER INSERT ON order_items
+        FOR EACH ROW EXECUTE FUNCTION products_bump_order_count()
+    """)
+
+    _card_functions(CARD_COLUMNS, CARD_SELECT)
+    op.execute("SELECT rebuild_product_cards()")
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_product_cards_active_created', table_name='product_cards',
+                      postgresql_concurrently=True, if_exists=True)
+        for name, columns in SORT_INDEXES:
+            op.create_index(
+                name, 'product_cards', columns,
+                postgresql_where=sa.text('is_active'),
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(SORT_INDEXES):
+            op.drop_index(name, table_name='product_cards',
+                          postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            'ix_product_cards_active_created', 'product_cards', ['created_at', 'product_id'],
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True
+        )
+
+    _card_functions(
+        CARD_COLUMNS.replace(" order_count,", ""),
+        CARD_SELECT.replace(" p.order_count,", "")
+    )
+
+    op.execute("DROP TRIGGER IF EXISTS trg_products_order_count ON order_items")
+    op.execute("DROP FUNCTION IF EXISTS products_bump_order_count()")
+    op.drop_column('product_cards', 'order_count')
+    op.drop_column('products', 'order_count')
@@ -0,0 +1,53 @@
+"""add sales rollups
+
+Revision ID: sales_rollups
+Revises: order_history_indexes
+Create Date: 2026-04-13 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'sales_rollups'
+down_revision: Union[str, None] = 'order_history_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sales_rollups',
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('dimension', sa.String(length=20), nullable=False),
+        sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('key', sa.String(length=100), nullable=False),
+        sa.Column('units', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('revenue', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('discounts', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('refunds', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('granularity', 'dimension', 'bucket', 'key')
+    )
+    op.create_index(
+        'ix_sales_rollups_key_bucket', 'sales_rollups', ['granularity', 'dimension', 'key', 'bucket'], unique=False
+    )
+    op.create_table(
+        'analytics_applied_events',
+        sa.Column('event_id', sa.BigInteger(), nullable=False),
+        sa.Column('applied_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('event_id')
+    )
+    op.create_index(
+        'ix_analytics_applied_events_applied_at', 'analytics_applied_events', ['applied_at'], unique=False
+    )
+    # Existing history is loaded with `python manage.py rebuild-analytics`
+
+
+def downgrade() -> None:
+    op.drop_index('ix_analytics_applied_events_applied_at', table_name='analytics_applied_events')
+    op.drop_table('analytics_applied_events')
+    op.drop_index('ix_sales_rollups_key_bucket', table_name='sales_rollups')
+    op.drop_table('sales_rollups')
@@ -0,0 +1,54 @@
+"""add job scheduler tables
+
+Revision ID: scheduler
+Revises: invalidation_bus
+Create Date: 2026-03-16 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'scheduler'
+down_revision: Union[str, None] = 'invalidation_bus'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduled_jobs',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_status', sa.String(length=20), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table(
+        'job_runs',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('job_name', sa.String(length=64), nullable=False),
+        sa.Column('instance', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('duration_seconds', sa.Float(), nullable=False),
+        sa.Column('rows_affected', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_runs_job_name_started_at', 'job_runs', ['job_name', 'started_at'])
+    op.create_index('ix_job_runs_started_at', 'job_runs', ['started_at'])
+
+    # The expiry job scans for locks past their expiry
+    op.create_index('ix_inventory_locks_expires_at', 'inventory_locks', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inventory_locks_expires_at', table_name='inventory_locks')
+    op.drop_index('ix_job_runs_started_at', table_name='job_runs')
+    op.drop_index('ix_job_runs_job_name_started_at', table_name='job_runs')
+    op.drop_table('job_runs')
+    op.drop_table('scheduled_jobs')
@@ -0,0 +1,193 @@
+"""
+Response compression (gzip, and brotli when the optional `brotli` package is
+installed) negotiated from Accept-Encoding.
+
+Bodies under a minimum size are sent as-is, large bodies are compressed in the
+thread pool so the event loop keeps serving other requests, and streamed
+responses are compressed chunk by chunk. Responses carrying a strong ETag
+(catalog routes, see http_cache) identify their body exactly, so their
+compressed variants are cached per (ETag, encoding) and hot pages are
+compressed once per process rather than once per request.
+"""
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/x-ndjson")
+
+# Preferred first when the client rates them equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    weights = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        threadpool_min_size: int = 64 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        variant_cache_size: int = 512
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.threadpool_min_size = threadpool_min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.variants = TTLCache(maxsize=variant_cache_size, ttl=3600)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return brotli.Compressor(quality=self.brotli_quality)
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Validators of compressed variants carry an encoding suffix; strip it
+        # so the cache layer below compares against the representation-neutral tag
+        suffix = f'-{encoding}"'
+        if_none_match = headers.get("if-none-match")
+        variant_requested = bool(if_none_match and suffix in if_none_match)
+        if variant_requested:
+            scope = dict(scope)
+            scope["headers"] = [
+                (k, v.replace(suffix.encode(), b'"')) if k == b"if-none-match" else (k, v)
+                for k, v in scope["headers"]
+            ]
+
+        start: Optional[Message] = None
+        compressor = None
+
+        async def send_compressed(message: Message):
+            nonlocal start, compressor
+
+            if message["type"] == "http.response.start":
+                start = message
+                if message["status"] == 304:
+                    response_headers = MutableHeaders(scope=message)
+                    response_headers.add_vary_header("Accept-Encoding")
+                    etag = response_headers.get("etag")
+                    if etag and variant_requested:
+                        response_headers["ETag"] = etag[:-1] + suffix
+                    await send(message)
+                    start = None
+                return
+
+            if start is None:
+                await send(message)
+                return
+
+            response_headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                media_type = response_headers.get("content-type", "")
+                if (
+                    "content-encoding" in response_headers
+                    or not media_type.startswith(COMPRESSIBLE_TYPES)
+                ):
+                    await send(start)
+                    await send(message)
+                    start = None
+                    return
+                response_headers.add_vary_header("Accept-Encoding")
+
+                if not more_body:
+                    await send_whole(response_headers, body)
+                    return
+
+                # Streamed response: compress incrementally, no Content-Length
+                compressor = self._compressor(encoding)
+                response_headers["Content-Encoding"] = encoding
+                del response_headers["Content-Length"]
+                etag = response_headers.get("etag")
+                if etag:
+                    response_headers["ETag"] = etag[:-1] + suffix
+                await send(start)
+
+            if compressor is not None:
+                data = compressor.process(body) if encoding == "br" else compressor.compress(body)
+                if not more_body:
+                    data += compressor.finish() if encoding == "br" else compressor.flush()
+                if data or not more_body:
+                    await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        async def send_whole(response_headers: MutableHeaders, body: bytes):
+            nonlocal start
+            if len(body) < self.minimum_size:
+                await send(start)
+                await send({"type": "http.response.body", "body": body})
+                start = None
+                return
+
+            etag = response_headers.get("etag")
+            key = (etag, encoding) if etag and not etag.startswith("W/") else None
+            compressed = self.variants.get(key) if key else None
+            if compressed is None:
+                if len(body) >= self.threadpool_min_size:
+                    compressed = await run_in_threadpool(self.compress, body, encoding)
+                else:
+                    compressed = self.compress(body, encoding)
+                if key:
+                    self.variants.set(key, compressed)
+
+            response_headers["Content-Encoding"] = encoding
+            response_headers["Content-Length"] = str(len(compressed))
+            if etag:
+                response_headers["ETag"] = etag[:-1] + suffix
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+            start = None
+
+        await self.app(scope, receive, send_compressed)
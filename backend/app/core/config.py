@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 from dotenv import load_dotenv
@@ -16,10 +17,94 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_REVOCATION_ENABLED: bool = True
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100_000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_PRUNE_SECONDS: float = 60.0
 
     OTP_EXPIRE_MINUTES: int = 5
     OTP_LENGTH: int = 6
 
+    SMS_PROVIDER: str = os.getenv("SMS_PROVIDER", "fake")  # fake | http
+    SMS_DISPATCHER_ENABLED: bool = True
+    SMS_WORKERS: int = 4
+    SMS_QUEUE_MAX_SIZE: int = 10000
+    SMS_BATCH_SIZE: int = 100
+    SMS_BATCH_LINGER_SECONDS: float = 0.02
+    SMS_MAX_ATTEMPTS: int = 5
+    SMS_RETRY_BASE_SECONDS: float = 0.5
+    SMS_RETRY_MAX_SECONDS: float = 30.0
+    SMS_SEND_TIMEOUT_SECONDS: float = 10.0
+    SMS_SENDER_ID: str = "CLDKID"
+    SMS_HTTP_URL: Optional[str] = os.getenv("SMS_HTTP_URL")
+    SMS_HTTP_API_KEY: Optional[str] = os.getenv("SMS_HTTP_API_KEY")
+    SMS_HTTP_MAX_CONNECTIONS: int = 20
+
+    FACET_CACHE_TTL_SECONDS: int = 60
+    FACET_CACHE_MAX_ENTRIES: int = 2048
+    CATEGORY_TREE_TTL_SECONDS: int = 300
+    CATALOG_GENERATION_TTL_SECONDS: float = 1.0
+    CATALOG_STOCK_ETAG_SECONDS: int = 300  # listings' stock and order counts don't bump the generation
+    PRODUCT_CACHE_TTL_SECONDS: int = 30
+    PRODUCT_CACHE_MAX_ENTRIES: int = 4096
+    PRODUCT_BATCH_MAX_IDS: int = 50
+
+    OUTBOX_DISPATCHER_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_SINK_TIMEOUT_SECONDS: float = 10.0
+    OUTBOX_RETENTION_DAYS: int = 14  # delivered events; at least ANALYTICS_APPLIED_EVENTS_RETENTION_DAYS
+    OUTBOX_PRUNE_BATCH: int = 5000
+
+    INVALIDATION_BUS_ENABLED: bool = True
+    INVALIDATION_COALESCE_SECONDS: float = 0.05
+    INVALIDATION_RECONNECT_SECONDS: float = 5.0
+    INVALIDATION_PING_SECONDS: float = 15.0
+    INVALIDATION_PING_TIMEOUT_SECONDS: float = 5.0
+
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_JITTER: float = 0.1
+    SCHEDULER_MAX_TIMEOUT_SECONDS: float = 300.0
+    SCHEDULER_HISTORY_DAYS: int = 7
+    JOB_TOKEN_CLEANUP_SECONDS: float = 3600.0
+    JOB_INVENTORY_LOCK_EXPIRY_SECONDS: float = 60.0
+    JOB_INVENTORY_LOCK_EXPIRY_BATCH: int = 1000
+    JOB_PARTITION_MAINTENANCE_SECONDS: float = 3600.0
+    JOB_ORDER_ARCHIVE_SECONDS: float = 3600.0
+    JOB_ANALYTICS_EVENTS_PRUNE_SECONDS: float = 24 * 3600.0
+    JOB_OUTBOX_PRUNE_SECONDS: float = 24 * 3600.0
+    JOB_BESTSELLER_REFRESH_SECONDS: float = 300.0
+
+    PARTITION_PREMAKE: int = 4
+    PARTITION_PAYMENT_ATTEMPTS_RETENTION_DAYS: int = 730
+    PARTITION_COUPON_USAGE_RETENTION_DAYS: int = 730
+
+    ORDER_ARCHIVE_AFTER_MONTHS: int = 12
+    ORDER_ARCHIVE_BATCH: int = 500
+
+    ANALYTICS_APPLIED_EVENTS_RETENTION_DAYS: int = 7
+    ANALYTICS_MAX_TOP: int = 100
+    ANALYTICS_MAX_HOURLY_DAYS: int = 31
+
+    BESTSELLER_HALF_LIFE_DAYS: float = 7.0  # a change rescales the stored scores on the next refresh
+    BESTSELLER_SETTLE_SECONDS: float = 60.0
+    BESTSELLER_TOP_N: int = 100
+    BESTSELLER_CACHE_TTL_SECONDS: float = 900.0
+    BESTSELLER_PAGE_MAX: int = 50
+
+    IMPORT_CHUNK_SIZE: int = 5000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    IMPORT_SPOOL_MAX_MEMORY: int = 8 * 1024 * 1024
+    INVENTORY_SYNC_MAX_REPORTED_CONFLICTS: int = 1000
+    EXPORT_FETCH_SIZE: int = 1000
+
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_THREADPOOL_MIN_SIZE: int = 64 * 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_VARIANT_CACHE_ENTRIES: int = 512
+
     class Config:
         case_sensitive = True
 
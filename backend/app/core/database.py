@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+import asyncpg
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy import text
@@ -50,3 +52,22 @@ async def call_procedure_with_result(db: AsyncSession, procedure_name: str, para
     
     result = await db.execute(sql, params)
     return result.fetchall()
+
+@asynccontextmanager
+async def driver_connection():
+    """
+    Pooled connection as the underlying asyncpg connection, for bulk APIs
+    (COPY, copy_records_to_table) that SQLAlchemy does not expose.
+    Callers manage their own transactions on it.
+    """
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        yield raw.driver_connection
+
+
+async def dedicated_connection() -> asyncpg.Connection:
+    """
+    asyncpg connection outside the pool, for long-lived sessions such as
+    LISTEN that must not be recycled or shared. The caller closes it.
+    """
+    return await asyncpg.connect(DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"))
@@ -0,0 +1,105 @@
+"""
+HTTP caching middleware (ETag / Cache-Control / 304) for public GET routes.
+
+Each rule pairs a path template with a version resolver and a Cache-Control
+policy. The ETag is derived from the resolved version and the normalized URL,
+so a matching If-None-Match is answered with 304 before the endpoint runs and
+without rendering the body.
+"""
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+VersionResolver = Callable[[dict], Awaitable[Optional[object]]]
+
+
+@dataclass
+class CacheRule:
+    path: str
+    version: VersionResolver
+    max_age: int = 60
+    stale_while_revalidate: int = 0
+
+    @property
+    def cache_control(self) -> str:
+        value = f"public, max-age={self.max_age}"
+        if self.stale_while_revalidate:
+            value += f", stale-while-revalidate={self.stale_while_revalidate}"
+        return value
+
+
+def make_etag(version: object, path: str, query_string: bytes) -> str:
+    query = urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+    digest = hashlib.sha1(f"{version}|{path}|{query}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison is the rule for If-None-Match (RFC 9110 13.1.2)
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class HTTPCacheMiddleware:
+    def __init__(self, app: ASGIApp, rules: List[CacheRule]):
+        self.app = app
+        self.rules = [(compile_path(rule.path)[0], rule) for rule in rules]
+
+    def _match(self, path: str):
+        for regex, rule in self.rules:
+            match = regex.match(path)
+            if match:
+                return rule, match.groupdict()
+        return None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        rule, params = self._match(scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            version = await rule.version(params)
+        except Exception:
+            logger.exception("Cache version lookup failed for %s", scope["path"])
+            version = None
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag = make_etag(version, scope["path"], scope.get("query_string", b""))
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [
+                    (b"etag", etag.encode()),
+                    (b"cache-control", rule.cache_control.encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["ETag"] = etag
+                headers["Cache-Control"] = rule.cache_control
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
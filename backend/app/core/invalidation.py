@@ -0,0 +1,185 @@
+"""
+Cross-process invalidation bus over Postgres LISTEN/NOTIFY.
+
+Each API process keeps one dedicated (non-pooled) connection listening on
+the `invalidation` channel. Writers publish typed messages, "<topic>:<key>",
+inside the transaction that makes the change, so a message is only delivered
+once the change commits. Procedures publish with
+`notify_invalidation(topic, key)`; Python code uses `publish()`.
+
+Bursts are coalesced: notifications are collected per topic for
+INVALIDATION_COALESCE_SECONDS and each subscriber is then called once with
+the set of distinct keys, so a bulk update touching thousands of rows costs
+one handler call per process. Postgres already folds identical payloads sent
+in one transaction.
+
+Notifications sent while the listener is disconnected are lost, so every
+(re)connect calls each subscriber's `resync` hook, which must rebuild or drop
+whatever the topic protects. A half-open connection (idle timeout on a NAT or
+proxy, failover) never reports itself closed and just stops delivering, so the
+listener pings every INVALIDATION_PING_SECONDS and reconnects when a ping
+fails or times out, or when asyncpg reports the connection terminated.
+
+Topics:
+- product: key is a product id; its cached detail is dropped
+- catalog: key is a catalog_generations scope that was bumped; generations are re-read now
+- outbox: events were appended; dispatchers drain without waiting to poll
+- token: key is "<jti>:<expiry epoch>"; the access token is revoked
+- bestsellers: the sales scores were refreshed; rankings are reloaded
+"""
+import asyncio
+import inspect
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import dedicated_connection
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "invalidation"
+
+PRODUCT = "product"
+CATALOG = "catalog"
+OUTBOX = "outbox"
+TOKEN = "token"
+BESTSELLERS = "bestsellers"
+
+InvalidationHandler = Callable[[Set[str]], Any]
+ResyncHandler = Callable[[Any], Awaitable[None]]
+
+_PUBLISH_SQL = text("SELECT notify_invalidation(:topic, k) FROM unnest(CAST(:keys AS text[])) AS k")
+
+
+class Invalidation(NamedTuple):
+    topic: str
+    key: str = ""
+
+    def encode(self) -> str:
+        return f"{self.topic}:{self.key}"
+
+    @classmethod
+    def decode(cls, payload: str) -> Optional["Invalidation"]:
+        topic, sep, key = payload.partition(":")
+        return cls(topic, key) if sep and topic else None
+
+
+async def publish(db, topic: str, keys: Iterable = ("",)):
+    """
+    Queue invalidations in the current transaction of `db` (an AsyncSession or
+    AsyncConnection); they are delivered when it commits and dropped on rollback
+    """
+    keys = [str(k) for k in keys]
+    if keys:
+        await db.execute(_PUBLISH_SQL, {"topic": topic, "keys": keys})
+
+
+class InvalidationBus:
+    def __init__(
+        self,
+        coalesce_window: float = settings.INVALIDATION_COALESCE_SECONDS,
+        reconnect_delay: float = settings.INVALIDATION_RECONNECT_SECONDS,
+        ping_interval: float = settings.INVALIDATION_PING_SECONDS,
+        ping_timeout: float = settings.INVALIDATION_PING_TIMEOUT_SECONDS
+    ):
+        self.coalesce_window = coalesce_window
+        self.reconnect_delay = reconnect_delay
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self._handlers: Dict[str, List[InvalidationHandler]] = defaultdict(list)
+        self._resyncs: List[Tuple[str, ResyncHandler]] = []
+        self._pending: Dict[str, Set[str]] = defaultdict(set)
+        self._flush_scheduled = False
+        self._flushes: Set[asyncio.Task] = set()
+
+    def subscribe(self, topic: str, handler: InvalidationHandler, resync: Optional[ResyncHandler] = None):
+        """
+        Call `handler(keys)` (plain or async) with each coalesced batch of keys
+        published on `topic`; `resync(conn)` runs on every (re)connect with the
+        listener connection, before any message is dispatched.
+        """
+        self._handlers[topic].append(handler)
+        if resync is not None:
+            self._resyncs.append((topic, resync))
+
+    def _on_notify(self, connection, pid, channel, payload: str):
+        message = Invalidation.decode(payload)
+        if message is None or message.topic not in self._handlers:
+            metrics.incr("invalidation.ignored")
+            return
+        metrics.incr("invalidation.received")
+        self._pending[message.topic].add(message.key)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_later(self.coalesce_window, self._schedule_flush)
+
+    def _schedule_flush(self):
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self):
+        """Hand everything collected so far to the subscribers"""
+        pending, self._pending = self._pending, defaultdict(set)
+        self._flush_scheduled = False
+        for topic, keys in pending.items():
+            metrics.incr("invalidation.batches")
+            for handler in self._handlers[topic]:
+                try:
+                    result = handler(keys)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    logger.exception("Invalidation handler for %r failed", topic)
+
+    async def _resync(self, conn):
+        # Anything still pending is covered by the resync
+        self._pending.clear()
+        for topic, resync in self._resyncs:
+            try:
+                await resync(conn)
+            except Exception:
+                logger.exception("Invalidation resync for %r failed", topic)
+
+    async def _watch(self, conn, terminated: asyncio.Event):
+        """Return when the connection ends; raise when a ping fails or times out"""
+        while not conn.is_closed():
+            try:
+                await asyncio.wait_for(terminated.wait(), timeout=self.ping_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.wait_for(conn.fetchval("SELECT 1"), timeout=self.ping_timeout)
+            metrics.incr("invalidation.pings")
+
+    async def run(self):
+        """Listen until cancelled, reconnecting (and resyncing) after any failure"""
+        while True:
+            conn = None
+            try:
+                conn = await dedicated_connection()
+                terminated = asyncio.Event()
+                conn.add_termination_listener(lambda c: terminated.set())
+                # Listen before resyncing so nothing changed in between is missed
+                await conn.add_listener(CHANNEL, self._on_notify)
+                await self._resync(conn)
+                logger.info("Invalidation bus listening on %r", CHANNEL)
+                await self._watch(conn, terminated)
+                logger.warning("Invalidation listener connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Invalidation listener failed; retrying")
+            finally:
+                if conn is not None and not conn.is_closed():
+                    # Not close(): its goodbye could hang on a dead socket
+                    conn.terminate()
+            metrics.incr("invalidation.reconnects")
+            await asyncio.sleep(self.reconnect_delay)
+
+
+bus = InvalidationBus()
@@ -0,0 +1,39 @@
+"""
+Process-local counters and gauges.
+
+Each worker process keeps its own values; GET /api/v1/admin/metrics returns a
+snapshot for the worker that served the request.
+"""
+import time
+from collections import defaultdict
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+
+class Metrics:
+    def __init__(self):
+        self._counters: Dict[str, Number] = defaultdict(int)
+        self._gauges: Dict[str, Number] = {}
+        self.started_at = time.time()
+
+    def incr(self, name: str, value: Number = 1):
+        self._counters[name] += value
+
+    def set_gauge(self, name: str, value: Number):
+        self._gauges[name] = value
+
+    def get(self, name: str, default: Number = 0) -> Number:
+        if name in self._gauges:
+            return self._gauges[name]
+        return self._counters.get(name, default)
+
+    def snapshot(self) -> dict:
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "counters": dict(sorted(self._counters.items())),
+            "gauges": dict(sorted(self._gauges.items())),
+        }
+
+
+metrics = Metrics()
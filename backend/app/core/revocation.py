@@ -0,0 +1,124 @@
+"""
+Access-token revocation checked from memory.
+
+Revoked JWT ids live in the `revoked_tokens` table until the token would have
+expired anyway. Every API process mirrors the live ones in a Bloom filter in
+front of an exact dict: a token that was never revoked (almost every request)
+is cleared by the filter alone, and a filter hit is confirmed against the
+exact set, so false positives never reject a valid token.
+
+Processes stay in sync over the invalidation bus: revoking writes the row and
+publishes a `token` invalidation in the same transaction, and each process
+adds the jti as the message arrives. The full list is reloaded whenever the
+bus (re)connects, so revocations missed while disconnected are picked up too.
+"""
+import logging
+import math
+import time
+from typing import Dict, Set
+
+from app.core.config import settings
+from app.core.invalidation import TOKEN, bus
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    # Double hashing over the interpreter's 64-bit string hash, which is
+    # cheap and cached on the str. It is salted per process, which is fine for
+    # a filter each process builds for itself.
+
+    def add(self, key: str):
+        h = hash(key)
+        h1, h2 = h & 0xFFFFFFFF, ((h >> 32) & 0xFFFFFFFF) | 1
+        bits, size = self._bits, self.size
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % size
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        h = hash(key)
+        h1 = h & 0xFFFFFFFF
+        bits, size = self._bits, self.size
+        # Most keys that were never added fail on this first probe
+        pos = h1 % size
+        if not bits[pos >> 3] & (1 << (pos & 7)):
+            return False
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        for i in range(1, self.hashes):
+            pos = (h1 + i * h2) % size
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class RevocationList:
+    def __init__(
+        self,
+        capacity: int = settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+        error_rate: float = settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+        prune_interval: float = settings.TOKEN_REVOCATION_PRUNE_SECONDS
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.prune_interval = prune_interval
+        self._last_prune = time.monotonic()
+        self._exact: Dict[str, float] = {}  # jti -> expiry (epoch seconds)
+        self._bloom = BloomFilter(capacity, error_rate)
+
+    def is_revoked(self, jti: str) -> bool:
+        if not self._exact or jti not in self._bloom:
+            return False
+        expires_at = self._exact.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, jti: str, expires_at: float):
+        if expires_at <= time.time():
+            return
+        if jti not in self._exact:
+            self._exact[jti] = expires_at
+            self._bloom.add(jti)
+            metrics.set_gauge("auth.revoked_tokens", len(self._exact))
+
+    def prune(self):
+        """Forget expired entries; the filter cannot delete, so it is rebuilt"""
+        now = time.time()
+        live = {jti: exp for jti, exp in self._exact.items() if exp > now}
+        bloom = BloomFilter(max(self.capacity, len(live) * 2), self.error_rate)
+        for jti in live:
+            bloom.add(jti)
+        self._exact, self._bloom = live, bloom
+        self._last_prune = time.monotonic()
+        metrics.set_gauge("auth.revoked_tokens", len(live))
+
+    def _on_revoked(self, keys: Set[str]):
+        for key in keys:
+            jti, _, expires_at = key.partition(":")
+            try:
+                self.add(jti, float(expires_at))
+            except ValueError:
+                logger.warning("Ignoring malformed revocation: %r", key)
+        if time.monotonic() - self._last_prune >= self.prune_interval:
+            self.prune()
+
+    async def reload(self, conn):
+        """Reload every live revocation; run by the bus on each (re)connect"""
+        rows = await conn.fetch(
+            "SELECT jti, EXTRACT(EPOCH FROM expires_at)::float8 AS exp "
+            "FROM revoked_tokens WHERE expires_at > NOW()"
+        )
+        for row in rows:
+            self.add(row["jti"], row["exp"])
+        self.prune()
+        logger.info("Token revocation list loaded: %s live entries", len(self._exact))
+
+
+revocation_list = RevocationList()
+if settings.TOKEN_REVOCATION_ENABLED:
+    bus.subscribe(TOKEN, revocation_list._on_revoked, resync=revocation_list.reload)
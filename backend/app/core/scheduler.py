@@ -0,0 +1,171 @@
+"""
+Background job scheduler shared by all API replicas.
+
+Every replica runs a loop per registered job and wakes at a jittered
+interval, but a job only runs where both of these hold:
+
+- pg_try_advisory_lock on the job's key succeeds, so one replica at a time;
+  the lock is released when the run ends (or with the connection, if the
+  process dies)
+- the job is due according to `scheduled_jobs.next_run_at`, read under that
+  lock, so a replica waking just after another finished does not repeat it
+
+The lock is held for the whole run on a connection of its own, outside the
+request pool, so long jobs do not tie up pooled connections; the schedule
+reads and writes borrow a pooled one briefly, and the job itself uses
+ordinary sessions and commits as it likes. Each run is bounded by the job's
+timeout and recorded in `job_runs` (status, duration, rows affected, error),
+which GET /api/v1/admin/jobs reads.
+"""
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.database import dedicated_connection, engine
+from app.core.metrics import metrics
+from app.models.scheduled_job import JobRun, ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+# First key of the two-key advisory lock, so job locks cannot collide with
+# other advisory lock users; the second key is hashtext(job name)
+LOCK_NAMESPACE = 0x4A4F42
+
+JobFunc = Callable[[], Awaitable[Optional[int]]]
+
+
+@dataclass
+class Job:
+    name: str
+    func: JobFunc  # returns the number of rows it affected, if meaningful
+    interval: float
+    timeout: float
+    jitter: float
+
+
+class Scheduler:
+    def __init__(self, instance: Optional[str] = None):
+        self.instance = instance or f"{socket.gethostname()}:{os.getpid()}"
+        self.jobs: Dict[str, Job] = {}
+
+    def register(
+        self,
+        name: str,
+        func: JobFunc,
+        interval: float,
+        timeout: Optional[float] = None,
+        jitter: float = settings.SCHEDULER_JITTER
+    ):
+        """Run `func` about every `interval` seconds on exactly one replica"""
+        timeout = timeout or min(interval, settings.SCHEDULER_MAX_TIMEOUT_SECONDS)
+        self.jobs[name] = Job(name, func, interval, timeout, jitter)
+
+    async def run(self):
+        await asyncio.gather(*[self._loop(job) for job in self.jobs.values()])
+
+    async def _loop(self, job: Job):
+        # Spread the first checks so replicas started together do not race
+        await asyncio.sleep(random.uniform(0, job.interval * job.jitter))
+        while True:
+            try:
+                await self.run_job(job.name)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Scheduler failed to run job %s", job.name)
+            await asyncio.sleep(job.interval * random.uniform(1 - job.jitter, 1 + job.jitter))
+
+    async def run_job(self, name: str, force: bool = False) -> Optional[str]:
+        """
+        Run the job here if no other replica holds it and it is due (or
+        `force`). Returns the run's status, or None if it did not run.
+        """
+        job = self.jobs[name]
+        lock_conn = await dedicated_connection()
+        try:
+            locked = await lock_conn.fetchval(
+                "SELECT pg_try_advisory_lock($1, hashtext($2))", LOCK_NAMESPACE, name
+            )
+            if not locked:
+                metrics.incr(f"scheduler.{name}.skipped")
+                return None
+            try:
+                status, duration, error = await self._run_locked(job, force)
+            finally:
+                await lock_conn.execute(
+                    "SELECT pg_advisory_unlock($1, hashtext($2))", LOCK_NAMESPACE, name
+                )
+        finally:
+            await lock_conn.close()
+        if status is None:
+            return None
+
+        metrics.incr(f"scheduler.{name}.{status}")
+        metrics.set_gauge(f"scheduler.{name}.duration_seconds", round(duration, 3))
+        if status != "succeeded":
+            logger.warning("Job %s %s after %.1fs: %s", name, status, duration, error)
+        return status
+
+    async def _run_locked(self, job: Job, force: bool) -> Tuple[Optional[str], float, Optional[str]]:
+        """Run a job whose lock is held, if due; returns (status, duration, error)"""
+        async with engine.connect() as conn:
+            next_run_at = await conn.scalar(
+                select(ScheduledJob.next_run_at).where(ScheduledJob.name == job.name)
+            )
+        if not force and next_run_at is not None and next_run_at > datetime.now(timezone.utc):
+            return None, 0, None
+
+        started_at = datetime.now(timezone.utc)
+        started = time.monotonic()
+        rows, error = None, None
+        try:
+            rows = await asyncio.wait_for(job.func(), timeout=job.timeout)
+            status = "succeeded"
+        except asyncio.TimeoutError:
+            status, error = "timed_out", f"exceeded {job.timeout}s"
+        except Exception as e:
+            status, error = "failed", repr(e)[:1000]
+            logger.exception("Job %s failed", job.name)
+        duration = time.monotonic() - started
+
+        # Due again a little early, so whichever replica wakes first within
+        # the jitter window picks it up
+        next_run_at = datetime.now(timezone.utc) + timedelta(seconds=job.interval * (1 - job.jitter))
+        async with engine.begin() as conn:
+            await conn.execute(
+                insert(ScheduledJob)
+                .values(name=job.name, next_run_at=next_run_at, last_status=status, updated_at=func.now())
+                .on_conflict_do_update(
+                    index_elements=[ScheduledJob.name],
+                    set_={"next_run_at": next_run_at, "last_status": status, "updated_at": func.now()}
+                )
+            )
+            await conn.execute(
+                insert(JobRun).values(
+                    job_name=job.name, instance=self.instance, status=status,
+                    started_at=started_at, duration_seconds=round(duration, 3),
+                    rows_affected=rows, error=error
+                )
+            )
+        return status, duration, error
+
+    async def prune_history(self) -> int:
+        """Delete run history older than SCHEDULER_HISTORY_DAYS"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.SCHEDULER_HISTORY_DAYS)
+        async with engine.begin() as conn:
+            result = await conn.execute(delete(JobRun).where(JobRun.started_at < cutoff))
+            return result.rowcount
+
+
+scheduler = Scheduler()
+scheduler.register("prune_job_runs", scheduler.prune_history, interval=24 * 3600)
@@ -10,12 +10,15 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from .config import settings
 from .database import get_db
+from .revocation import revocation_list
 from app.models.user import UserRole
 import random
 import string
+import uuid
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 # ============================================================================
 # PASSWORD HASHING
@@ -41,6 +44,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     - role: user role (CUSTOMER, SELLER, ADMIN)
     - type: 'access'
     - exp: expiration timestamp
+    - jti: unique token id, used to revoke it before exp
     """
     to_encode = data.copy()
 
@@ -52,7 +56,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({
         "exp": expire,
         "type": "access",
-        "iat": datetime.utcnow()
+        "iat": datetime.utcnow(),
+        "jti": uuid.uuid4().hex
     })
 
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -108,6 +113,7 @@ async def get_current_user(
     Validates:
     - Token is valid
     - Token is of type 'access'
+    - Token has not been revoked
     - User exists in database
     """
     token = credentials.credentials
@@ -120,6 +126,15 @@ async def get_current_user(
             detail="Invalid token type. Access token required."
         )
 
+    # Revoked before expiry (logout); an in-memory lookup, no query
+    jti = payload.get("jti")
+    if jti and revocation_list.is_revoked(jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     # Extract user_id
     user_id = payload.get("sub")
     if user_id is None:
@@ -0,0 +1,43 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key within one process share a single
+in-flight call: the first caller starts it, later callers await its result.
+Nothing is cached once the call finishes, so results are never staler than an
+uncoalesced read that started at the same moment.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.core.metrics import metrics
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        metrics.incr(f"{self.name}.singleflight.calls")
+        task = self._inflight.get(key)
+        if task is not None:
+            metrics.incr(f"{self.name}.singleflight.coalesced")
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        self._update_ratio()
+        # Shielded so one caller being cancelled doesn't cancel the shared call
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def _update_ratio(self):
+        calls = metrics.get(f"{self.name}.singleflight.calls")
+        coalesced = metrics.get(f"{self.name}.singleflight.coalesced")
+        metrics.set_gauge(f"{self.name}.singleflight.coalescing_ratio", round(coalesced / calls, 4) if calls else 0)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -1,6 +1,18 @@
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.http_cache import HTTPCacheMiddleware, CacheRule
+from app.core.invalidation import bus
+from app.core.scheduler import scheduler
+from app.services.catalog_service import catalog_generation, category_generation, product_version
+from app.services.bestseller_service import bestseller_version
+from app.services.outbox_service import dispatcher
+from app.services.notification_service import sms_dispatcher
+from app.services import maintenance_service  # registers the maintenance jobs
 from app.routes import (
     auth,
     products,
@@ -9,15 +21,37 @@ from app.routes import (
     payments,
     coupons,
     refunds,
-    users
+    users,
+    admin
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    if settings.OUTBOX_DISPATCHER_ENABLED:
+        tasks.append(asyncio.create_task(dispatcher.run()))
+    if settings.SMS_DISPATCHER_ENABLED:
+        tasks.append(asyncio.create_task(sms_dispatcher.run()))
+    if settings.INVALIDATION_BUS_ENABLED:
+        tasks.append(asyncio.create_task(bus.run()))
+    if settings.SCHEDULER_ENABLED:
+        tasks.append(asyncio.create_task(scheduler.run()))
+    yield
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -28,6 +62,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Declared in match order: literal /products/... paths before /products/{product_id}
+app.add_middleware(
+    HTTPCacheMiddleware,
+    rules=[
+        CacheRule(f"{settings.API_V1_STR}/products", catalog_generation, max_age=60, stale_while_revalidate=300),
+        CacheRule(f"{settings.API_V1_STR}/products/facets", catalog_generation, max_age=60, stale_while_revalidate=300),
+        CacheRule(f"{settings.API_V1_STR}/products/batch", catalog_generation, max_age=30, stale_while_revalidate=120),
+        CacheRule(f"{settings.API_V1_STR}/products/bestsellers", bestseller_version, max_age=60, stale_while_revalidate=300),
+        CacheRule(f"{settings.API_V1_STR}/products/bestsellers/categories", bestseller_version, max_age=60, stale_while_revalidate=300),
+        CacheRule(f"{settings.API_V1_STR}/products/categories/", category_generation, max_age=300, stale_while_revalidate=3600),
+        CacheRule(f"{settings.API_V1_STR}/products/categories/tree", category_generation, max_age=300, stale_while_revalidate=3600),
+        CacheRule(f"{settings.API_V1_STR}/products/{{product_id:int}}", product_version, max_age=30, stale_while_revalidate=120),
+    ]
+)
+
+# Outermost, so it sees the ETags set by HTTPCacheMiddleware and caches
+# compressed variants of catalog pages per ETag
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    threadpool_min_size=settings.COMPRESSION_THREADPOOL_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    variant_cache_size=settings.COMPRESSION_VARIANT_CACHE_ENTRIES
+)
+
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(products.router, prefix=settings.API_V1_STR)
 app.include_router(cart.router, prefix=settings.API_V1_STR)
@@ -36,6 +96,7 @@ app.include_router(payments.router, prefix=settings.API_V1_STR)
 app.include_router(coupons.router, prefix=settings.API_V1_STR)
 app.include_router(refunds.router, prefix=settings.API_V1_STR)
 app.include_router(users.router, prefix=settings.API_V1_STR)
+app.include_router(admin.router, prefix=settings.API_V1_STR)
 
 @app.get("/")
 def root():
@@ -1,26 +1,35 @@
 from app.models.user import User, Child, UserRole
 from app.models.otp_verification import OTPVerification
 from app.models.refresh_token import RefreshToken
-from app.models.product import Category, Product, ProductImage
+from app.models.revoked_token import RevokedToken
+from app.models.product import Category, Product, ProductImage, ProductCard, CatalogGeneration
 from app.models.inventory import Inventory, InventoryLock
 from app.models.cart import Cart, CartItem
 from app.models.wishlist import Wishlist
-from app.models.order import Order, OrderItem, OrderStatus
+from app.models.order import Order, OrderItem, OrderStatus, ArchivedOrder, ArchivedOrderItem
 from app.models.payment import Payment, PaymentAttempt, PaymentStatus, PaymentMethod
 from app.models.refund import Refund, RefundStatus, RefundType
 from app.models.coupon import Coupon, CouponUsage, DiscountType
 from app.models.address import Address, AddressType
+from app.models.outbox import OutboxEvent
+from app.models.scheduled_job import ScheduledJob, JobRun
+from app.models.analytics import SalesRollup, AnalyticsAppliedEvent
+from app.models.bestseller import ProductSalesScore, CategorySalesScore, RankingWatermark
 
 __all__ = [
     "User", "Child", "UserRole",
-    "OTPVerification", "RefreshToken",
-    "Category", "Product", "ProductImage",
+    "OTPVerification", "RefreshToken", "RevokedToken",
+    "Category", "Product", "ProductImage", "ProductCard", "CatalogGeneration",
     "Inventory", "InventoryLock",
     "Cart", "CartItem",
     "Wishlist",
-    "Order", "OrderItem", "OrderStatus",
+    "Order", "OrderItem", "OrderStatus", "ArchivedOrder", "ArchivedOrderItem",
     "Payment", "PaymentAttempt", "PaymentStatus", "PaymentMethod",
     "Refund", "RefundStatus", "RefundType",
     "Coupon", "CouponUsage", "DiscountType",
     "Address", "AddressType",
+    "OutboxEvent",
+    "ScheduledJob", "JobRun",
+    "SalesRollup", "AnalyticsAppliedEvent",
+    "ProductSalesScore", "CategorySalesScore", "RankingWatermark",
 ]
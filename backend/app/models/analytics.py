@@ -0,0 +1,35 @@
+from sqlalchemy import Column, BigInteger, String, DateTime, Numeric, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class SalesRollup(Base):
+    """
+    Sales per hour or day for one product, category or brand, maintained
+    incrementally from outbox events (app.services.analytics_service).
+    Buckets start at UTC hour/day boundaries.
+    """
+    __tablename__ = "sales_rollups"
+
+    granularity = Column(String(10), primary_key=True)  # hour | day
+    dimension = Column(String(20), primary_key=True)  # product | category | brand
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+    key = Column(String(100), primary_key=True)  # product id, category id or brand name
+
+    units = Column(BigInteger, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)  # item totals before the order discount
+    discounts = Column(Numeric(14, 2), nullable=False, default=0)  # order discounts, pro rata by item total
+    refunds = Column(Numeric(14, 2), nullable=False, default=0)  # refund amounts, pro rata by item total
+
+    __table_args__ = (
+        # Time series of a single key
+        Index("ix_sales_rollups_key_bucket", "granularity", "dimension", "key", "bucket"),
+    )
+
+
+class AnalyticsAppliedEvent(Base):
+    """Outbox events already added to the rollups, so redeliveries are skipped"""
+    __tablename__ = "analytics_applied_events"
+
+    event_id = Column(BigInteger, primary_key=True)
+    applied_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ProductSalesScore(Base):
+    """
+    Time-decayed units sold, as a forward-decayed sum: each sale adds
+    quantity * 2^((paid_at - epoch) / half-life), so existing scores never
+    need rewriting and comparing two scores compares their decayed values.
+    The epoch and half-life are those of the `bestsellers` watermark (see
+    app.services.bestseller_service).
+    """
+    __tablename__ = "product_sales_scores"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class CategorySalesScore(Base):
+    """Same as ProductSalesScore, for the products directly in a category"""
+    __tablename__ = "category_sales_scores"
+
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class RankingWatermark(Base):
+    """How far a batch ranking job has consumed its source, by job"""
+    __tablename__ = "ranking_watermarks"
+
+    name = Column(String(64), primary_key=True)
+    position = Column(DateTime(timezone=True), nullable=False)
+    # For jobs keeping forward-decayed scores: what the scores are relative to
+    decay_epoch = Column(DateTime(timezone=True), nullable=True)
+    half_life_seconds = Column(Float, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -36,18 +36,28 @@ class Coupon(Base):
     usages = relationship("CouponUsage", back_populates="coupon")
 
 class CouponUsage(Base):
+    """
+    Range-partitioned by month on used_at (app.services.partition_service). A
+    usage is never older than its coupon's valid_from, which bounds lookups.
+    """
     __tablename__ = "coupon_usage"
     
-    id = Column(Integer, primary_key=True, index=True)
-    coupon_id = Column(Integer, ForeignKey("coupons.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    coupon_id = Column(Integer, ForeignKey("coupons.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True, index=True)
+    # orders.id or orders_archive.id, checked by the coupon_usage_order_id_fkey constraint trigger
+    order_id = Column(Integer, nullable=True, index=True)
     
     discount_applied = Column(Numeric(10, 2), nullable=False)
-    used_at = Column(DateTime(timezone=True), server_default=func.now())
+    used_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
     
     is_reversed = Column(Boolean, default=False)
     reversed_at = Column(DateTime(timezone=True), nullable=True)
     
     coupon = relationship("Coupon", back_populates="usages")
     user = relationship("User")
+
+    __table_args__ = (
+        Index("ix_coupon_usage_coupon_id_user_id", "coupon_id", "user_id"),
+        {"postgresql_partition_by": "RANGE (used_at)"},
+    )
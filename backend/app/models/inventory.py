@@ -25,5 +25,5 @@ class InventoryLock(Base):
     cart_id = Column(Integer, ForeignKey("carts.id"), nullable=True, index=True)
     quantity_locked = Column(Integer, nullable=False)
     lock_type = Column(String(20), default="cart")
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
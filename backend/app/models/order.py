@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -20,7 +20,7 @@ class Order(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     order_number = Column(String(50), unique=True, index=True, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # indexed with created_at (order_history_indexes)
     address_id = Column(Integer, ForeignKey("addresses.id"), nullable=False)
     
     subtotal = Column(Numeric(10, 2), nullable=False)
@@ -49,8 +49,14 @@ class Order(Base):
     address = relationship("Address")
     coupon = relationship("Coupon")
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
-    payment = relationship("Payment", back_populates="order", uselist=False)
-    refund = relationship("Refund", back_populates="order", uselist=False)
+    # payments and refunds keep their order_id when the order is archived, so
+    # it is checked by a constraint trigger and there is no foreign key to join on
+    payment = relationship(
+        "Payment", primaryjoin="Order.id == foreign(Payment.order_id)", back_populates="order", uselist=False
+    )
+    refund = relationship(
+        "Refund", primaryjoin="Order.id == foreign(Refund.order_id)", back_populates="order", uselist=False
+    )
 
 class OrderItem(Base):
     __tablename__ = "order_items"
@@ -72,3 +78,67 @@ class OrderItem(Base):
     
     order = relationship("Order", back_populates="items")
     product = relationship("Product")
+
+
+class ArchivedOrder(Base):
+    """
+    A delivered or cancelled order moved out of `orders` by the archive job
+    (app.services.maintenance_service). Same columns and id as the live row; its
+    payment and refunds stay where they were and still reference the id.
+    """
+    __tablename__ = "orders_archive"
+
+    id = Column(Integer, primary_key=True)
+    order_number = Column(String(50), unique=True, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    address_id = Column(Integer, nullable=False)
+
+    subtotal = Column(Numeric(10, 2), nullable=False)
+    discount_amount = Column(Numeric(10, 2), default=0)
+    coupon_id = Column(Integer, nullable=True)
+    delivery_fee = Column(Numeric(10, 2), default=0)
+    platform_fee = Column(Numeric(10, 2), default=0)
+    total_amount = Column(Numeric(10, 2), nullable=False)
+
+    status = Column(SQLEnum(OrderStatus), nullable=False)
+    payment_status = Column(String(20))
+
+    shipping_address_snapshot = Column(Text, nullable=True)
+    notes = Column(Text, nullable=True)
+
+    estimated_delivery = Column(DateTime(timezone=True), nullable=True)
+    shipped_at = Column(DateTime(timezone=True), nullable=True)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+    cancelled_at = Column(DateTime(timezone=True), nullable=True)
+    cancellation_reason = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    items = relationship("ArchivedOrderItem", back_populates="order")
+
+    __table_args__ = (
+        # "Show older orders" pages through a user's archive newest first
+        Index("ix_orders_archive_user_id_created_at", "user_id", "created_at", "id"),
+    )
+
+class ArchivedOrderItem(Base):
+    __tablename__ = "order_items_archive"
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders_archive.id"), nullable=False, index=True)
+    product_id = Column(Integer, nullable=False)
+
+    product_name = Column(String(255), nullable=False)
+    product_sku = Column(String(50), nullable=False)
+    product_image_url = Column(String(500), nullable=True)
+
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(Numeric(10, 2), nullable=False)
+    discount_percent = Column(Numeric(5, 2), default=0)
+    total_price = Column(Numeric(10, 2), nullable=False)
+
+    created_at = Column(DateTime(timezone=True))
+
+    order = relationship("ArchivedOrder", back_populates="items")
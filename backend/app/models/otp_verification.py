@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -11,16 +11,24 @@ class OTPVerification(Base):
     - Retry count limiting (max 3 attempts per OTP)
     - Rate limit tracking
     - Usage tracking to prevent reuse
+
+    Range-partitioned by day on created_at (app.services.partition_service);
+    queries bound created_at so only recent partitions are scanned.
     """
     __tablename__ = "otp_verifications"
 
-    id = Column(Integer, primary_key=True, index=True)
-    phone = Column(String(15), index=True, nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    phone = Column(String(15), nullable=False)
     otp = Column(String(6), nullable=False)  # The OTP code
     expires_at = Column(DateTime(timezone=True), nullable=False)
     retry_count = Column(Integer, default=0, nullable=False)  # Max 3 attempts
     is_used = Column(Boolean, default=False, nullable=False)  # Prevent OTP reuse
     is_verified = Column(Boolean, default=False, nullable=False)
     last_attempt_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_otp_verifications_phone", "phone", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
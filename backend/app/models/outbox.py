@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    Domain event appended by a procedure in the same transaction as the state
+    change it describes; drained by the app's outbox dispatcher.
+    """
+    __tablename__ = "outbox"
+
+    id = Column(BigInteger, primary_key=True)
+    aggregate_type = Column(String(30), nullable=False)
+    aggregate_id = Column(Integer, nullable=False)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_outbox_pending", "available_at", "id",
+            postgresql_where=text("dispatched_at IS NULL")
+        ),
+        Index("ix_outbox_aggregate", "aggregate_type", "aggregate_id"),
+    )
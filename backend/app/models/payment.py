@@ -24,7 +24,9 @@ class Payment(Base):
     __tablename__ = "payments"
     
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, unique=True, index=True)
+    # orders.id or, once the order is archived, orders_archive.id; checked by
+    # the payments_order_id_fkey constraint trigger instead of a foreign key
+    order_id = Column(Integer, nullable=False, unique=True, index=True)
     
     payment_method = Column(SQLEnum(PaymentMethod), nullable=False)
     payment_provider = Column(String(50), nullable=True)
@@ -48,12 +50,14 @@ class Payment(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
-    order = relationship("Order", back_populates="payment")
+    order = relationship("Order", primaryjoin="foreign(Payment.order_id) == Order.id", back_populates="payment")
 
 class PaymentAttempt(Base):
+    """Range-partitioned by month on created_at (app.services.partition_service)"""
     __tablename__ = "payment_attempts"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     payment_id = Column(Integer, ForeignKey("payments.id"), nullable=False, index=True)
     
     attempt_number = Column(Integer, nullable=False)
@@ -63,6 +67,6 @@ class PaymentAttempt(Base):
     gateway_response = Column(Text, nullable=True)
     failure_reason = Column(Text, nullable=True)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
     
     payment = relationship("Payment")
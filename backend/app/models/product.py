@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Numeric
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, DateTime, ForeignKey, Text, Numeric, CheckConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -10,6 +10,7 @@ class Category(Base):
     name = Column(String(100), nullable=False)
     slug = Column(String(100), unique=True, index=True, nullable=False)
     parent_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    path = Column(String(255), nullable=True)  # '/<root id>/.../<id>/', maintained by trigger
     image_url = Column(String(500), nullable=True)
     is_active = Column(Boolean, default=True)
     display_order = Column(Integer, default=0)
@@ -40,6 +41,7 @@ class Product(Base):
     is_featured = Column(Boolean, default=False)
     rating_avg = Column(Numeric(2, 1), default=0)
     rating_count = Column(Integer, default=0)
+    order_count = Column(Integer, nullable=False, default=0, server_default="0")  # maintained by trigger on order_items
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -47,6 +49,11 @@ class Product(Base):
     images = relationship("ProductImage", back_populates="product", cascade="all, delete-orphan")
     inventory = relationship("Inventory", back_populates="product", uselist=False)
 
+    __table_args__ = (
+        # int4range(age_min_months, age_max_months) in the age filter rejects an inverted window
+        CheckConstraint("age_min_months <= age_max_months", name="ck_products_age_window"),
+    )
+
 class ProductImage(Base):
     __tablename__ = "product_images"
     
@@ -59,3 +66,50 @@ class ProductImage(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     product = relationship("Product", back_populates="images")
+
+class ProductCard(Base):
+    """
+    Denormalized listing projection of a product.
+
+    Holds only what listing pages render and filter on. Rows are maintained by
+    database triggers on products, product_images and inventory, and can be
+    rebuilt in full with `python manage.py rebuild-product-cards`.
+    """
+    __tablename__ = "product_cards"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    sku = Column(String(50), nullable=False)
+    name = Column(String(255), nullable=False)
+    category_id = Column(Integer, nullable=False)
+    brand = Column(String(100), nullable=True)
+    gender = Column(String(10), nullable=True)
+    age_min_months = Column(Integer, nullable=True)
+    age_max_months = Column(Integer, nullable=True)
+    mrp = Column(Numeric(10, 2), nullable=False)
+    selling_price = Column(Numeric(10, 2), nullable=False)
+    discount_percent = Column(Numeric(5, 2), nullable=True)
+    primary_image_url = Column(String(500), nullable=True)
+    rating_avg = Column(Numeric(2, 1), nullable=True)
+    rating_count = Column(Integer, nullable=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    stock_available = Column(Integer, nullable=False, default=0)
+    is_active = Column(Boolean, nullable=True)
+    is_featured = Column(Boolean, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        CheckConstraint("age_min_months <= age_max_months", name="ck_product_cards_age_window"),
+    )
+
+
+class CatalogGeneration(Base):
+    """
+    Version counters behind catalog ETags, bumped by triggers in the writing
+    transaction: `products` when a card's content changes (not its stock or
+    order count), `categories` on any category write.
+    """
+    __tablename__ = "catalog_generations"
+
+    scope = Column(String(20), primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=0)
@@ -11,16 +11,23 @@ class RefreshToken(Base):
     - Tracks active refresh tokens
     - Supports token revocation on logout
     - Links tokens to specific users
+
+    Range-partitioned by day on created_at (app.services.partition_service);
+    a token is never used after REFRESH_TOKEN_EXPIRE_DAYS, so lookups bound
+    created_at to that window. Token strings are indexed but not unique: a
+    unique index on a partitioned table would have to include created_at.
     """
     __tablename__ = "refresh_tokens"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    token = Column(String(500), unique=True, nullable=False, index=True)
+    token = Column(String(500), nullable=False, index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     is_revoked = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
     revoked_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationship
     user = relationship("User", backref="refresh_tokens")
+
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
@@ -21,7 +21,9 @@ class Refund(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     refund_number = Column(String(50), unique=True, index=True, nullable=False)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    # orders.id or, once the order is archived, orders_archive.id; checked by
+    # the refunds_order_id_fkey constraint trigger instead of a foreign key
+    order_id = Column(Integer, nullable=False, index=True)
     payment_id = Column(Integer, ForeignKey("payments.id"), nullable=False)
     
     refund_type = Column(SQLEnum(RefundType), nullable=False)
@@ -38,5 +40,5 @@ class Refund(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    order = relationship("Order", back_populates="refund")
+    order = relationship("Order", primaryjoin="foreign(Refund.order_id) == Order.id", back_populates="refund")
     payment = relationship("Payment")
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, BigInteger, String, DateTime, Float, Integer, Text, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ScheduledJob(Base):
+    """
+    When a background job is next due, shared by all replicas; read and
+    written under the job's advisory lock (see app.core.scheduler).
+    """
+    __tablename__ = "scheduled_jobs"
+
+    name = Column(String(64), primary_key=True)
+    next_run_at = Column(DateTime(timezone=True), nullable=False)
+    last_status = Column(String(20), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class JobRun(Base):
+    """One run of a background job, kept for SCHEDULER_HISTORY_DAYS"""
+    __tablename__ = "job_runs"
+
+    id = Column(BigInteger, primary_key=True)
+    job_name = Column(String(64), nullable=False)
+    instance = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False)  # succeeded | failed | timed_out
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    rows_affected = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_job_runs_job_name_started_at", "job_name", "started_at"),
+        Index("ix_job_runs_started_at", "started_at"),
+    )
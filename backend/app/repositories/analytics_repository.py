@@ -0,0 +1,79 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc
+from datetime import datetime
+from typing import Dict, List
+from app.models.analytics import SalesRollup
+from app.models.product import Category, Product
+
+_TOTALS = [
+    func.sum(SalesRollup.units).label("units"),
+    func.sum(SalesRollup.revenue).label("revenue"),
+    func.sum(SalesRollup.discounts).label("discounts"),
+    func.sum(SalesRollup.refunds).label("refunds"),
+]
+
+SALES_SORTS = {
+    "units": desc("units"),
+    "revenue": desc("revenue"),
+    "refunds": desc("refunds"),
+}
+
+
+class AnalyticsRepository:
+    """Reads of the sales rollups; writes happen in app.services.analytics_service"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_top_sales(
+        self,
+        dimension: str,
+        start: datetime,
+        end: datetime,
+        sort: str = "revenue",
+        limit: int = 20
+    ) -> List:
+        """Keys of `dimension` ranked by their daily rollups over [start, end)"""
+        stmt = (
+            select(SalesRollup.key, *_TOTALS)
+            .where(
+                SalesRollup.granularity == "day",
+                SalesRollup.dimension == dimension,
+                SalesRollup.bucket >= start,
+                SalesRollup.bucket < end
+            )
+            .group_by(SalesRollup.key)
+            .order_by(SALES_SORTS[sort], SalesRollup.key)
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return result.all()
+
+    async def get_sales_series(
+        self,
+        dimension: str,
+        key: str,
+        granularity: str,
+        start: datetime,
+        end: datetime
+    ) -> List[SalesRollup]:
+        stmt = select(SalesRollup).where(
+            SalesRollup.granularity == granularity,
+            SalesRollup.dimension == dimension,
+            SalesRollup.key == key,
+            SalesRollup.bucket >= start,
+            SalesRollup.bucket < end
+        ).order_by(SalesRollup.bucket)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def get_labels(self, dimension: str, keys: List[str]) -> Dict[str, str]:
+        """Display names for product or category keys; brands are their own label"""
+        if dimension == "brand":
+            return {key: key for key in keys}
+        model = Product if dimension == "product" else Category
+        ids = [int(key) for key in keys if key.isdigit()]
+        if not ids:
+            return {}
+        result = await self.db.execute(select(model.id, model.name).where(model.id.in_(ids)))
+        return {str(id_): name for id_, name in result.all()}
@@ -29,10 +29,13 @@ class CouponRepository:
         return result.scalars().all()
 
     async def get_user_usage_count(self, coupon_id: int, user_id: int) -> int:
+        # coupon_usage is partitioned on used_at; no usage predates its coupon
+        valid_from = select(Coupon.valid_from).where(Coupon.id == coupon_id).scalar_subquery()
         count_stmt = select(func.count()).select_from(CouponUsage).where(
             CouponUsage.coupon_id == coupon_id,
             CouponUsage.user_id == user_id,
-            CouponUsage.is_reversed == False
+            CouponUsage.is_reversed == False,
+            CouponUsage.used_at >= valid_from
         )
         count_res = await self.db.execute(count_stmt)
         return count_res.scalar() or 0
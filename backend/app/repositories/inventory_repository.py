@@ -0,0 +1,48 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+
+# Same effect as release_inventory() for every expired lock in the batch, in
+# one statement. SKIP LOCKED leaves locks a checkout is consuming right now.
+RELEASE_EXPIRED_LOCKS_SQL = text("""
+    WITH expired AS (
+        DELETE FROM inventory_locks
+        WHERE id IN (
+            SELECT id FROM inventory_locks
+            WHERE expires_at < NOW()
+            ORDER BY expires_at
+            LIMIT :limit
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING product_id, quantity_locked
+    ),
+    per_product AS (
+        SELECT product_id, SUM(quantity_locked) AS quantity, COUNT(*) AS locks
+        FROM expired
+        GROUP BY product_id
+    ),
+    released AS (
+        UPDATE inventory i
+        SET quantity_reserved = GREATEST(0, i.quantity_reserved - p.quantity),
+            updated_at = NOW()
+        FROM per_product p
+        WHERE i.product_id = p.product_id
+    )
+    SELECT COALESCE(SUM(locks), 0) FROM per_product
+""")
+
+
+class InventoryRepository:
+    """Repository for stock reservations outside the inventory procedures"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def release_expired_locks(self, limit: int) -> int:
+        """
+        Return the stock held by up to `limit` expired inventory locks and
+        delete them (maintenance operation). Returns the number released.
+        """
+        result = await self.db.execute(RELEASE_EXPIRED_LOCKS_SQL, {"limit": limit})
+        released = int(result.scalar())
+        await self.db.commit()
+        return released
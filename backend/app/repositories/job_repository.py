@@ -0,0 +1,29 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from sqlalchemy.orm import aliased
+from typing import Dict, List
+from app.models.scheduled_job import JobRun, ScheduledJob
+
+class JobRepository:
+    """Repository for the scheduler's shared schedule and run history"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_schedule(self) -> Dict[str, ScheduledJob]:
+        result = await self.db.execute(select(ScheduledJob))
+        return {job.name: job for job in result.scalars().all()}
+
+    async def get_recent_runs(self, per_job: int) -> Dict[str, List[JobRun]]:
+        """The latest `per_job` runs of every job, newest first"""
+        ranked = select(
+            JobRun,
+            func.row_number().over(partition_by=JobRun.job_name, order_by=JobRun.started_at.desc()).label("rank")
+        ).subquery()
+        run = aliased(JobRun, ranked)
+        stmt = select(run).where(ranked.c.rank <= per_job).order_by(run.job_name, run.started_at.desc())
+        result = await self.db.execute(stmt)
+        runs: Dict[str, List[JobRun]] = {}
+        for job_run in result.scalars().all():
+            runs.setdefault(job_run.job_name, []).append(job_run)
+        return runs
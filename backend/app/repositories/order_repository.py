@@ -1,28 +1,85 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
-from sqlalchemy.orm import joinedload
-from typing import Optional, List, Tuple
-from app.models.order import Order, OrderItem
+from sqlalchemy import select, desc, func, text, tuple_
+from sqlalchemy.orm import joinedload, selectinload
+from datetime import datetime
+from typing import Optional, List, Tuple, Union
+from app.models.order import Order, OrderItem, ArchivedOrder, ArchivedOrderItem
+
+ORDER_COLUMNS = ", ".join(c.name for c in Order.__table__.columns)
+ITEM_COLUMNS = ", ".join(c.name for c in OrderItem.__table__.columns)
+
+# Finished orders are moved with their items in one statement, so a reader
+# sees an order either live or archived, never both or neither. Orders with a
+# refund in flight or a stock lock are left until those settle; SKIP LOCKED
+# leaves orders a request is working on.
+ARCHIVE_ORDERS_SQL = text(f"""
+    WITH batch AS (
+        SELECT o.id FROM orders o
+        WHERE o.status IN ('DELIVERED', 'CANCELLED')
+          AND o.created_at < :cutoff
+          AND NOT EXISTS (
+              SELECT 1 FROM refunds r
+              WHERE r.order_id = o.id AND r.status IN ('REQUESTED', 'APPROVED', 'PROCESSING')
+          )
+          AND NOT EXISTS (SELECT 1 FROM inventory_locks l WHERE l.order_id = o.id)
+        ORDER BY o.id
+        LIMIT :limit
+        FOR UPDATE OF o SKIP LOCKED
+    ),
+    moved_orders AS (
+        DELETE FROM orders WHERE id IN (SELECT id FROM batch)
+        RETURNING {ORDER_COLUMNS}
+    ),
+    archived_orders AS (
+        INSERT INTO orders_archive ({ORDER_COLUMNS})
+        SELECT {ORDER_COLUMNS} FROM moved_orders
+        RETURNING id
+    ),
+    moved_items AS (
+        DELETE FROM order_items WHERE order_id IN (SELECT id FROM batch)
+        RETURNING {ITEM_COLUMNS}
+    ),
+    archived_items AS (
+        INSERT INTO order_items_archive ({ITEM_COLUMNS})
+        SELECT {ITEM_COLUMNS} FROM moved_items
+    )
+    SELECT COUNT(*) FROM archived_orders
+""")
+
+AnyOrder = Union[Order, ArchivedOrder]
+
 
 class OrderRepository:
+    """
+    Orders live in `orders` until the archive job moves finished ones to
+    `orders_archive`. Lookups by id or number fall back to the archive only
+    when the live table has no such order; listings stay on the live table
+    unless the caller pages into older orders with `get_archived_user_orders`.
+    """
+
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_by_id(self, order_id: int) -> Optional[Order]:
+    async def get_by_id(self, order_id: int) -> Optional[AnyOrder]:
         stmt = select(Order).options(
             joinedload(Order.items),
             joinedload(Order.payment),
             joinedload(Order.address)
         ).where(Order.id == order_id)
         result = await self.db.execute(stmt)
-        return result.scalars().first()
+        return result.scalars().first() or await self._get_archived(ArchivedOrder.id == order_id)
 
-    async def get_by_order_number(self, order_number: str) -> Optional[Order]:
+    async def get_by_order_number(self, order_number: str) -> Optional[AnyOrder]:
         stmt = select(Order).options(
             joinedload(Order.items),
             joinedload(Order.payment)
         ).where(Order.order_number == order_number)
         result = await self.db.execute(stmt)
+        return result.scalars().first() or await self._get_archived(ArchivedOrder.order_number == order_number)
+
+    async def _get_archived(self, condition) -> Optional[ArchivedOrder]:
+        stmt = select(ArchivedOrder).options(selectinload(ArchivedOrder.items)).where(condition)
+        result = await self.db.execute(stmt)
         return result.scalars().first()
 
     async def get_user_orders(
@@ -45,7 +102,60 @@ class OrderRepository:
         orders = result.scalars().all()
         return orders, total
 
-    async def get_order_items(self, order_id: int) -> List[OrderItem]:
+    async def get_archived_user_orders(
+        self,
+        user_id: int,
+        status: Optional[str] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 20
+    ) -> Tuple[List[ArchivedOrder], int]:
+        """
+        A user's archived orders, newest first, starting after the
+        (created_at, id) of the last one already shown
+        """
+        conditions = [ArchivedOrder.user_id == user_id]
+        if status:
+            conditions.append(ArchivedOrder.status == status)
+
+        count_stmt = select(func.count()).select_from(ArchivedOrder).where(*conditions)
+        total = await self.db.scalar(count_stmt) or 0
+
+        if before:
+            conditions.append(tuple_(ArchivedOrder.created_at, ArchivedOrder.id) < tuple_(*before))
+        stmt = (
+            select(ArchivedOrder).where(*conditions)
+            .options(selectinload(ArchivedOrder.items))
+            .order_by(desc(ArchivedOrder.created_at), desc(ArchivedOrder.id))
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all(), total
+
+    async def has_archived_orders(self, user_id: int, status: Optional[str] = None) -> bool:
+        """Whether get_archived_user_orders with the same filter has anything to show"""
+        conditions = [ArchivedOrder.user_id == user_id]
+        if status:
+            conditions.append(ArchivedOrder.status == status)
+        stmt = select(select(ArchivedOrder.id).where(*conditions).exists())
+        return bool(await self.db.scalar(stmt))
+
+    async def get_order_items(self, order_id: int) -> List[Union[OrderItem, ArchivedOrderItem]]:
         stmt = select(OrderItem).where(OrderItem.order_id == order_id)
         result = await self.db.execute(stmt)
+        items = result.scalars().all()
+        if items:
+            return items
+        stmt = select(ArchivedOrderItem).where(ArchivedOrderItem.order_id == order_id)
+        result = await self.db.execute(stmt)
         return result.scalars().all()
+
+    async def archive_finished_orders(self, cutoff: datetime, limit: int) -> int:
+        """
+        Move up to `limit` delivered or cancelled orders created before
+        `cutoff`, with their items, to the archive tables (maintenance
+        operation). Returns the number moved.
+        """
+        result = await self.db.execute(ARCHIVE_ORDERS_SQL, {"cutoff": cutoff, "limit": limit})
+        archived = int(result.scalar())
+        await self.db.commit()
+        return archived
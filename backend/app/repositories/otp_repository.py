@@ -1,10 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, and_, or_
+from sqlalchemy import select, update, delete, and_, or_
 from sqlalchemy.sql import func
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 from app.models.otp_verification import OTPVerification
 
+# otp_verifications is partitioned by day on created_at and only keeps about a
+# day (app.services.partition_service). Bounding created_at in every lookup
+# lets the planner skip all older partitions.
+OTP_LOOKBACK = timedelta(days=1)
+
+
+def _recent():
+    return OTPVerification.created_at >= datetime.now(timezone.utc) - OTP_LOOKBACK
+
 class OTPRepository:
     """Repository for OTP operations - handles all database queries for OTP"""
 
@@ -18,7 +27,8 @@ class OTPRepository:
             .where(
                 and_(
                     OTPVerification.phone == phone,
-                    OTPVerification.is_used == False
+                    OTPVerification.is_used == False,
+                    _recent()
                 )
             )
             .order_by(OTPVerification.created_at.desc())
@@ -27,6 +37,45 @@ class OTPRepository:
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
+    async def consume_otp(self, phone: str, otp: str) -> Optional[int]:
+        """
+        Mark the latest unused OTP for this phone verified and used if the code
+        matches and it is still valid, in one UPDATE. Returns its id, or None
+        when nothing was consumed. Does not commit.
+        """
+        latest = (
+            select(OTPVerification.id)
+            .where(
+                and_(
+                    OTPVerification.phone == phone,
+                    OTPVerification.is_used == False,
+                    _recent()
+                )
+            )
+            .order_by(OTPVerification.created_at.desc())
+            .limit(1)
+            .with_for_update()
+            .scalar_subquery()
+        )
+        stmt = (
+            update(OTPVerification)
+            .where(
+                and_(
+                    OTPVerification.id == latest,
+                    _recent(),
+                    OTPVerification.otp == otp,
+                    OTPVerification.retry_count < 3,
+                    OTPVerification.is_verified == False,
+                    OTPVerification.expires_at >= func.now()
+                )
+            )
+            .values(is_verified=True, is_used=True, last_attempt_at=func.now())
+            .returning(OTPVerification.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar()
+
     async def create_otp(
         self,
         phone: str,
@@ -57,7 +106,8 @@ class OTPRepository:
             .where(
                 and_(
                     OTPVerification.phone == phone,
-                    OTPVerification.is_used == False
+                    OTPVerification.is_used == False,
+                    _recent()
                 )
             )
         )
@@ -84,7 +134,7 @@ class OTPRepository:
         otp_record.last_attempt_at = datetime.now(timezone.utc)
         await self.db.commit()
 
-    async def cleanup_expired_otps(self):
+    async def cleanup_expired_otps(self) -> int:
         """Clean up expired OTP records (maintenance operation)"""
         cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
         stmt = delete(OTPVerification).where(
@@ -93,5 +143,6 @@ class OTPRepository:
                 OTPVerification.created_at < cutoff
             )
         )
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
         await self.db.commit()
+        return result.rowcount
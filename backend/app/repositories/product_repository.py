@@ -1,16 +1,69 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, and_, or_, func, text, tuple_, literal_column
+from sqlalchemy.orm import joinedload, selectinload
 from typing import Optional, List, Tuple
-from app.models.product import Product, Category, ProductImage
+from datetime import datetime
+from app.models.product import Product, Category, ProductImage, ProductCard
 from app.models.inventory import Inventory
+from app.core.cache import TTLCache
+from app.core.singleflight import SingleFlight
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from decimal import Decimal
 
+# Upper bounds of the price facet buckets; bucket i covers [bounds[i-1], bounds[i])
+PRICE_BUCKET_BOUNDS = [Decimal("250"), Decimal("500"), Decimal("1000"), Decimal("2000"), Decimal("5000")]
+
+# (label, min_months, max_months) for the age facet; bands are half-open
+AGE_BANDS = [
+    ("0-6 months", 0, 6),
+    ("6-12 months", 6, 12),
+    ("1-2 years", 12, 24),
+    ("2-4 years", 24, 48),
+    ("4-8 years", 48, 96),
+    ("8-12 years", 96, 144),
+]
+
+# Public sort keys -> ORDER BY; each matches a partial index on product_cards
+# and ends with product_id so paging is stable across equal sort values.
+SORT_OPTIONS = {
+    "newest": (ProductCard.created_at.desc(), ProductCard.product_id.asc()),
+    "price_asc": (ProductCard.selling_price.asc(), ProductCard.product_id.asc()),
+    "price_desc": (ProductCard.selling_price.desc(), ProductCard.product_id.desc()),
+    "rating": (ProductCard.rating_avg.desc(), ProductCard.product_id.asc()),
+    "popularity": (ProductCard.order_count.desc(), ProductCard.product_id.asc()),
+}
+
+def age_range(model):
+    """Inclusive int4range over a product's age window"""
+    return func.int4range(model.age_min_months, model.age_max_months, literal_column("'[]'"))
+
+_tree_cache = TTLCache(maxsize=1, ttl=settings.CATEGORY_TREE_TTL_SECONDS)
+
+# Identical concurrent catalog reads in this process share one DB round trip
+_catalog_flight = SingleFlight("catalog")
+
+
+async def _shared_read(read):
+    """
+    Run a coalesced read on its own session rather than the first caller's,
+    which its request may close while others still wait. The session is
+    closed before returning, so every caller gets the same detached rows with
+    their eager-loaded attributes, bound to no request.
+    """
+    async with AsyncSessionLocal() as db:
+        return await read(ProductRepository(db))
+
+
 class ProductRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def get_by_id(self, product_id: int) -> Optional[Product]:
+        key = ("get_by_id", product_id)
+        return await _catalog_flight.do(key, lambda: _shared_read(lambda repo: repo._get_by_id(product_id)))
+
+    async def _get_by_id(self, product_id: int) -> Optional[Product]:
         stmt = select(Product).options(
             joinedload(Product.images),
             joinedload(Product.inventory),
@@ -19,12 +72,44 @@ class ProductRepository:
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
+    async def get_by_ids(self, product_ids: List[int]) -> List[Tuple[Product, Optional[datetime]]]:
+        """
+        Active products for an id list in one round trip per relation: products
+        with inventory joined, then all their images in a single IN query.
+        Each row carries its card's refreshed_at as a version stamp. Missing or
+        inactive ids are simply absent; callers restore the requested order.
+        """
+        if not product_ids:
+            return []
+        key = ("get_by_ids", tuple(sorted(set(product_ids))))
+        return await _catalog_flight.do(key, lambda: _shared_read(lambda repo: repo._get_by_ids(product_ids)))
+
+    async def _get_by_ids(self, product_ids: List[int]) -> List[Tuple[Product, Optional[datetime]]]:
+        stmt = select(Product, ProductCard.refreshed_at).outerjoin(
+            ProductCard, ProductCard.product_id == Product.id
+        ).options(
+            joinedload(Product.inventory),
+            selectinload(Product.images)
+        ).where(Product.id == func.any(list(product_ids)), Product.is_active == True)
+        result = await self.db.execute(stmt)
+        return [tuple(row) for row in result.unique().all()]
+
+    async def get_cards(self, product_ids: List[int]) -> List[ProductCard]:
+        """Active product cards for an id list; callers restore the requested order"""
+        if not product_ids:
+            return []
+        stmt = select(ProductCard).where(
+            ProductCard.product_id == func.any(list(product_ids)), ProductCard.is_active == True
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
     async def get_by_sku(self, sku: str) -> Optional[Product]:
         stmt = select(Product).where(Product.sku == sku)
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
-    async def get_all(
+    async def _build_conditions(
         self,
         category_id: Optional[int] = None,
         brand: Optional[str] = None,
@@ -33,55 +118,155 @@ class ProductRepository:
         gender: Optional[str] = None,
         age_months: Optional[int] = None,
         search: Optional[str] = None,
-        is_featured: Optional[bool] = None,
-        sort_by: str = "created_at",
-        sort_order: str = "desc",
-        skip: int = 0,
-        limit: int = 20
-    ) -> Tuple[List[Product], int]:
-        conditions = [Product.is_active == True]
+        is_featured: Optional[bool] = None
+    ) -> list:
+        conditions = [ProductCard.is_active == True]
 
         if category_id:
-            conditions.append(Product.category_id == category_id)
+            # A category matches its whole subtree, resolved from the cached tree
+            tree = await CategoryRepository(self.db).get_tree()
+            category_ids = tree.subtree_ids(category_id)
+            if len(category_ids) == 1:
+                conditions.append(ProductCard.category_id == category_id)
+            else:
+                conditions.append(ProductCard.category_id.in_(category_ids))
         if brand:
-            conditions.append(Product.brand.ilike(f"%{brand}%"))
+            conditions.append(ProductCard.brand.ilike(f"%{brand}%"))
         if min_price:
-            conditions.append(Product.selling_price >= min_price)
+            conditions.append(ProductCard.selling_price >= min_price)
         if max_price:
-            conditions.append(Product.selling_price <= max_price)
+            conditions.append(ProductCard.selling_price <= max_price)
         if gender:
-            conditions.append(Product.gender == gender)
+            conditions.append(ProductCard.gender == gender)
         if age_months is not None:
-            conditions.append(and_(Product.age_min_months <= age_months, Product.age_max_months >= age_months))
+            # Same expression as the GiST index ix_product_cards_age_range
+            conditions.append(age_range(ProductCard).op("@>")(age_months))
         if search:
+            # Descriptions are not projected; match them against the source rows
             conditions.append(or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.description.ilike(f"%{search}%"),
-                Product.brand.ilike(f"%{search}%")
+                ProductCard.name.ilike(f"%{search}%"),
+                ProductCard.brand.ilike(f"%{search}%"),
+                ProductCard.product_id.in_(
+                    select(Product.id).where(Product.description.ilike(f"%{search}%"))
+                )
             ))
         if is_featured is not None:
-            conditions.append(Product.is_featured == is_featured)
+            conditions.append(ProductCard.is_featured == is_featured)
+        return conditions
+
+    async def get_all(
+        self,
+        category_id: Optional[int] = None,
+        brand: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        gender: Optional[str] = None,
+        age_months: Optional[int] = None,
+        search: Optional[str] = None,
+        is_featured: Optional[bool] = None,
+        sort: str = "newest",
+        skip: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[ProductCard], int]:
+        """List page of product cards; reads only the product_cards projection"""
+        if sort not in SORT_OPTIONS:
+            raise ValueError(f"Unknown sort option: {sort}")
+        filters = dict(
+            category_id=category_id, brand=brand, min_price=min_price,
+            max_price=max_price, gender=gender, age_months=age_months,
+            search=search, is_featured=is_featured, sort=sort, skip=skip, limit=limit
+        )
+        key = ("get_all", tuple(sorted(filters.items())))
+        return await _catalog_flight.do(key, lambda: _shared_read(lambda repo: repo._get_all(**filters)))
 
-        count_stmt = select(func.count()).select_from(Product).where(*conditions)
+    async def _get_all(
+        self,
+        category_id: Optional[int] = None,
+        brand: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        gender: Optional[str] = None,
+        age_months: Optional[int] = None,
+        search: Optional[str] = None,
+        is_featured: Optional[bool] = None,
+        sort: str = "newest",
+        skip: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[ProductCard], int]:
+        conditions = await self._build_conditions(
+            category_id=category_id, brand=brand, min_price=min_price,
+            max_price=max_price, gender=gender, age_months=age_months,
+            search=search, is_featured=is_featured
+        )
+
+        count_stmt = select(func.count()).select_from(ProductCard).where(*conditions)
         total_result = await self.db.execute(count_stmt)
         total = total_result.scalar() or 0
 
-        order_col = getattr(Product, sort_by)
-        if sort_order == "desc":
-            order_col = order_col.desc()
-        else:
-            order_col = order_col.asc()
-
-        stmt = select(Product).where(*conditions).options(
-            joinedload(Product.images),
-            joinedload(Product.inventory)
-        ).order_by(order_col).offset(skip).limit(limit)
+        stmt = select(ProductCard).where(*conditions).order_by(*SORT_OPTIONS[sort]).offset(skip).limit(limit)
 
         result = await self.db.execute(stmt)
         products = result.scalars().all()
 
         return products, total
 
+    async def get_facets(self, **filters) -> dict:
+        """
+        Facet counts for the current filter set in one round trip.
+
+        GROUPING SETS yields one row group per facet (brand, gender, price
+        bucket) plus a grand-total row. Age bands overlap (a product covers an
+        age range), so they are counted with FILTER aggregates read from the
+        grand-total row.
+        """
+        conditions = await self._build_conditions(**filters)
+
+        # Inline the bounds so the SELECT and GROUP BY expressions are identical
+        bounds = literal_column(f"ARRAY[{', '.join(str(b) for b in PRICE_BUCKET_BOUNDS)}]::numeric[]")
+        price_bucket = func.width_bucket(ProductCard.selling_price, bounds)
+        age_counts = [
+            func.count().filter(and_(
+                ProductCard.age_min_months < high, ProductCard.age_max_months >= low
+            ))
+            for _, low, high in AGE_BANDS
+        ]
+        stmt = (
+            select(
+                ProductCard.brand,
+                ProductCard.gender,
+                price_bucket,
+                func.grouping(ProductCard.brand),
+                func.grouping(ProductCard.gender),
+                func.grouping(price_bucket),
+                func.count(),
+                *age_counts
+            )
+            .where(*conditions)
+            .group_by(func.grouping_sets(ProductCard.brand, ProductCard.gender, price_bucket, tuple_()))
+        )
+        result = await self.db.execute(stmt)
+
+        facets = {"total": 0, "brands": [], "genders": [], "price_buckets": [], "age_bands": []}
+        for row in result.all():
+            brand, gender, bucket, g_brand, g_gender, g_bucket, count = row[:7]
+            if not g_brand:
+                facets["brands"].append((brand, count))
+            elif not g_gender:
+                facets["genders"].append((gender, count))
+            elif not g_bucket:
+                facets["price_buckets"].append((bucket, count))
+            else:
+                facets["total"] = count
+                facets["age_bands"] = list(zip(AGE_BANDS, row[7:]))
+        return facets
+
+    async def rebuild_cards(self) -> int:
+        """Rebuild the whole product_cards projection from source tables"""
+        result = await self.db.execute(text("SELECT rebuild_product_cards()"))
+        count = result.scalar() or 0
+        await self.db.commit()
+        return count
+
     async def get_stock(self, product_id: int) -> int:
         stmt = select(Inventory).where(Inventory.product_id == product_id)
         result = await self.db.execute(stmt)
@@ -119,3 +304,70 @@ class CategoryRepository:
         stmt = select(Category).where(Category.parent_id == parent_id, Category.is_active == True).order_by(Category.display_order)
         result = await self.db.execute(stmt)
         return result.scalars().all()
+
+    async def get_descendants(self, category_id: int) -> List[Category]:
+        """All categories under category_id (inclusive) via the path index"""
+        category = await self.get_by_id(category_id)
+        if not category or not category.path:
+            return []
+        stmt = select(Category).where(Category.path.startswith(category.path, autoescape=True)).order_by(Category.path)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def get_tree(self) -> "CategoryTree":
+        """Process-wide snapshot of the active category tree (one query to build)"""
+        tree = _tree_cache.get("tree")
+        if tree is None:
+            stmt = select(Category).where(Category.is_active == True).order_by(Category.path)
+            result = await self.db.execute(stmt)
+            tree = CategoryTree(result.scalars().all())
+            _tree_cache.set("tree", tree)
+        return tree
+
+
+def invalidate_category_tree():
+    """Drop the cached tree so the next reader rebuilds it"""
+    _tree_cache.clear()
+
+
+class CategoryTree:
+    """
+    Immutable in-memory category tree built from rows ordered by path.
+
+    A category whose parent is inactive is dropped with its whole subtree.
+    """
+
+    def __init__(self, categories: List[Category]):
+        self.nodes = {}
+        self.children = {}
+        self.roots = []
+        for c in categories:
+            if c.parent_id is not None and c.parent_id not in self.nodes:
+                continue
+            self.nodes[c.id] = {
+                "id": c.id, "name": c.name, "slug": c.slug, "parent_id": c.parent_id,
+                "image_url": c.image_url, "display_order": c.display_order or 0, "path": c.path,
+            }
+            siblings = self.roots if c.parent_id is None else self.children.setdefault(c.parent_id, [])
+            siblings.append(c.id)
+        sort_key = lambda cid: (self.nodes[cid]["display_order"], cid)
+        self.roots.sort(key=sort_key)
+        for ids in self.children.values():
+            ids.sort(key=sort_key)
+
+    def subtree_ids(self, category_id: int) -> List[int]:
+        """category_id and all of its descendants"""
+        ids, stack = [], [category_id]
+        while stack:
+            cid = stack.pop()
+            ids.append(cid)
+            stack.extend(self.children.get(cid, ()))
+        return ids
+
+    def to_list(self, root_id: Optional[int] = None) -> List[dict]:
+        """Nested node dicts (CategoryTreeNode shape) from the roots or one node"""
+        def build(cid):
+            return {**self.nodes[cid], "children": [build(child) for child in self.children.get(cid, ())]}
+        if root_id is None:
+            return [build(cid) for cid in self.roots]
+        return [build(root_id)] if root_id in self.nodes else []
@@ -1,9 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, and_
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
+from app.core.config import settings
 from app.models.refresh_token import RefreshToken
 
+
+def _live():
+    """
+    refresh_tokens is partitioned by day on created_at; a token older than
+    its lifetime is expired, so lookups skip those partitions outright
+    """
+    return RefreshToken.created_at >= datetime.now(timezone.utc) - timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
 class RefreshTokenRepository:
     """Repository for JWT Refresh Token operations"""
 
@@ -28,9 +37,25 @@ class RefreshTokenRepository:
         await self.db.refresh(refresh_token)
         return refresh_token
 
+    def add_refresh_token(
+        self,
+        user_id: int,
+        token: str,
+        expires_at: datetime
+    ) -> RefreshToken:
+        """Stage a new refresh token; it is written with the caller's next flush/commit"""
+        refresh_token = RefreshToken(
+            user_id=user_id,
+            token=token,
+            expires_at=expires_at,
+            is_revoked=False
+        )
+        self.db.add(refresh_token)
+        return refresh_token
+
     async def get_by_token(self, token: str) -> Optional[RefreshToken]:
         """Get refresh token by token string"""
-        stmt = select(RefreshToken).where(RefreshToken.token == token)
+        stmt = select(RefreshToken).where(RefreshToken.token == token, _live())
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
@@ -40,7 +65,8 @@ class RefreshTokenRepository:
             and_(
                 RefreshToken.token == token,
                 RefreshToken.is_revoked == False,
-                RefreshToken.expires_at > datetime.now(timezone.utc)
+                RefreshToken.expires_at > datetime.now(timezone.utc),
+                _live()
             )
         )
         result = await self.db.execute(stmt)
@@ -61,7 +87,8 @@ class RefreshTokenRepository:
         stmt = select(RefreshToken).where(
             and_(
                 RefreshToken.user_id == user_id,
-                RefreshToken.is_revoked == False
+                RefreshToken.is_revoked == False,
+                _live()
             )
         )
         result = await self.db.execute(stmt)
@@ -74,13 +101,14 @@ class RefreshTokenRepository:
         if tokens:
             await self.db.commit()
 
-    async def cleanup_expired_tokens(self):
+    async def cleanup_expired_tokens(self) -> int:
         """Delete expired refresh tokens (maintenance operation)"""
         stmt = delete(RefreshToken).where(
             RefreshToken.expires_at < datetime.now(timezone.utc)
         )
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
         await self.db.commit()
+        return result.rowcount
 
     async def is_token_valid(self, token: str) -> bool:
         """Check if a refresh token is valid"""
@@ -0,0 +1,35 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timezone
+from typing import Optional
+from app.core.invalidation import TOKEN, publish
+from app.models.revoked_token import RevokedToken
+
+class RevokedTokenRepository:
+    """Repository for revoked access tokens (JWT ids)"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def revoke(self, jti: str, expires_at: datetime, user_id: Optional[int] = None):
+        """
+        Record the revocation and notify every API process in the same
+        transaction; the notification is only delivered once it commits.
+        """
+        await self.db.execute(
+            insert(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+        await publish(self.db, TOKEN, [f"{jti}:{expires_at.timestamp()}"])
+        await self.db.commit()
+
+    async def cleanup_expired_tokens(self) -> int:
+        """Delete revocations of tokens that have expired anyway (maintenance operation)"""
+        stmt = delete(RevokedToken).where(
+            RevokedToken.expires_at < datetime.now(timezone.utc)
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        return result.rowcount
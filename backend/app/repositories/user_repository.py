@@ -1,7 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List
-from app.models.user import User, Child
+from sqlalchemy import select, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+from typing import Optional, List, Tuple
+from app.models.user import User, Child, UserRole
 
 class UserRepository:
     def __init__(self, db: AsyncSession):
@@ -44,6 +46,25 @@ class UserRepository:
         await self.db.refresh(db_user)
         return db_user
 
+    async def upsert_verified(self, phone: str) -> Tuple[User, bool]:
+        """
+        Create the user for this phone, or mark the existing one verified and
+        active, in one INSERT ... ON CONFLICT. Returns (user, created).
+        Does not commit.
+        """
+        stmt = (
+            insert(User)
+            .values(phone=phone, role=UserRole.CUSTOMER, is_expecting=False, is_active=True, is_verified=True)
+            .on_conflict_do_update(
+                index_elements=[User.phone],
+                set_={"is_verified": True, "is_active": True, "updated_at": func.now()}
+            )
+            .returning(User, literal_column("xmax = 0").label("created"))
+        )
+        result = await self.db.execute(stmt, execution_options={"populate_existing": True})
+        user, created = result.one()
+        return user, created
+
     async def update_user(self, user: User, update_data: dict) -> User:
         for key, value in update_data.items():
             setattr(user, key, value)
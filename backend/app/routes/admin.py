@@ -0,0 +1,176 @@
+"""
+ADMIN API
+Base path: /api/v1/admin
+
+Operational endpoints for administrators.
+"""
+import io
+import tempfile
+from datetime import date
+
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.metrics import metrics
+from app.core.scheduler import scheduler
+from app.core.security import get_current_admin
+from app.schemas.analytics import (
+    SalesDimension, SalesGranularity, SalesSort, SalesRankingResponse, SalesSeriesResponse
+)
+from app.schemas.inventory import InventorySyncRequest, InventorySyncReport
+from app.repositories.job_repository import JobRepository
+from app.schemas.product import CatalogImportReport
+from app.schemas.scheduler import JobStatusResponse
+from app.services import analytics_service
+from app.services.catalog_import_service import CatalogImportService
+from app.services.export_service import EXPORT_FORMATS, stream_orders_export
+from app.services.inventory_sync_service import InventorySyncService
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/metrics")
+async def get_metrics(admin = Depends(get_current_admin)):
+    """Counters and gauges of the worker process that served this request"""
+    return metrics.snapshot()
+
+
+@router.post("/catalog/import", response_model=CatalogImportReport)
+async def import_catalog(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    admin = Depends(get_current_admin)
+):
+    """
+    Bulk create or update products from the raw request body (CSV or JSONL).
+    The body is spooled to disk as it arrives, then imported chunk by chunk.
+    Spool writes run in the threadpool so disk I/O does not stall the loop.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=settings.IMPORT_SPOOL_MAX_MEMORY) as spool:
+        async for chunk in request.stream():
+            await run_in_threadpool(spool.write, chunk)
+        if not spool.tell():
+            raise HTTPException(status_code=400, detail="Request body is empty")
+        spool.seek(0)
+
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            return await CatalogImportService().import_stream(stream, format)
+        finally:
+            stream.detach()
+
+
+@router.post("/inventory/sync", response_model=InventorySyncReport)
+async def sync_inventory(request: InventorySyncRequest, admin = Depends(get_current_admin)):
+    """
+    Apply a stock feed in one transaction: each item sets an absolute
+    `quantity` or adds a `delta`. Conflicting rows are reported and skipped;
+    with dry_run nothing is written.
+    """
+    return await InventorySyncService().sync(request.items, dry_run=request.dry_run)
+
+
+@router.get("/exports/orders")
+async def export_orders(
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    admin = Depends(get_current_admin)
+):
+    """
+    Orders created between date_from and date_to (inclusive, UTC) joined with
+    their payment and refunds, one row per refund. Streamed from a server-side
+    cursor, so any date range is served in constant memory.
+    """
+    if date_to < date_from:
+        raise HTTPException(status_code=422, detail="date_to must not be before date_from")
+    filename = f"orders_{date_from.isoformat()}_{date_to.isoformat()}.{format}"
+    return StreamingResponse(
+        stream_orders_export(date_from, date_to, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/analytics/sales", response_model=SalesRankingResponse)
+async def get_sales_ranking(
+    dimension: SalesDimension = Query(SalesDimension.PRODUCT),
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    sort: SalesSort = Query(SalesSort.REVENUE),
+    limit: int = Query(20, ge=1, le=settings.ANALYTICS_MAX_TOP),
+    db: AsyncSession = Depends(get_db),
+    admin = Depends(get_current_admin)
+):
+    """
+    Top products, categories or brands between date_from and date_to
+    (inclusive, UTC) from the daily sales rollups
+    """
+    if date_to < date_from:
+        raise HTTPException(status_code=422, detail="date_to must not be before date_from")
+    return await analytics_service.get_sales_ranking(db, dimension.value, date_from, date_to, sort.value, limit)
+
+
+@router.get("/analytics/sales/{dimension}/{key}", response_model=SalesSeriesResponse)
+async def get_sales_series(
+    dimension: SalesDimension,
+    key: str,
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    granularity: SalesGranularity = Query(SalesGranularity.DAY),
+    db: AsyncSession = Depends(get_db),
+    admin = Depends(get_current_admin)
+):
+    """Hourly or daily sales of one product id, category id or brand name"""
+    if date_to < date_from:
+        raise HTTPException(status_code=422, detail="date_to must not be before date_from")
+    if granularity == SalesGranularity.HOUR and (date_to - date_from).days >= settings.ANALYTICS_MAX_HOURLY_DAYS:
+        raise HTTPException(
+            status_code=422, detail=f"Hourly series cover at most {settings.ANALYTICS_MAX_HOURLY_DAYS} days"
+        )
+    return await analytics_service.get_sales_series(
+        db, dimension.value, key, granularity.value, date_from, date_to
+    )
+
+
+@router.get("/jobs", response_model=List[JobStatusResponse])
+async def list_jobs(
+    runs: int = Query(10, ge=0, le=100),
+    db: AsyncSession = Depends(get_db),
+    admin = Depends(get_current_admin)
+):
+    """Registered background jobs with their shared schedule and latest runs (any replica)"""
+    repo = JobRepository(db)
+    schedule = await repo.get_schedule()
+    recent = await repo.get_recent_runs(runs) if runs else {}
+    return [
+        JobStatusResponse(
+            name=job.name,
+            interval_seconds=job.interval,
+            timeout_seconds=job.timeout,
+            next_run_at=schedule[job.name].next_run_at if job.name in schedule else None,
+            last_status=schedule[job.name].last_status if job.name in schedule else None,
+            recent_runs=recent.get(job.name, [])
+        )
+        for job in sorted(scheduler.jobs.values(), key=lambda j: j.name)
+    ]
+
+
+@router.post("/jobs/{name}/run")
+async def run_job(name: str, admin = Depends(get_current_admin)):
+    """
+    Run a job now on this replica, even if it is not due. Returns 409 while
+    another replica is running it.
+    """
+    if name not in scheduler.jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    status = await scheduler.run_job(name, force=True)
+    if status is None:
+        raise HTTPException(status_code=409, detail="Job is running on another replica")
+    return {"name": name, "status": status}
@@ -13,11 +13,14 @@ This module provides ALL required authentication endpoints:
 ✓ POST /api/v1/auth/seller/check
 ✓ POST /api/v1/auth/admin/check
 """
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_active_user, get_current_user
+from app.core.security import get_current_active_user, get_current_user, optional_security
 from app.services.auth_service import AuthService
 from app.schemas.auth import (
     SendOTPRequest,
@@ -174,19 +177,20 @@ async def refresh_token(
     **Security:**
     - Revokes refresh token in database
     - Prevents further token refresh
-    - Client should discard access token
+    - Revokes the access token sent as Bearer, effective immediately
     """
 )
 async def logout(
     request: LogoutRequest,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Logout user by revoking refresh token.
+    Logout user by revoking refresh token (and the bearer access token, if sent).
     Client should delete stored tokens after calling this endpoint.
     """
     service = AuthService(db)
-    return await service.logout(request.refresh_token)
+    return await service.logout(request.refresh_token, credentials.credentials if credentials else None)
 
 # ============================================================================
 # SESSION & USER INFO
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.core.database import get_db
+from app.core.serialization import FastJSONResponse
 from app.core.security import get_current_active_user
 from app.services.order_service import OrderService
 from app.schemas.order import CreateOrderRequest, CancelOrderRequest, OrderResponse, OrderListResponse
@@ -30,11 +31,16 @@ async def get_orders(
     status: Optional[str] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of a previous response, to show older (archived) orders"),
     current_user = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     service = OrderService(db)
-    return await service.get_user_orders(current_user.id, status, page, page_size)
+    try:
+        orders = await service.get_user_orders(current_user.id, status, page, page_size, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(orders)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -47,7 +53,7 @@ async def get_order(
     order = await service.get_order(order_id, current_user.id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    return FastJSONResponse(order)
 
 
 @router.post("/{order_id}/cancel", response_model=SuccessResponse)
@@ -3,13 +3,29 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from decimal import Decimal
 from app.core.database import get_db
+from app.core.serialization import FastJSONResponse
 from app.repositories.product_repository import ProductRepository, CategoryRepository
-from app.schemas.product import ProductResponse, ProductListResponse, CategoryResponse
+from app.core.config import settings
+from app.services.catalog_service import CatalogService
+from app.services.bestseller_service import ranking, encode_cursor, decode_cursor
+from app.schemas.product import ProductResponse, ProductBatchResponse, ProductListResponse, ProductFacetsResponse, ProductSort, CategoryResponse, CategoryTreeNode, BestsellerListResponse
 import math
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
 
+def _card_to_response(c) -> dict:
+    """ProductCardResponse-shaped dict built from a product_cards row"""
+    return {
+        "id": c.product_id, "sku": c.sku, "name": c.name,
+        "category_id": c.category_id, "brand": c.brand, "mrp": c.mrp,
+        "selling_price": c.selling_price, "discount_percent": c.discount_percent,
+        "primary_image_url": c.primary_image_url,
+        "rating_avg": c.rating_avg, "rating_count": c.rating_count,
+        "is_featured": c.is_featured, "stock_available": c.stock_available
+    }
+
+
 @router.get("", response_model=ProductListResponse)
 async def get_products(
     category_id: Optional[int] = None,
@@ -19,8 +35,7 @@ async def get_products(
     gender: Optional[str] = None,
     age_months: Optional[int] = None,
     search: Optional[str] = None,
-    sort_by: str = "created_at",
-    sort_order: str = "desc",
+    sort: ProductSort = ProductSort.NEWEST,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db)
@@ -29,54 +44,112 @@ async def get_products(
     products, total = await repo.get_all(
         category_id=category_id, brand=brand, min_price=min_price,
         max_price=max_price, gender=gender, age_months=age_months,
-        search=search, sort_by=sort_by, sort_order=sort_order,
+        search=search, sort=sort.value,
         skip=(page - 1) * page_size, limit=page_size
     )
 
-    product_responses = []
-    for p in products:
-        primary_img = next((img for img in p.images if img.is_primary), None)
-        stock = await repo.get_stock(p.id)
-        product_responses.append(ProductResponse(
-            id=p.id, sku=p.sku, name=p.name, description=p.description,
-            category_id=p.category_id, brand=p.brand, mrp=p.mrp,
-            selling_price=p.selling_price, discount_percent=p.discount_percent,
-            age_min_months=p.age_min_months, age_max_months=p.age_max_months,
-            gender=p.gender, size=p.size, color=p.color,
-            is_active=p.is_active, is_featured=p.is_featured,
-            rating_avg=p.rating_avg, rating_count=p.rating_count,
-            created_at=p.created_at, images=[],
-            stock_available=stock
-        ))
-
-    return ProductListResponse(
-        products=product_responses, total=total, page=page,
-        page_size=page_size, total_pages=math.ceil(total / page_size)
+    product_responses = [_card_to_response(c) for c in products]
+
+    return FastJSONResponse({
+        "products": product_responses, "total": total, "page": page,
+        "page_size": page_size, "total_pages": math.ceil(total / page_size)
+    })
+
+
+@router.get("/facets", response_model=ProductFacetsResponse)
+async def get_product_facets(
+    category_id: Optional[int] = None,
+    brand: Optional[str] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
+    gender: Optional[str] = None,
+    age_months: Optional[int] = None,
+    search: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    service = CatalogService(db)
+    return await service.get_facets(
+        category_id=category_id, brand=brand, min_price=min_price,
+        max_price=max_price, gender=gender, age_months=age_months, search=search
     )
 
 
+@router.get("/batch", response_model=ProductBatchResponse)
+async def get_products_batch(
+    ids: str = Query(..., description="Comma-separated product ids, e.g. 12,7,31"),
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        product_ids = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be a comma-separated list of integers")
+    if not product_ids:
+        raise HTTPException(status_code=422, detail="At least one product id is required")
+    if len(product_ids) > settings.PRODUCT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.PRODUCT_BATCH_MAX_IDS} product ids per request"
+        )
+
+    service = CatalogService(db)
+    products, missing = await service.get_products(product_ids)
+    return FastJSONResponse({"products": products, "missing": missing})
+
+
+@router.get("/bestsellers", response_model=BestsellerListResponse)
+async def get_bestsellers(
+    category_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=settings.BESTSELLER_PAGE_MAX),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Best sellers of a category and its subcategories (or of the whole catalog), by decayed units sold"""
+    try:
+        after, epoch = decode_cursor(cursor) if cursor else (None, None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    await ranking.ensure_loaded()
+    if after:
+        # Scores may have been renormalized since the cursor was issued
+        after = ranking.rebase(after, epoch)
+    entries, has_more = ranking.page(category_id, after, limit)
+    cards = {c.product_id: c for c in await ProductRepository(db).get_cards([pid for _, pid in entries])}
+
+    return FastJSONResponse({
+        "products": [_card_to_response(cards[pid]) for _, pid in entries if pid in cards],
+        "next_cursor": encode_cursor(entries[-1], ranking.epoch) if has_more else None
+    })
+
+
+@router.get("/bestsellers/categories", response_model=list[CategoryTreeNode])
+async def get_bestseller_categories(
+    parent_id: Optional[int] = None,
+    limit: int = Query(10, ge=1, le=settings.BESTSELLER_PAGE_MAX)
+):
+    """Child categories of parent_id (or the top level) by the sales of their subtrees"""
+    await ranking.ensure_loaded()
+    return FastJSONResponse(ranking.categories(parent_id, limit))
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(product_id: int, db: AsyncSession = Depends(get_db)):
-    repo = ProductRepository(db)
-    product = await repo.get_by_id(product_id)
+    service = CatalogService(db)
+    product = await service.get_product(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    stock = await repo.get_stock(product_id)
-    return ProductResponse(
-        id=product.id, sku=product.sku, name=product.name,
-        description=product.description, category_id=product.category_id,
-        brand=product.brand, mrp=product.mrp, selling_price=product.selling_price,
-        discount_percent=product.discount_percent,
-        age_min_months=product.age_min_months, age_max_months=product.age_max_months,
-        gender=product.gender, size=product.size, color=product.color,
-        is_active=product.is_active, is_featured=product.is_featured,
-        rating_avg=product.rating_avg, rating_count=product.rating_count,
-        created_at=product.created_at, images=[], stock_available=stock
-    )
+    return FastJSONResponse(product)
 
 
 @router.get("/categories/", response_model=list[CategoryResponse])
 async def get_categories(parent_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
     repo = CategoryRepository(db)
     return await repo.get_all(parent_id)
+
+
+@router.get("/categories/tree", response_model=list[CategoryTreeNode])
+async def get_category_tree(root_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    repo = CategoryRepository(db)
+    tree = await repo.get_tree()
+    return FastJSONResponse(tree.to_list(root_id))
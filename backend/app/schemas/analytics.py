@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+class SalesDimension(str, Enum):
+    PRODUCT = "product"
+    CATEGORY = "category"
+    BRAND = "brand"
+
+class SalesGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+class SalesSort(str, Enum):
+    UNITS = "units"
+    REVENUE = "revenue"
+    REFUNDS = "refunds"
+
+class SalesTotals(BaseModel):
+    units: int
+    revenue: Decimal
+    discounts: Decimal
+    refunds: Decimal
+    net_revenue: Decimal  # revenue - discounts - refunds
+
+class SalesRankingItem(SalesTotals):
+    key: str
+    label: Optional[str] = None
+
+class SalesRankingResponse(BaseModel):
+    dimension: SalesDimension
+    date_from: date
+    date_to: date
+    sort: SalesSort
+    items: List[SalesRankingItem]
+
+class SalesPoint(SalesTotals):
+    bucket: datetime
+
+class SalesSeriesResponse(BaseModel):
+    dimension: SalesDimension
+    key: str
+    granularity: SalesGranularity
+    points: List[SalesPoint]
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
+
+class InventorySyncItem(BaseModel):
+    sku: str = Field(..., min_length=1, max_length=50)
+    delta: Optional[int] = None
+    quantity: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def one_of_delta_or_quantity(self):
+        if (self.delta is None) == (self.quantity is None):
+            raise ValueError("Provide exactly one of delta or quantity")
+        return self
+
+class InventorySyncRequest(BaseModel):
+    items: List[InventorySyncItem] = Field(..., min_length=1, max_length=100000)
+    dry_run: bool = False
+
+class InventoryConflict(BaseModel):
+    row: int
+    sku: str
+    reason: str
+    quantity_available: Optional[int] = None
+    quantity_reserved: Optional[int] = None
+
+class InventorySyncReport(BaseModel):
+    rows: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    conflicts_total: int = 0
+    conflicts: List[InventoryConflict] = []
+    dry_run: bool = False
+    duration_seconds: float = 0
@@ -65,6 +65,7 @@ class OrderListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # pass as `cursor` to page into older (archived) orders
 
 class CancelOrderRequest(BaseModel):
     reason: str = Field(..., min_length=10)
@@ -2,6 +2,14 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
+
+class ProductSort(str, Enum):
+    NEWEST = "newest"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    RATING = "rating"
+    POPULARITY = "popularity"
 
 class CategoryBase(BaseModel):
     name: str
@@ -16,11 +24,22 @@ class CategoryCreate(CategoryBase):
 
 class CategoryResponse(CategoryBase):
     id: int
+    path: Optional[str] = None
     created_at: datetime
     
     class Config:
         from_attributes = True
 
+class CategoryTreeNode(BaseModel):
+    id: int
+    name: str
+    slug: str
+    parent_id: Optional[int] = None
+    image_url: Optional[str] = None
+    display_order: int = 0
+    path: Optional[str] = None
+    children: List["CategoryTreeNode"] = []
+
 class ProductImageBase(BaseModel):
     image_url: str
     angle: str = "front"
@@ -65,13 +84,69 @@ class ProductResponse(ProductBase):
     class Config:
         from_attributes = True
 
-class ProductListResponse(BaseModel):
+class ProductCardResponse(BaseModel):
+    id: int
+    sku: str
+    name: str
+    category_id: int
+    brand: Optional[str] = None
+    mrp: Decimal
+    selling_price: Decimal
+    discount_percent: Decimal = Decimal("0")
+    primary_image_url: Optional[str] = None
+    rating_avg: Decimal
+    rating_count: int
+    is_featured: bool
+    stock_available: int
+
+class ProductBatchResponse(BaseModel):
     products: List[ProductResponse]
+    missing: List[int] = []
+
+class ProductListResponse(BaseModel):
+    products: List[ProductCardResponse]
     total: int
     page: int
     page_size: int
     total_pages: int
 
+class BestsellerListResponse(BaseModel):
+    products: List[ProductCardResponse]
+    next_cursor: Optional[str] = None
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+class RangeFacetValue(BaseModel):
+    label: str
+    min: Optional[Decimal] = None
+    max: Optional[Decimal] = None
+    count: int
+
+class ProductFacetsResponse(BaseModel):
+    total: int
+    brands: List[FacetValue]
+    genders: List[FacetValue]
+    age_bands: List[RangeFacetValue]
+    price_buckets: List[RangeFacetValue]
+
+class ImportRowError(BaseModel):
+    row: int
+    sku: Optional[str] = None
+    error: str
+
+class CatalogImportReport(BaseModel):
+    rows_read: int = 0
+    rows_rejected: int = 0
+    products_inserted: int = 0
+    products_updated: int = 0
+    images_loaded: int = 0
+    inventory_rows: int = 0
+    chunks: int = 0
+    duration_seconds: float = 0
+    errors: List[ImportRowError] = []
+
 class ProductFilterParams(BaseModel):
     category_id: Optional[int] = None
     brand: Optional[str] = None
@@ -80,7 +155,6 @@ class ProductFilterParams(BaseModel):
     gender: Optional[str] = None
     age_months: Optional[int] = None
     search: Optional[str] = None
-    sort_by: Optional[str] = "created_at"
-    sort_order: Optional[str] = "desc"
+    sort: ProductSort = ProductSort.NEWEST
     page: int = 1
     page_size: int = 20
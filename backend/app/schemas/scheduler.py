@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+class JobRunResponse(BaseModel):
+    instance: str
+    status: str
+    started_at: datetime
+    duration_seconds: float
+    rows_affected: Optional[int] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class JobStatusResponse(BaseModel):
+    name: str
+    interval_seconds: float
+    timeout_seconds: float
+    next_run_at: Optional[datetime] = None
+    last_status: Optional[str] = None
+    recent_runs: List[JobRunResponse] = []
@@ -0,0 +1,241 @@
+"""
+Sales rollups for the admin analytics endpoints.
+
+`sales_rollups` holds units, revenue, discounts and refunds per hour and per
+day for every product, category and brand, so a dashboard query reads a few
+pre-aggregated rows per key and day instead of scanning orders.
+
+The rollups are maintained incrementally by an outbox sink: `payment.succeeded`
+adds the order's items as sold, `refund.requested` adds the refund amount,
+both in the hour/day of the event. Delivery is at-least-once, so each event id
+is recorded in `analytics_applied_events` in the same statement that applies
+it and a redelivery changes nothing. Order discounts and refunds are spread
+over the order's items in proportion to their totals.
+
+`rebuild_sales_rollups` recomputes everything since a date from payments,
+refunds and (live and archived) orders, for the initial backfill or after a
+change to the rules above.
+"""
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.outbox import OutboxEvent
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.schemas.analytics import SalesPoint, SalesRankingItem, SalesRankingResponse, SalesSeriesResponse
+from app.services.outbox_service import dispatcher
+
+logger = logging.getLogger(__name__)
+
+SALES_EVENTS = ("payment.succeeded", "refund.requested")
+
+# An item's share of its order, for spreading order-level amounts
+_SHARE = "COALESCE(i.total_price / NULLIF(o.subtotal, 0), 0)"
+
+# Adds `lines` (at, product_id, category_id, brand, units, revenue, discounts,
+# refunds) to the hourly and daily rollup of each dimension. Rows are upserted
+# in key order so concurrent writers lock them in the same order.
+_UPSERT_LINES = """
+    , expanded AS (
+        SELECT g.granularity,
+               date_trunc(g.granularity, l.at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS bucket,
+               d.dimension, d.key, l.units, l.revenue, l.discounts, l.refunds
+        FROM lines l
+        CROSS JOIN (VALUES ('hour'), ('day')) AS g(granularity)
+        CROSS JOIN LATERAL (VALUES
+            ('product', l.product_id::text),
+            ('category', l.category_id::text),
+            ('brand', l.brand)
+        ) AS d(dimension, key)
+        WHERE d.key IS NOT NULL
+    )
+    INSERT INTO sales_rollups (granularity, dimension, bucket, key, units, revenue, discounts, refunds)
+    SELECT granularity, dimension, bucket, key, SUM(units), SUM(revenue), SUM(discounts), SUM(refunds)
+    FROM expanded
+    GROUP BY granularity, dimension, bucket, key
+    ORDER BY granularity, dimension, bucket, key
+    ON CONFLICT (granularity, dimension, bucket, key) DO UPDATE
+    SET units = sales_rollups.units + EXCLUDED.units,
+        revenue = sales_rollups.revenue + EXCLUDED.revenue,
+        discounts = sales_rollups.discounts + EXCLUDED.discounts,
+        refunds = sales_rollups.refunds + EXCLUDED.refunds
+"""
+
+# units, revenue, discounts, refunds of one item line
+_SALE = f"i.quantity, i.total_price, COALESCE(o.discount_amount, 0) * {_SHARE}, 0"
+_REFUND = f"0, 0, 0, r.amount * {_SHARE}"
+
+_APPLY_EVENT_SQL = {
+    "payment.succeeded": text(f"""
+        WITH applied AS (
+            INSERT INTO analytics_applied_events (event_id) VALUES (:event_id)
+            ON CONFLICT DO NOTHING
+            RETURNING event_id
+        ),
+        lines (at, product_id, category_id, brand, units, revenue, discounts, refunds) AS (
+            SELECT CAST(:at AS timestamptz), i.product_id, p.category_id, p.brand, {_SALE}
+            FROM applied
+            JOIN orders o ON o.id = :order_id
+            JOIN order_items i ON i.order_id = o.id
+            JOIN products p ON p.id = i.product_id
+        )
+    """ + _UPSERT_LINES),
+    "refund.requested": text(f"""
+        WITH applied AS (
+            INSERT INTO analytics_applied_events (event_id) VALUES (:event_id)
+            ON CONFLICT DO NOTHING
+            RETURNING event_id
+        ),
+        lines (at, product_id, category_id, brand, units, revenue, discounts, refunds) AS (
+            SELECT CAST(:at AS timestamptz), i.product_id, p.category_id, p.brand, {_REFUND}
+            FROM applied
+            JOIN refunds r ON r.id = :refund_id
+            JOIN orders o ON o.id = r.order_id
+            JOIN order_items i ON i.order_id = o.id
+            JOIN products p ON p.id = i.product_id
+        )
+    """ + _UPSERT_LINES),
+}
+
+_ALL_ORDERS = """(
+    SELECT id, subtotal, discount_amount FROM orders
+    UNION ALL
+    SELECT id, subtotal, discount_amount FROM orders_archive
+)"""
+_ALL_ITEMS = """(
+    SELECT order_id, product_id, quantity, total_price FROM order_items
+    UNION ALL
+    SELECT order_id, product_id, quantity, total_price FROM order_items_archive
+)"""
+
+# The same lines as the events would have added, from the source tables. A
+# payment's completed_at and a refund's created_at are set in the transaction
+# that appends the event, so they equal the event's created_at.
+_REBUILD_SQL = text(f"""
+    WITH lines (at, product_id, category_id, brand, units, revenue, discounts, refunds) AS (
+        SELECT pay.completed_at, i.product_id, p.category_id, p.brand, {_SALE}
+        FROM payments pay
+        JOIN {_ALL_ORDERS} o ON o.id = pay.order_id
+        JOIN {_ALL_ITEMS} i ON i.order_id = o.id
+        JOIN products p ON p.id = i.product_id
+        WHERE pay.status IN ('SUCCESS', 'REFUNDED') AND pay.completed_at >= :since
+        UNION ALL
+        SELECT r.created_at, i.product_id, p.category_id, p.brand, {_REFUND}
+        FROM refunds r
+        JOIN {_ALL_ORDERS} o ON o.id = r.order_id
+        JOIN {_ALL_ITEMS} i ON i.order_id = o.id
+        JOIN products p ON p.id = i.product_id
+        WHERE r.created_at >= :since
+    )
+""" + _UPSERT_LINES)
+
+
+async def apply_sales_event(event: OutboxEvent):
+    """Outbox sink: add a payment or refund to the rollups, once per event id"""
+    params = {"event_id": event.id, "at": event.created_at}
+    if event.event_type == "payment.succeeded":
+        params["order_id"] = int(event.payload["order_id"])
+    else:
+        params["refund_id"] = event.aggregate_id
+    async with AsyncSessionLocal() as db:
+        await db.execute(_APPLY_EVENT_SQL[event.event_type], params)
+        await db.commit()
+
+
+async def rebuild_sales_rollups(since: datetime) -> int:
+    """
+    Recompute the rollups from the UTC day of `since` on. Runs in one
+    repeatable-read transaction that blocks the sink meanwhile, and marks every
+    sales event it has already counted as applied. Returns the rollup rows written.
+    """
+    since = datetime.combine(since.astimezone(timezone.utc).date(), time.min, tzinfo=timezone.utc)
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+        async with conn.begin():
+            # Taken before the snapshot, so no event is applied between what
+            # the rebuild reads and what it marks applied; in the order the
+            # sink writes the two tables, so the two cannot deadlock
+            await conn.execute(text(
+                "LOCK TABLE analytics_applied_events, sales_rollups IN SHARE ROW EXCLUSIVE MODE"
+            ))
+            await conn.execute(text("DELETE FROM sales_rollups WHERE bucket >= :since"), {"since": since})
+            result = await conn.execute(_REBUILD_SQL, {"since": since})
+            await conn.execute(
+                text("""
+                    INSERT INTO analytics_applied_events (event_id)
+                    SELECT id FROM outbox
+                    WHERE event_type = ANY(:event_types) AND created_at >= :since
+                    ON CONFLICT DO NOTHING
+                """),
+                {"event_types": list(SALES_EVENTS), "since": since}
+            )
+    logger.info("Rebuilt sales rollups since %s: %s rows", since.date(), result.rowcount)
+    return result.rowcount
+
+
+async def prune_applied_events() -> int:
+    """Forget applied event ids long past any redelivery"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.ANALYTICS_APPLIED_EVENTS_RETENTION_DAYS)
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text("DELETE FROM analytics_applied_events WHERE applied_at < :cutoff"), {"cutoff": cutoff}
+        )
+        return result.rowcount
+
+
+def _day_range(date_from: date, date_to: date):
+    """[start, end) covering date_from through date_to, as UTC days"""
+    start = datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+    return start, datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+
+def _totals(row) -> dict:
+    return {
+        "units": row.units,
+        "revenue": row.revenue,
+        "discounts": row.discounts,
+        "refunds": row.refunds,
+        "net_revenue": row.revenue - row.discounts - row.refunds,
+    }
+
+
+async def get_sales_ranking(
+    db: AsyncSession,
+    dimension: str,
+    date_from: date,
+    date_to: date,
+    sort: str,
+    limit: int
+) -> SalesRankingResponse:
+    repo = AnalyticsRepository(db)
+    start, end = _day_range(date_from, date_to)
+    rows = await repo.get_top_sales(dimension, start, end, sort, limit)
+    labels = await repo.get_labels(dimension, [row.key for row in rows])
+    return SalesRankingResponse(
+        dimension=dimension, date_from=date_from, date_to=date_to, sort=sort,
+        items=[SalesRankingItem(key=row.key, label=labels.get(row.key), **_totals(row)) for row in rows]
+    )
+
+
+async def get_sales_series(
+    db: AsyncSession,
+    dimension: str,
+    key: str,
+    granularity: str,
+    date_from: date,
+    date_to: date
+) -> SalesSeriesResponse:
+    """Buckets with sales only; a missing hour or day sold nothing"""
+    start, end = _day_range(date_from, date_to)
+    rows = await AnalyticsRepository(db).get_sales_series(dimension, key, granularity, start, end)
+    return SalesSeriesResponse(
+        dimension=dimension, key=key, granularity=granularity,
+        points=[SalesPoint(bucket=row.bucket, **_totals(row)) for row in rows]
+    )
+
+
+dispatcher.register(apply_sales_event, SALES_EVENTS)
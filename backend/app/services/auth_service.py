@@ -21,9 +21,12 @@ from app.core.security import (
     decode_token
 )
 from app.core.config import settings
+from app.core.revocation import revocation_list
 from app.repositories.user_repository import UserRepository
 from app.repositories.otp_repository import OTPRepository
 from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.services.notification_service import sms_dispatcher, SMSQueueFull
 from app.schemas.auth import (
     SendOTPResponse,
     LoginResponse,
@@ -49,6 +52,7 @@ class AuthService:
         self.user_repo = UserRepository(db)
         self.otp_repo = OTPRepository(db)
         self.refresh_token_repo = RefreshTokenRepository(db)
+        self.revoked_token_repo = RevokedTokenRepository(db)
 
     # ========================================================================
     # OTP OPERATIONS
@@ -77,9 +81,18 @@ class AuthService:
         # Create OTP record (this also invalidates existing OTPs)
         await self.otp_repo.create_otp(phone, otp_code, expires_at)
 
-        # 🚀 TODO: Integrate with SMS provider (Twilio, AWS SNS, etc.)
-        # For development, log the OTP
-        print(f"📱 OTP for {phone}: {otp_code} (expires in 5 minutes)")
+        # Hand off to the SMS dispatcher; delivery happens off the request path
+        try:
+            sms_dispatcher.enqueue(
+                phone,
+                f"{otp_code} is your CloudKidd verification code. It expires in {settings.OTP_EXPIRE_MINUTES} minutes.",
+                ttl_seconds=settings.OTP_EXPIRE_MINUTES * 60
+            )
+        except SMSQueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Unable to send OTP right now. Please try again shortly."
+            )
 
         return SendOTPResponse(
             success=True,
@@ -123,7 +136,55 @@ class AuthService:
         Raises:
             HTTPException: If verification fails
         """
-        # Get latest OTP for this phone
+        # Success path, one transaction: consume the OTP with a single
+        # UPDATE ... RETURNING, upsert the user, then stage the cart (new
+        # users) and the refresh token so both go out in the commit's flush
+        otp_id = await self.otp_repo.consume_otp(phone, otp)
+        if otp_id is None:
+            await self.db.rollback()
+            await self._reject_otp(phone, otp)
+
+        user, is_new_user = await self.user_repo.upsert_verified(phone)
+        if is_new_user:
+            self.db.add(Cart(user_id=user.id))
+
+        # Generate JWT tokens
+        access_token = create_access_token({
+            "sub": str(user.id),
+            "role": user.role.value if user.role else UserRole.CUSTOMER.value
+        })
+
+        refresh_token = create_refresh_token({
+            "sub": str(user.id)
+        })
+
+        # Store refresh token in database
+        refresh_expires_at = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        self.refresh_token_repo.add_refresh_token(
+            user_id=user.id,
+            token=refresh_token,
+            expires_at=refresh_expires_at
+        )
+        await self.db.commit()
+
+        return LoginResponse(
+            success=True,
+            message="Authentication successful",
+            user=UserResponse.from_orm(user),
+            tokens=TokenResponse(
+                access_token=access_token,
+                refresh_token=refresh_token,
+                token_type="bearer",
+                expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            ),
+            is_new_user=is_new_user
+        )
+
+    async def _reject_otp(self, phone: str, otp: str):
+        """
+        Work out why consume_otp matched nothing and raise the matching error.
+        Only runs for failed attempts, so the extra reads stay off the login path.
+        """
         otp_record = await self.otp_repo.get_latest_otp(phone)
 
         if not otp_record:
@@ -153,79 +214,20 @@ class AuthService:
                 detail="OTP has already been used. Please request a new OTP."
             )
 
-        # Verify OTP code
-        if otp_record.otp != otp:
-            # Increment retry count
-            await self.otp_repo.increment_retry_count(otp_record)
-
-            attempts_left = 3 - otp_record.retry_count
+        # Valid when consume_otp ran but has expired since (clock boundary)
+        if otp_record.otp == otp:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid OTP. {attempts_left} attempts remaining."
-            )
-
-        # ✅ OTP VERIFIED - Mark as used
-        await self.otp_repo.mark_verified(otp_record)
-
-        # Find or create user
-        user = await self.user_repo.get_by_phone(phone)
-        is_new_user = False
-
-        if not user:
-            # Create new user
-            user = User(
-                phone=phone,
-                role=UserRole.CUSTOMER,  # Default role
-                is_active=True,
-                is_verified=True
+                detail="OTP has expired. Please request a new OTP."
             )
-            self.db.add(user)
-            await self.db.flush()
 
-            # Create cart for new user
-            cart = Cart(user_id=user.id)
-            self.db.add(cart)
-            await self.db.commit()
-            await self.db.refresh(user)
-
-            is_new_user = True
-        else:
-            # Update existing user
-            user.is_verified = True
-            if not user.is_active:
-                user.is_active = True
-            await self.db.commit()
-            await self.db.refresh(user)
-
-        # Generate JWT tokens
-        access_token = create_access_token({
-            "sub": str(user.id),
-            "role": user.role.value if user.role else UserRole.CUSTOMER.value
-        })
-
-        refresh_token = create_refresh_token({
-            "sub": str(user.id)
-        })
-
-        # Store refresh token in database
-        refresh_expires_at = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        await self.refresh_token_repo.create_refresh_token(
-            user_id=user.id,
-            token=refresh_token,
-            expires_at=refresh_expires_at
-        )
+        # Wrong code: increment retry count
+        await self.otp_repo.increment_retry_count(otp_record)
 
-        return LoginResponse(
-            success=True,
-            message="Authentication successful",
-            user=UserResponse.from_orm(user),
-            tokens=TokenResponse(
-                access_token=access_token,
-                refresh_token=refresh_token,
-                token_type="bearer",
-                expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-            ),
-            is_new_user=is_new_user
+        attempts_left = 3 - otp_record.retry_count
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid OTP. {attempts_left} attempts remaining."
         )
 
     # ========================================================================
@@ -295,16 +297,21 @@ class AuthService:
             expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         )
 
-    async def logout(self, refresh_token: str) -> LogoutResponse:
+    async def logout(self, refresh_token: str, access_token: Optional[str] = None) -> LogoutResponse:
         """
-        Logout user by revoking refresh token.
+        Logout user by revoking refresh token, and the access token it was
+        sent with so it stops working on every worker before it expires.
 
         Args:
             refresh_token: Refresh token to revoke
+            access_token: Bearer access token of the request, if any
 
         Returns:
             LogoutResponse
         """
+        if access_token:
+            await self._revoke_access_token(access_token)
+
         revoked = await self.refresh_token_repo.revoke_token(refresh_token)
 
         if revoked:
@@ -318,6 +325,21 @@ class AuthService:
                 message="Token already revoked or not found"
             )
 
+    async def _revoke_access_token(self, access_token: str):
+        try:
+            payload = decode_token(access_token)
+        except HTTPException:
+            return  # invalid or already expired: nothing to revoke
+        jti = payload.get("jti")
+        if payload.get("type") != "access" or not jti:
+            return
+
+        expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+        user_id = int(payload["sub"]) if payload.get("sub") else None
+        await self.revoked_token_repo.revoke(jti, expires_at, user_id)
+        # Effective here at once; other workers follow on the notification
+        revocation_list.add(jti, expires_at.timestamp())
+
     # ========================================================================
     # SESSION & USER INFO
     # ========================================================================
@@ -0,0 +1,278 @@
+"""
+Best-seller rankings from time-decayed sales scores.
+
+Scores use forward decay: a sale of `quantity` paid at t adds
+quantity * 2^((t - epoch) / half-life) to its product's and its category's
+score. Every score is thereby kept in the same time frame, so a refresh only
+adds the new sales and never rewrites existing rows, and ranking by stored
+score equals ranking by decayed score at any instant.
+
+The epoch and half-life the scores were built with are kept on the watermark
+row. Weights double each half-life and would overflow a float after about
+1000, so once the epoch is RENORMALIZE_AFTER_HALF_LIVES behind, or
+BESTSELLER_HALF_LIFE_DAYS has changed, the refresh first rescales every score
+to a new epoch (see `_renormalize`).
+
+`refresh_scores` runs on the scheduler: it adds the orders paid since the
+`bestsellers` watermark, up to BESTSELLER_SETTLE_SECONDS ago so a payment
+still committing is not skipped, moves the watermark and publishes a
+`bestsellers` invalidation. Each process keeps the top BESTSELLER_TOP_N
+products per category in memory (`ranking`) and reloads them on that
+invalidation, or after BESTSELLER_CACHE_TTL_SECONDS without one.
+"""
+import asyncio
+import base64
+import bisect
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, text, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.invalidation import BESTSELLERS, bus, publish
+from app.models.bestseller import CategorySalesScore, ProductSalesScore, RankingWatermark
+from app.repositories.product_repository import CategoryRepository
+from app.services.catalog_service import catalog_generation
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "bestsellers"
+
+# Weights stay below 2^32 times a sale at the epoch, far from float overflow
+RENORMALIZE_AFTER_HALF_LIVES = 32
+
+# (score, product_id), best first
+Entry = Tuple[float, int]
+
+_ADD_SALES_SQL = text("""
+    WITH sold AS (
+        SELECT i.product_id, p.category_id,
+               SUM(i.quantity * power(
+                   2.0::float8,
+                   EXTRACT(EPOCH FROM pay.completed_at - CAST(:epoch AS timestamptz))::float8
+                       / CAST(:half_life AS float8)
+               )) AS score
+        FROM payments pay
+        JOIN order_items i ON i.order_id = pay.order_id
+        JOIN products p ON p.id = i.product_id
+        WHERE pay.status IN ('SUCCESS', 'REFUNDED')
+          AND pay.completed_at > :since AND pay.completed_at <= :until
+        GROUP BY i.product_id, p.category_id
+    ),
+    products_scored AS (
+        INSERT INTO product_sales_scores (product_id, score, updated_at)
+        SELECT product_id, score, NOW() FROM sold
+        ORDER BY product_id
+        ON CONFLICT (product_id) DO UPDATE
+        SET score = product_sales_scores.score + EXCLUDED.score, updated_at = NOW()
+        RETURNING 1
+    ),
+    categories_scored AS (
+        INSERT INTO category_sales_scores (category_id, score, updated_at)
+        SELECT category_id, SUM(score), NOW() FROM sold
+        GROUP BY category_id
+        ORDER BY category_id
+        ON CONFLICT (category_id) DO UPDATE
+        SET score = category_sales_scores.score + EXCLUDED.score, updated_at = NOW()
+    )
+    SELECT COUNT(*) FROM products_scored
+""")
+
+_TOP_PER_CATEGORY_SQL = text("""
+    SELECT category_id, product_id, score FROM (
+        SELECT c.category_id, s.product_id, s.score,
+               row_number() OVER (PARTITION BY c.category_id ORDER BY s.score DESC, s.product_id) AS rank
+        FROM product_sales_scores s
+        JOIN product_cards c ON c.product_id = s.product_id AND c.is_active
+    ) ranked
+    WHERE rank <= :top_n
+""")
+
+
+async def refresh_scores() -> int:
+    """Add orders paid since the watermark to the scores; returns the products updated"""
+    async with engine.begin() as conn:
+        mark = (await conn.execute(
+            select(RankingWatermark.position, RankingWatermark.decay_epoch, RankingWatermark.half_life_seconds)
+            .where(RankingWatermark.name == WATERMARK)
+            .with_for_update()
+        )).first()
+        until = datetime.now(timezone.utc) - timedelta(seconds=settings.BESTSELLER_SETTLE_SECONDS)
+        if mark is None or until <= mark.position:
+            return 0
+        since, epoch, half_life = mark
+        configured = settings.BESTSELLER_HALF_LIFE_DAYS * 86400
+        renormalized = False
+        if epoch is None:
+            # Nothing scored yet
+            epoch, half_life = since, configured
+        elif half_life != configured or (until - epoch).total_seconds() / half_life > RENORMALIZE_AFTER_HALF_LIVES:
+            await _renormalize(conn, epoch, half_life, until)
+            epoch, half_life, renormalized = until, configured, True
+
+        updated = await conn.scalar(_ADD_SALES_SQL, {
+            "epoch": epoch,
+            "half_life": half_life,
+            "since": since,
+            "until": until,
+        })
+        await conn.execute(
+            update(RankingWatermark)
+            .where(RankingWatermark.name == WATERMARK)
+            .values(
+                position=until, decay_epoch=epoch, half_life_seconds=half_life,
+                updated_at=datetime.now(timezone.utc)
+            )
+        )
+        if updated or renormalized:
+            await publish(conn, BESTSELLERS)
+    logger.info("Scored sales up to %s: %s products", until.isoformat(), updated)
+    return updated
+
+
+async def _renormalize(conn, epoch: datetime, half_life: float, new_epoch: datetime):
+    """
+    Rescale every score from `epoch` to `new_epoch` by dividing out the weight
+    of new_epoch. Each score then holds its value decayed to new_epoch, so
+    after a half-life change older sales keep the decay they had so far and
+    decay at the new rate from here on.
+    """
+    factor = 2.0 ** (-(new_epoch - epoch).total_seconds() / half_life)
+    for model in (ProductSalesScore, CategorySalesScore):
+        await conn.execute(update(model).values(score=model.score * factor))
+    logger.info("Renormalized best-seller scores to epoch %s (factor %g)", new_epoch.isoformat(), factor)
+
+
+class BestsellerRanking:
+    """Per-process snapshot of the top products per category and of category scores"""
+
+    def __init__(self, top_n: int = settings.BESTSELLER_TOP_N, ttl: float = settings.BESTSELLER_CACHE_TTL_SECONDS):
+        self.top_n = top_n
+        self.ttl = ttl
+        self.version: Optional[str] = None  # the watermark the snapshot was loaded at
+        self.epoch: Optional[float] = None  # the scores' decay epoch, as a unix timestamp
+        self.half_life: Optional[float] = None
+        self._direct: Dict[int, List[Entry]] = {}  # products directly in each category
+        self._merged: Dict[Optional[int], List[Entry]] = {}  # subtree rankings, built on demand
+        self._category_scores: Dict[int, float] = {}
+        self._tree = None
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self, keys: Set[str] = None):
+        self._loaded_at = None
+
+    async def ensure_loaded(self):
+        if self._fresh():
+            return
+        # One reload per process however many requests find it stale
+        async with self._lock:
+            if not self._fresh():
+                await self._load()
+
+    def _fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def _load(self):
+        async with AsyncSessionLocal() as db:
+            mark = (await db.execute(
+                select(RankingWatermark.position, RankingWatermark.decay_epoch, RankingWatermark.half_life_seconds)
+                .where(RankingWatermark.name == WATERMARK)
+            )).first()
+            rows = (await db.execute(_TOP_PER_CATEGORY_SQL, {"top_n": self.top_n})).all()
+            scores = (await db.execute(select(CategorySalesScore.category_id, CategorySalesScore.score))).all()
+            tree = await CategoryRepository(db).get_tree()
+
+        direct: Dict[int, List[Entry]] = {}
+        for category_id, product_id, score in rows:
+            direct.setdefault(category_id, []).append((score, product_id))
+        for entries in direct.values():
+            entries.sort(key=_rank_key)
+
+        self._direct, self._merged, self._tree = direct, {}, tree
+        self._category_scores = dict(scores)
+        position, epoch, self.half_life = mark if mark else (None, None, None)
+        self.version = position.isoformat() if position else None
+        self.epoch = epoch.timestamp() if epoch else None
+        self._loaded_at = time.monotonic()
+
+    def products(self, category_id: Optional[int] = None) -> List[Entry]:
+        """Top products of a category and its descendants, or of the whole catalog"""
+        ranked = self._merged.get(category_id)
+        if ranked is None:
+            # The subtree's top N are among the top N of each of its categories
+            if category_id is None:
+                candidates = [e for entries in self._direct.values() for e in entries]
+            elif category_id in self._tree.nodes:
+                candidates = [e for cid in self._tree.subtree_ids(category_id) for e in self._direct.get(cid, ())]
+            else:
+                candidates = []
+            ranked = sorted(candidates, key=_rank_key)[:self.top_n]
+            self._merged[category_id] = ranked
+        return ranked
+
+    def rebase(self, entry: Entry, epoch: Optional[float]) -> Entry:
+        """A cursor entry taken at decay epoch `epoch`, on the scale of this snapshot's scores"""
+        score, product_id = entry
+        if epoch is not None and self.epoch is not None and epoch != self.epoch:
+            try:
+                score *= 2.0 ** ((epoch - self.epoch) / self.half_life)
+            except OverflowError:
+                score = math.inf
+        return score, product_id
+
+    def page(self, category_id: Optional[int], after: Optional[Entry], limit: int) -> Tuple[List[Entry], bool]:
+        """Up to `limit` entries ranked below `after`, and whether more follow"""
+        ranked = self.products(category_id)
+        start = bisect.bisect_right(ranked, _rank_key(after), key=_rank_key) if after else 0
+        return ranked[start:start + limit], start + limit < len(ranked)
+
+    def categories(self, parent_id: Optional[int] = None, limit: int = 10) -> List[dict]:
+        """Active child categories of `parent_id` (or the roots) by the score of their subtree"""
+        tree = self._tree
+        children = tree.roots if parent_id is None else tree.children.get(parent_id, [])
+        subtree_score = {
+            cid: sum(self._category_scores.get(sub, 0.0) for sub in tree.subtree_ids(cid)) for cid in children
+        }
+        ranked = sorted((cid for cid in children if subtree_score[cid] > 0), key=lambda cid: (-subtree_score[cid], cid))
+        return [tree.nodes[cid] for cid in ranked[:limit]]
+
+
+def _rank_key(entry: Entry):
+    score, product_id = entry
+    return -score, product_id
+
+
+def encode_cursor(entry: Entry, epoch: Optional[float]) -> str:
+    """The last entry of a page with the decay epoch its score is relative to"""
+    score, product_id = entry
+    raw = f"{score!r}|{product_id}|{'' if epoch is None else repr(epoch)}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Entry, Optional[float]]:
+    """Raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        score, product_id, epoch = raw.split("|")
+        return (float(score), int(product_id)), float(epoch) if epoch else None
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+async def bestseller_version(params: dict) -> str:
+    """Validator for best-seller pages: the ranking snapshot and the catalog generation"""
+    await ranking.ensure_loaded()
+    return f"{ranking.version}|{await catalog_generation()}"
+
+
+async def _resync_ranking(conn):
+    ranking.invalidate()
+
+
+ranking = BestsellerRanking()
+bus.subscribe(BESTSELLERS, ranking.invalidate, resync=_resync_ranking)
@@ -0,0 +1,324 @@
+"""
+Bulk catalog import.
+
+Streams CSV or JSONL product rows (with images and stock), validates them
+against ProductCreate chunk by chunk, COPYs each chunk into temp staging
+tables and applies it with set-based upserts into products, product_images
+and inventory. Every chunk is its own transaction, so memory stays bounded by
+the chunk size and a bad chunk does not undo earlier ones.
+
+CSV columns: the ProductCreate fields plus `stock` and `image_urls` (pipe
+separated, first one is primary). JSONL rows may give `images` as a list of
+ProductImageBase objects instead of `image_urls`. Re-importing a SKU updates
+the product, replaces its images if the row has any, and sets its stock if
+the row has one; stock is never set below what open orders have reserved.
+"""
+import csv
+import json
+import time
+from decimal import Decimal
+from itertools import islice
+from typing import IO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import Numeric, String
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import driver_connection
+from app.models.product import Product, ProductImage
+from app.schemas.product import ProductCreate, CatalogImportReport, ImportRowError
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+PRODUCT_FIELDS = [
+    "sku", "name", "description", "category_id", "brand", "mrp", "selling_price",
+    "discount_percent", "age_min_months", "age_max_months", "gender", "size", "color"
+]
+IMAGE_FIELDS = ["image_url", "angle", "display_order", "is_primary"]
+
+STAGING_PRODUCTS_SQL = """
+    CREATE TEMP TABLE import_products (
+        row_no INTEGER NOT NULL,
+        sku TEXT NOT NULL, name TEXT, description TEXT, category_id INTEGER, brand TEXT,
+        mrp NUMERIC, selling_price NUMERIC, discount_percent NUMERIC,
+        age_min_months INTEGER, age_max_months INTEGER,
+        gender TEXT, size TEXT, color TEXT, stock INTEGER
+    ) ON COMMIT DROP
+"""
+
+STAGING_IMAGES_SQL = """
+    CREATE TEMP TABLE import_images (
+        row_no INTEGER NOT NULL,
+        image_url TEXT, angle TEXT, display_order INTEGER, is_primary BOOLEAN
+    ) ON COMMIT DROP
+"""
+
+UNKNOWN_CATEGORY_SQL = """
+    DELETE FROM import_products s
+    WHERE NOT EXISTS (SELECT 1 FROM categories c WHERE c.id = s.category_id)
+    RETURNING row_no, sku, category_id
+"""
+
+# Last occurrence of a SKU within a chunk wins
+DEDUPE_SQL = """
+    DELETE FROM import_products a
+    USING import_products b
+    WHERE a.sku = b.sku AND a.row_no < b.row_no
+"""
+
+UPSERT_PRODUCTS_SQL = """
+    INSERT INTO products (
+        sku, name, description, category_id, brand, mrp, selling_price, discount_percent,
+        age_min_months, age_max_months, gender, size, color,
+        is_active, is_featured, rating_avg, rating_count
+    )
+    SELECT sku, name, description, category_id, brand, mrp, selling_price, discount_percent,
+           age_min_months, age_max_months, gender, size, color,
+           TRUE, FALSE, 0, 0
+    FROM import_products
+    ORDER BY sku
+    ON CONFLICT (sku) DO UPDATE SET
+        name = EXCLUDED.name,
+        description = EXCLUDED.description,
+        category_id = EXCLUDED.category_id,
+        brand = EXCLUDED.brand,
+        mrp = EXCLUDED.mrp,
+        selling_price = EXCLUDED.selling_price,
+        discount_percent = EXCLUDED.discount_percent,
+        age_min_months = EXCLUDED.age_min_months,
+        age_max_months = EXCLUDED.age_max_months,
+        gender = EXCLUDED.gender,
+        size = EXCLUDED.size,
+        color = EXCLUDED.color,
+        updated_at = NOW()
+    RETURNING id, (xmax = 0) AS inserted
+"""
+
+DELETE_REPLACED_IMAGES_SQL = """
+    DELETE FROM product_images pi
+    USING (
+        SELECT DISTINCT p.id
+        FROM import_images i
+        JOIN import_products s ON s.row_no = i.row_no
+        JOIN products p ON p.sku = s.sku
+    ) t
+    WHERE pi.product_id = t.id
+"""
+
+INSERT_IMAGES_SQL = """
+    INSERT INTO product_images (product_id, image_url, angle, display_order, is_primary)
+    SELECT p.id, i.image_url, i.angle, i.display_order, i.is_primary
+    FROM import_images i
+    JOIN import_products s ON s.row_no = i.row_no
+    JOIN products p ON p.sku = s.sku
+"""
+
+UPSERT_INVENTORY_SQL = """
+    INSERT INTO inventory (product_id, quantity_available, quantity_reserved, low_stock_threshold, reorder_point)
+    SELECT p.id, s.stock, 0, 10, 20
+    FROM import_products s
+    JOIN products p ON p.sku = s.sku
+    WHERE s.stock IS NOT NULL
+    ORDER BY p.id
+    ON CONFLICT (product_id) DO UPDATE SET
+        quantity_available = GREATEST(EXCLUDED.quantity_available, inventory.quantity_reserved),
+        updated_at = NOW()
+"""
+
+
+def _column_limits(table, fields: List[str]) -> Tuple[list, list]:
+    """
+    (field, max length) and (field, exclusive numeric bound) for the imported
+    columns, so an oversize value rejects its row instead of failing the chunk
+    """
+    lengths, bounds = [], []
+    for name in fields:
+        column_type = table.c[name].type
+        if isinstance(column_type, String) and column_type.length:
+            lengths.append((name, column_type.length))
+        elif isinstance(column_type, Numeric) and column_type.precision:
+            bounds.append((name, Decimal(10) ** (column_type.precision - column_type.scale)))
+    return lengths, bounds
+
+
+PRODUCT_LIMITS = _column_limits(Product.__table__, PRODUCT_FIELDS)
+IMAGE_LIMITS = _column_limits(ProductImage.__table__, IMAGE_FIELDS)
+
+
+def _rowcount(status: str) -> int:
+    """Row count from an asyncpg command status such as 'INSERT 0 42'"""
+    return int(status.split()[-1])
+
+
+def read_rows(stream: IO[str], fmt: str) -> Iterator:
+    """Lazily yield raw rows: dicts for CSV, undecoded lines for JSONL"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        if reader.fieldnames:
+            reader.fieldnames = [name.strip() for name in reader.fieldnames]
+        yield from reader
+    elif fmt == "jsonl":
+        # Decoded per row in _validate, so one malformed line is one rejected row
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+class CatalogImportService:
+    def __init__(self, chunk_size: int = settings.IMPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    async def import_stream(self, stream: IO[str], fmt: str) -> CatalogImportReport:
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format: {fmt}")
+
+        started = time.monotonic()
+        report = CatalogImportReport()
+        rows = read_rows(stream, fmt)
+
+        async with driver_connection() as conn:
+            while True:
+                # Parsing and validation are CPU-bound; keep them off the event loop
+                products, images, errors, count = await run_in_threadpool(
+                    self._prepare_chunk, rows, report.rows_read
+                )
+                self._add_errors(report, errors)
+                if not count:
+                    break
+                report.rows_read += count
+                report.chunks += 1
+                if products:
+                    await self._apply_chunk(conn, products, images, report)
+
+        report.duration_seconds = round(time.monotonic() - started, 3)
+        return report
+
+    def _prepare_chunk(self, rows: Iterator, offset: int) -> Tuple[list, list, list, int]:
+        products, images, errors = [], [], []
+        count = 0
+        try:
+            for count, raw in enumerate(islice(rows, self.chunk_size), start=1):
+                row_no = offset + count
+                try:
+                    product, stock = self._validate(raw)
+                except ValueError as e:
+                    sku = raw.get("sku") if isinstance(raw, dict) else self._sniff_sku(raw)
+                    errors.append(ImportRowError(row=row_no, sku=sku or None, error=str(e)))
+                    continue
+                products.append((row_no, *(getattr(product, f) for f in PRODUCT_FIELDS), stock))
+                for image in product.images or []:
+                    images.append((row_no, *(getattr(image, f) for f in IMAGE_FIELDS)))
+        except (csv.Error, UnicodeDecodeError) as e:
+            # The stream itself is unreadable past this point
+            errors.append(ImportRowError(row=offset + count + 1, error=f"Unreadable input: {e}"))
+        return products, images, errors, count
+
+    @staticmethod
+    def _sniff_sku(line: str) -> Optional[str]:
+        try:
+            row = json.loads(line)
+        except ValueError:
+            return None
+        return row.get("sku") if isinstance(row, dict) else None
+
+    @staticmethod
+    def _validate(raw) -> Tuple[ProductCreate, Optional[int]]:
+        if isinstance(raw, str):
+            try:
+                raw = json.loads(raw)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(raw, dict):
+            raise ValueError("Row must be an object")
+        # Extra CSV cells land under the None key
+        data = {k: v for k, v in raw.items() if k is not None and v not in ("", None)}
+
+        stock = data.pop("stock", None)
+        if stock is not None:
+            try:
+                stock = int(stock)
+            except (TypeError, ValueError):
+                raise ValueError("stock: must be an integer")
+            if stock < 0:
+                raise ValueError("stock: must not be negative")
+
+        urls = data.pop("image_urls", None)
+        if urls and "images" not in data:
+            if isinstance(urls, str):
+                urls = [u.strip() for u in urls.split("|") if u.strip()]
+            data["images"] = [
+                {"image_url": url, "display_order": i, "is_primary": i == 0}
+                for i, url in enumerate(urls)
+            ]
+
+        try:
+            product = ProductCreate.model_validate(data)
+        except ValidationError as e:
+            first = e.errors()[0]
+            field = ".".join(str(part) for part in first["loc"])
+            raise ValueError(f"{field}: {first['msg']}")
+
+        CatalogImportService._check_limits(product, PRODUCT_LIMITS)
+        for image in product.images or []:
+            CatalogImportService._check_limits(image, IMAGE_LIMITS)
+        if product.age_min_months > product.age_max_months:
+            raise ValueError("age_min_months: must not exceed age_max_months")
+        return product, stock
+
+    @staticmethod
+    def _check_limits(obj, limits: Tuple[list, list]):
+        lengths, bounds = limits
+        for field, limit in lengths:
+            value = getattr(obj, field)
+            if value is not None and len(value) > limit:
+                raise ValueError(f"{field}: longer than {limit} characters")
+        for field, limit in bounds:
+            value = getattr(obj, field)
+            if value is not None and abs(value) >= limit:
+                raise ValueError(f"{field}: out of range")
+
+    async def _apply_chunk(self, conn, products: list, images: list, report: CatalogImportReport):
+        async with conn.transaction():
+            # Card triggers are skipped for the chunk; one set-based refresh below
+            await conn.execute("SET LOCAL app.bulk_load = 'on'")
+            await conn.execute(STAGING_PRODUCTS_SQL)
+            await conn.execute(STAGING_IMAGES_SQL)
+            await conn.copy_records_to_table(
+                "import_products", records=products,
+                columns=["row_no", *PRODUCT_FIELDS, "stock"]
+            )
+            if images:
+                await conn.copy_records_to_table(
+                    "import_images", records=images, columns=["row_no", *IMAGE_FIELDS]
+                )
+
+            rejected = await conn.fetch(UNKNOWN_CATEGORY_SQL)
+            self._add_errors(report, [
+                ImportRowError(row=r["row_no"], sku=r["sku"], error=f"category_id: unknown category {r['category_id']}")
+                for r in rejected
+            ])
+            await conn.execute(DEDUPE_SQL)
+
+            upserted = await conn.fetch(UPSERT_PRODUCTS_SQL)
+            if images:
+                await conn.execute(DELETE_REPLACED_IMAGES_SQL)
+                report.images_loaded += _rowcount(await conn.execute(INSERT_IMAGES_SQL))
+            report.inventory_rows += _rowcount(await conn.execute(UPSERT_INVENTORY_SQL))
+
+            product_ids = [r["id"] for r in upserted]
+            await conn.execute("SELECT refresh_product_cards($1::int[])", product_ids)
+
+        inserted = sum(1 for r in upserted if r["inserted"])
+        report.products_inserted += inserted
+        report.products_updated += len(upserted) - inserted
+
+    @staticmethod
+    def _add_errors(report: CatalogImportReport, errors: List[ImportRowError]):
+        report.rows_rejected += len(errors)
+        room = settings.IMPORT_MAX_REPORTED_ERRORS - len(report.errors)
+        if room > 0:
+            report.errors.extend(errors[:room])
@@ -0,0 +1,247 @@
+import time
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional, List, Set, Tuple
+from decimal import Decimal
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.invalidation import CATALOG, PRODUCT, bus
+from app.models.product import CatalogGeneration, ProductCard
+from app.repositories.product_repository import ProductRepository, PRICE_BUCKET_BOUNDS, invalidate_category_tree
+from app.schemas.product import ProductFacetsResponse, FacetValue, RangeFacetValue
+
+# Shared by every request in this process
+facet_cache = TTLCache(maxsize=settings.FACET_CACHE_MAX_ENTRIES, ttl=settings.FACET_CACHE_TTL_SECONDS)
+# product id -> (card refreshed_at, ProductResponse-shaped dict)
+product_cache = TTLCache(maxsize=settings.PRODUCT_CACHE_MAX_ENTRIES, ttl=settings.PRODUCT_CACHE_TTL_SECONDS)
+_generation_cache = TTLCache(maxsize=1, ttl=settings.CATALOG_GENERATION_TTL_SECONDS)
+_last_generations: Optional[Dict[str, int]] = None
+
+
+async def _generations() -> Dict[str, int]:
+    """
+    Committed catalog_generations counters by scope. They change only when the
+    writing transaction commits, so caches refilled after a change was seen
+    never hold rows older than it.
+    """
+    global _last_generations
+    generations = _generation_cache.get("generations")
+    if generations is not None:
+        return generations
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(CatalogGeneration.scope, CatalogGeneration.generation))
+        generations = dict(result.all())
+
+    # A new generation means this process's derived caches may be stale; drop
+    # them so a fresh ETag is never paired with an old body
+    previous = _last_generations
+    if previous is not None:
+        if generations.get("products") != previous.get("products"):
+            facet_cache.clear()
+            product_cache.clear()
+        if generations.get("categories") != previous.get("categories"):
+            # Facets and listings filter on category subtrees
+            facet_cache.clear()
+            invalidate_category_tree()
+    _last_generations = generations
+    _generation_cache.set("generations", generations)
+    return generations
+
+
+async def catalog_generation(params: dict = None) -> str:
+    """
+    Validator for catalog listing, facet and batch responses: the products and
+    categories generations, plus a CATALOG_STOCK_ETAG_SECONDS time bucket since
+    the stock and order counts they show don't bump a generation
+    """
+    generations = await _generations()
+    bucket = int(time.time() // settings.CATALOG_STOCK_ETAG_SECONDS)
+    return f"{generations.get('products')}.{generations.get('categories')}.{bucket}"
+
+
+async def category_generation(params: dict = None) -> Optional[int]:
+    """Validator for category responses"""
+    return (await _generations()).get("categories")
+
+
+async def product_version(params: dict) -> Optional[str]:
+    """Validator for a single product: its card's refreshed_at, or None if unknown"""
+    try:
+        product_id = int(params["product_id"])
+    except (KeyError, ValueError):
+        return None
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(ProductCard.refreshed_at).where(ProductCard.product_id == product_id)
+        )
+        refreshed_at = result.scalar()
+
+    cached = product_cache.get(product_id)
+    if cached is not None and cached[0] != refreshed_at:
+        product_cache.delete(product_id)
+    return refreshed_at.isoformat() if refreshed_at else None
+
+
+def _evict_products(keys: Set[str]):
+    """Another writer changed these products' stock (possibly in another process)"""
+    for key in keys:
+        if key.isdigit():
+            product_cache.delete(int(key))
+
+
+def _expire_generation(keys: Set[str]):
+    # The next catalog_generation() call re-reads the counters right away
+    # instead of after the TTL, and drops the derived caches when they moved
+    _generation_cache.clear()
+
+
+async def _resync_catalog(conn):
+    _generation_cache.clear()
+    product_cache.clear()
+
+
+bus.subscribe(PRODUCT, _evict_products, resync=_resync_catalog)
+bus.subscribe(CATALOG, _expire_generation)
+
+
+def product_to_response(p) -> dict:
+    """ProductResponse-shaped dict built from the ORM row without re-validation"""
+    inv = p.inventory
+    stock = max(0, inv.quantity_available - inv.quantity_reserved) if inv else 0
+    images = sorted(p.images, key=lambda img: (img.display_order, img.id))
+    return {
+        "id": p.id, "sku": p.sku, "name": p.name, "description": p.description,
+        "category_id": p.category_id, "brand": p.brand, "mrp": p.mrp,
+        "selling_price": p.selling_price, "discount_percent": p.discount_percent,
+        "age_min_months": p.age_min_months, "age_max_months": p.age_max_months,
+        "gender": p.gender, "size": p.size, "color": p.color,
+        "is_active": p.is_active, "is_featured": p.is_featured,
+        "rating_avg": p.rating_avg, "rating_count": p.rating_count,
+        "created_at": p.created_at,
+        "images": [
+            {
+                "id": img.id, "product_id": img.product_id, "image_url": img.image_url,
+                "angle": img.angle, "display_order": img.display_order, "is_primary": img.is_primary
+            }
+            for img in images
+        ],
+        "stock_available": stock
+    }
+
+
+# Filters matched with ILIKE, so their case doesn't change the result
+CASE_INSENSITIVE_FILTERS = {"brand", "search"}
+
+
+def filter_signature(**filters) -> tuple:
+    """
+    Normalize catalog filters into a hashable cache key. Only normalizations
+    the query itself ignores are applied: other strings (gender) compare
+    exactly, and ILIKE patterns keep their whitespace.
+    """
+    signature = []
+    for key in sorted(filters):
+        value = filters[key]
+        if value is None or value == "":
+            continue
+        if isinstance(value, str) and key in CASE_INSENSITIVE_FILTERS:
+            value = value.lower()
+        elif isinstance(value, Decimal):
+            value = value.normalize()
+        signature.append((key, value))
+    return tuple(signature)
+
+
+class CatalogService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.product_repo = ProductRepository(db)
+
+    async def get_products(self, product_ids: List[int]) -> Tuple[List[dict], List[int]]:
+        """
+        Product details for an id list, in the requested order, plus the ids
+        that were not found. Served from the per-id cache where possible; the
+        rest are loaded with one batched query.
+        """
+        found = {}
+        to_load = []
+        for product_id in product_ids:
+            cached = product_cache.get(product_id)
+            if cached is not None:
+                found[product_id] = cached[1]
+            else:
+                to_load.append(product_id)
+
+        for product, refreshed_at in await self.product_repo.get_by_ids(to_load):
+            response = product_to_response(product)
+            product_cache.set(product.id, (refreshed_at, response))
+            found[product.id] = response
+
+        products = [found[pid] for pid in product_ids if pid in found]
+        missing = [pid for pid in product_ids if pid not in found]
+        return products, missing
+
+    async def get_product(self, product_id: int) -> Optional[dict]:
+        products, _ = await self.get_products([product_id])
+        return products[0] if products else None
+
+    async def get_facets(
+        self,
+        category_id: Optional[int] = None,
+        brand: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        gender: Optional[str] = None,
+        age_months: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> ProductFacetsResponse:
+        filters = dict(
+            category_id=category_id, brand=brand, min_price=min_price,
+            max_price=max_price, gender=gender, age_months=age_months, search=search
+        )
+        key = filter_signature(**filters)
+        cached = facet_cache.get(key)
+        if cached is not None:
+            return cached
+
+        facets = await self.product_repo.get_facets(**filters)
+        response = self._to_response(facets)
+        facet_cache.set(key, response)
+        return response
+
+    def _to_response(self, facets: dict) -> ProductFacetsResponse:
+        bounds = [None] + PRICE_BUCKET_BOUNDS + [None]
+        price_buckets = [
+            RangeFacetValue(
+                label=self._price_label(bounds[bucket], bounds[bucket + 1]),
+                min=bounds[bucket], max=bounds[bucket + 1], count=count
+            )
+            for bucket, count in sorted(facets["price_buckets"])
+        ]
+        return ProductFacetsResponse(
+            total=facets["total"],
+            brands=sorted(
+                (FacetValue(value=v, count=c) for v, c in facets["brands"] if v),
+                key=lambda f: (-f.count, f.value)
+            ),
+            genders=sorted(
+                (FacetValue(value=v, count=c) for v, c in facets["genders"] if v),
+                key=lambda f: f.value
+            ),
+            age_bands=[
+                RangeFacetValue(label=label, min=low, max=high, count=count)
+                for (label, low, high), count in facets["age_bands"]
+            ],
+            price_buckets=price_buckets
+        )
+
+    @staticmethod
+    def _price_label(low: Optional[Decimal], high: Optional[Decimal]) -> str:
+        if low is None:
+            return f"Under ₹{high}"
+        if high is None:
+            return f"₹{low} and above"
+        return f"₹{low} - ₹{high}"
@@ -0,0 +1,153 @@
+"""
+Bulk inventory sync.
+
+Applies a warehouse stock feed of (sku, delta | absolute quantity) records in
+one transaction: the records are streamed into a temp table with asyncpg
+copy_records_to_table, checked set-wise, and applied with a single
+UPDATE ... FROM. Rows that cannot be applied are reported individually and
+the rest go through:
+
+- unknown_sku: no product has this SKU
+- duplicate_sku: the SKU appears more than once in the feed
+- below_reserved: the new quantity would drop below what open orders have
+  reserved (this includes going negative)
+
+Card and invalidation triggers are skipped for the statement; the affected
+product cards are refreshed in one call, which also bumps the catalog
+generation, and one `product` invalidation per changed id is published.
+"""
+import time
+from typing import Iterable, List
+
+from app.core.config import settings
+from app.core.database import driver_connection
+from app.schemas.inventory import InventorySyncItem, InventorySyncReport, InventoryConflict
+from app.services.catalog_service import product_cache
+
+STAGING_SQL = """
+    CREATE TEMP TABLE stock_sync (
+        row_no INTEGER NOT NULL,
+        sku TEXT NOT NULL,
+        delta INTEGER,
+        absolute INTEGER,
+        product_id INTEGER,
+        conflict TEXT,
+        quantity_available INTEGER,
+        quantity_reserved INTEGER
+    ) ON COMMIT DROP
+"""
+
+RESOLVE_SQL = [
+    "UPDATE stock_sync s SET product_id = p.id FROM products p WHERE p.sku = s.sku",
+    "UPDATE stock_sync SET conflict = 'unknown_sku' WHERE product_id IS NULL",
+    """
+    UPDATE stock_sync s SET conflict = 'duplicate_sku'
+    FROM (SELECT sku FROM stock_sync GROUP BY sku HAVING COUNT(*) > 1) d
+    WHERE s.sku = d.sku AND s.conflict IS NULL
+    """,
+    # Same as increase_inventory: a product without an inventory row gets one,
+    # but only when the result would not be negative
+    """
+    INSERT INTO inventory (product_id, quantity_available, quantity_reserved, low_stock_threshold, reorder_point)
+    SELECT product_id, 0, 0, 10, 20
+    FROM stock_sync
+    WHERE conflict IS NULL AND COALESCE(absolute, delta) >= 0
+    ORDER BY product_id
+    ON CONFLICT (product_id) DO NOTHING
+    """,
+    # Lock in product_id order so concurrent syncs and order flows cannot deadlock
+    """
+    SELECT 1 FROM inventory i
+    JOIN stock_sync s ON s.product_id = i.product_id AND s.conflict IS NULL
+    ORDER BY i.product_id
+    FOR UPDATE OF i
+    """,
+    """
+    UPDATE stock_sync s SET conflict = 'below_reserved',
+        quantity_available = i.quantity_available,
+        quantity_reserved = i.quantity_reserved
+    FROM inventory i
+    WHERE i.product_id = s.product_id
+      AND s.conflict IS NULL
+      AND COALESCE(s.absolute, i.quantity_available + s.delta) < i.quantity_reserved
+    """,
+    """
+    UPDATE stock_sync s SET conflict = 'below_reserved', quantity_available = 0, quantity_reserved = 0
+    WHERE s.conflict IS NULL
+      AND NOT EXISTS (SELECT 1 FROM inventory i WHERE i.product_id = s.product_id)
+    """,
+]
+
+APPLY_SQL = """
+    UPDATE inventory i
+    SET quantity_available = COALESCE(s.absolute, i.quantity_available + s.delta),
+        updated_at = NOW()
+    FROM stock_sync s
+    WHERE s.product_id = i.product_id
+      AND s.conflict IS NULL
+      AND COALESCE(s.absolute, i.quantity_available + s.delta) <> i.quantity_available
+    RETURNING i.product_id
+"""
+
+# Delivered to the other API processes on commit (see app.core.invalidation)
+PUBLISH_SQL = "SELECT notify_invalidation('product', id::text) FROM unnest($1::int[]) AS id"
+
+CONFLICTS_SQL = """
+    SELECT row_no, sku, conflict, quantity_available, quantity_reserved,
+           COUNT(*) OVER () AS total
+    FROM stock_sync
+    WHERE conflict IS NOT NULL
+    ORDER BY row_no
+    LIMIT $1
+"""
+
+
+class InventorySyncService:
+    async def sync(self, items: Iterable[InventorySyncItem], dry_run: bool = False) -> InventorySyncReport:
+        started = time.monotonic()
+        records = [(row, item.sku, item.delta, item.quantity) for row, item in enumerate(items, start=1)]
+        report = InventorySyncReport(rows=len(records), dry_run=dry_run)
+        if not records:
+            return report
+
+        async with driver_connection() as conn:
+            tx = conn.transaction()
+            await tx.start()
+            try:
+                await conn.execute("SET LOCAL app.bulk_load = 'on'")
+                await conn.execute(STAGING_SQL)
+                await conn.copy_records_to_table(
+                    "stock_sync", records=records, columns=["row_no", "sku", "delta", "absolute"]
+                )
+                for sql in RESOLVE_SQL:
+                    await conn.execute(sql)
+
+                changed: List[int] = [r["product_id"] for r in await conn.fetch(APPLY_SQL)]
+                if changed:
+                    await conn.execute("SELECT refresh_product_cards($1::int[])", changed)
+                    await conn.execute(PUBLISH_SQL, changed)
+
+                conflicts = await conn.fetch(CONFLICTS_SQL, settings.INVENTORY_SYNC_MAX_REPORTED_CONFLICTS)
+            except BaseException:
+                await tx.rollback()
+                raise
+            if dry_run:
+                await tx.rollback()
+            else:
+                await tx.commit()
+
+        report.updated = len(changed)
+        report.conflicts_total = conflicts[0]["total"] if conflicts else 0
+        report.unchanged = report.rows - report.updated - report.conflicts_total
+        report.conflicts = [
+            InventoryConflict(
+                row=r["row_no"], sku=r["sku"], reason=r["conflict"],
+                quantity_available=r["quantity_available"], quantity_reserved=r["quantity_reserved"]
+            )
+            for r in conflicts
+        ]
+        if not dry_run:
+            for product_id in changed:
+                product_cache.delete(product_id)
+        report.duration_seconds = round(time.monotonic() - started, 3)
+        return report
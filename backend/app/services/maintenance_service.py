@@ -0,0 +1,64 @@
+"""
+Periodic maintenance jobs, run by the scheduler on one replica at a time.
+
+Each job opens its own session and returns the number of rows it affected,
+which is recorded in the run history. Expired OTPs and refresh tokens are not
+deleted row by row any more: their tables are partitioned by day and
+`manage_partitions` drops whole partitions once they expire.
+"""
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.scheduler import scheduler
+from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.order_repository import OrderRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.services.analytics_service import prune_applied_events
+from app.services.bestseller_service import refresh_scores
+from app.services.outbox_service import prune_dispatched_events
+from app.services.partition_service import manage_partitions
+
+
+async def cleanup_expired_tokens() -> int:
+    """Revocations of access tokens that have expired anyway"""
+    async with AsyncSessionLocal() as db:
+        return await RevokedTokenRepository(db).cleanup_expired_tokens()
+
+
+async def expire_inventory_locks() -> int:
+    """Release stock held by expired locks, a batch at a time until none are left"""
+    total = 0
+    async with AsyncSessionLocal() as db:
+        repo = InventoryRepository(db)
+        while True:
+            released = await repo.release_expired_locks(settings.JOB_INVENTORY_LOCK_EXPIRY_BATCH)
+            total += released
+            if released < settings.JOB_INVENTORY_LOCK_EXPIRY_BATCH:
+                return total
+
+
+async def archive_orders() -> int:
+    """Move finished orders older than ORDER_ARCHIVE_AFTER_MONTHS to the archive, a batch at a time"""
+    now = datetime.now(timezone.utc)
+    years, month = divmod(now.month - 1 - settings.ORDER_ARCHIVE_AFTER_MONTHS, 12)
+    cutoff = now.replace(year=now.year + years, month=month + 1, day=min(now.day, 28))
+    total = 0
+    async with AsyncSessionLocal() as db:
+        repo = OrderRepository(db)
+        while True:
+            archived = await repo.archive_finished_orders(cutoff, settings.ORDER_ARCHIVE_BATCH)
+            total += archived
+            if archived < settings.ORDER_ARCHIVE_BATCH:
+                return total
+
+
+scheduler.register("cleanup_expired_tokens", cleanup_expired_tokens, interval=settings.JOB_TOKEN_CLEANUP_SECONDS)
+scheduler.register("expire_inventory_locks", expire_inventory_locks, interval=settings.JOB_INVENTORY_LOCK_EXPIRY_SECONDS)
+scheduler.register("manage_partitions", manage_partitions, interval=settings.JOB_PARTITION_MAINTENANCE_SECONDS)
+scheduler.register("archive_orders", archive_orders, interval=settings.JOB_ORDER_ARCHIVE_SECONDS)
+scheduler.register(
+    "prune_analytics_events", prune_applied_events, interval=settings.JOB_ANALYTICS_EVENTS_PRUNE_SECONDS
+)
+scheduler.register("prune_outbox", prune_dispatched_events, interval=settings.JOB_OUTBOX_PRUNE_SECONDS)
+scheduler.register("refresh_bestsellers", refresh_scores, interval=settings.JOB_BESTSELLER_REFRESH_SECONDS)
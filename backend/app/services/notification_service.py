@@ -0,0 +1,294 @@
+"""
+SMS dispatch off the request path.
+
+Callers enqueue messages and return immediately; a pool of workers drains
+the in-process queue in batches (up to the provider's bulk limit, waiting a
+few milliseconds for a batch to fill) and hands them to the configured
+provider. Transient failures are retried with exponential backoff and full
+jitter, outside the workers so a slow retry never holds a worker. Messages
+past their `expires_at` (an OTP nobody can use any more) are dropped instead
+of sent.
+
+The queue lives in memory: messages still queued when a worker process dies
+are lost. For OTPs that is acceptable since the code is already stored and
+the user can ask for a resend.
+
+Providers:
+- fake: delivers nothing; keeps the last `keep` messages in memory for
+  tests and logs recipients (never bodies, which carry OTPs) at DEBUG. The
+  default, for development and tests
+- http: bulk JSON gateway over a pooled keep-alive connection (needs the
+  optional `httpx` package). POSTs {"sender", "messages": [{"to", "body"}]}
+  to SMS_HTTP_URL and expects {"results": [{"status": "sent" | "failed",
+  "error", "retryable"}]} in the same order
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import httpx
+except ImportError:  # optional dependency
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SMSMessage:
+    to: str
+    body: str
+    expires_at: Optional[float] = None  # time.time() after which sending is pointless
+    attempts: int = 0
+
+
+class SMSDeliveryError(Exception):
+    def __init__(self, reason: str, retryable: bool = True):
+        super().__init__(reason)
+        self.reason = reason
+        self.retryable = retryable
+
+
+class SMSQueueFull(Exception):
+    pass
+
+
+class SMSProvider:
+    """Sends a batch and reports per-message failures, in order (None = accepted)"""
+    name = "base"
+    max_batch_size = 1
+
+    async def send_batch(self, messages: List[SMSMessage]) -> List[Optional[SMSDeliveryError]]:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+
+class FakeSMSProvider(SMSProvider):
+    name = "fake"
+
+    def __init__(
+        self, max_batch_size: int = 100, latency: float = 0.0, failure_rate: float = 0.0, keep: int = 100
+    ):
+        self.max_batch_size = max_batch_size
+        self.latency = latency
+        self.failure_rate = failure_rate
+        # Bounded: a long-running process on the default provider must not grow
+        self.sent: Deque[SMSMessage] = deque(maxlen=keep)
+        self.batches = 0
+
+    async def send_batch(self, messages: List[SMSMessage]) -> List[Optional[SMSDeliveryError]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.batches += 1
+        results = []
+        for message in messages:
+            if self.failure_rate and random.random() < self.failure_rate:
+                results.append(SMSDeliveryError("simulated failure"))
+                continue
+            self.sent.append(message)
+            logger.debug("SMS to %s not delivered (fake provider, %d chars)", message.to, len(message.body))
+            results.append(None)
+        return results
+
+
+class HTTPSMSProvider(SMSProvider):
+    name = "http"
+
+    def __init__(
+        self,
+        url: str,
+        api_key: Optional[str],
+        sender: str,
+        max_batch_size: int,
+        max_connections: int,
+        timeout: float
+    ):
+        if httpx is None:
+            raise RuntimeError("SMS_PROVIDER=http needs the httpx package")
+        self.url = url
+        self.sender = sender
+        self.max_batch_size = max_batch_size
+        # One pooled client per provider: workers share its keep-alive connections
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else {},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+
+    async def send_batch(self, messages: List[SMSMessage]) -> List[Optional[SMSDeliveryError]]:
+        response = await self._client.post(self.url, json={
+            "sender": self.sender,
+            "messages": [{"to": m.to, "body": m.body} for m in messages]
+        })
+        if response.status_code == 429 or response.status_code >= 500:
+            raise SMSDeliveryError(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            error = SMSDeliveryError(f"HTTP {response.status_code}: {response.text[:200]}", retryable=False)
+            return [error] * len(messages)
+
+        results = response.json().get("results", [])
+        return [
+            None if r.get("status") == "sent"
+            else SMSDeliveryError(r.get("error") or "rejected", retryable=bool(r.get("retryable", False)))
+            for r in results
+        ] + [SMSDeliveryError("missing result")] * (len(messages) - len(results))
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def build_provider() -> SMSProvider:
+    if settings.SMS_PROVIDER == "http":
+        return HTTPSMSProvider(
+            url=settings.SMS_HTTP_URL,
+            api_key=settings.SMS_HTTP_API_KEY,
+            sender=settings.SMS_SENDER_ID,
+            max_batch_size=settings.SMS_BATCH_SIZE,
+            max_connections=settings.SMS_HTTP_MAX_CONNECTIONS,
+            timeout=settings.SMS_SEND_TIMEOUT_SECONDS
+        )
+    if settings.SMS_PROVIDER != "fake":
+        raise ValueError(f"Unknown SMS_PROVIDER: {settings.SMS_PROVIDER}")
+    logger.warning("SMS_PROVIDER=fake: SMS messages are not delivered")
+    return FakeSMSProvider(max_batch_size=settings.SMS_BATCH_SIZE)
+
+
+class SMSDispatcher:
+    def __init__(
+        self,
+        provider: Optional[SMSProvider] = None,
+        workers: int = settings.SMS_WORKERS,
+        max_queue_size: int = settings.SMS_QUEUE_MAX_SIZE,
+        batch_linger: float = settings.SMS_BATCH_LINGER_SECONDS,
+        max_attempts: int = settings.SMS_MAX_ATTEMPTS,
+        retry_base: float = settings.SMS_RETRY_BASE_SECONDS,
+        retry_max: float = settings.SMS_RETRY_MAX_SECONDS,
+        send_timeout: float = settings.SMS_SEND_TIMEOUT_SECONDS
+    ):
+        self._provider = provider
+        self.workers = workers
+        self.batch_linger = batch_linger
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.send_timeout = send_timeout
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._retries = set()
+
+    @property
+    def provider(self) -> SMSProvider:
+        # Built on first use so importing this module never needs provider config
+        if self._provider is None:
+            self._provider = build_provider()
+        return self._provider
+
+    def enqueue(self, to: str, body: str, ttl_seconds: Optional[float] = None):
+        """Queue a message without waiting; raises SMSQueueFull under overload"""
+        message = SMSMessage(to=to, body=body, expires_at=time.time() + ttl_seconds if ttl_seconds else None)
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            metrics.incr("sms.rejected")
+            raise SMSQueueFull()
+        metrics.incr("sms.enqueued")
+        metrics.set_gauge("sms.queue_depth", self._queue.qsize())
+
+    async def run(self):
+        try:
+            await asyncio.gather(*[self._worker() for _ in range(self.workers)])
+        finally:
+            for handle in self._retries:
+                handle.cancel()
+            if self._queue.qsize():
+                logger.warning("SMS dispatcher stopped with %s queued messages", self._queue.qsize())
+            if self._provider is not None:
+                await self._provider.aclose()
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self.send(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("SMS batch failed")
+
+    async def _next_batch(self) -> List[SMSMessage]:
+        batch = [await self._queue.get()]
+        limit = self.provider.max_batch_size
+        deadline = asyncio.get_running_loop().time() + self.batch_linger
+        while len(batch) < limit:
+            if self._queue.empty():
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                batch.append(self._queue.get_nowait())
+        metrics.set_gauge("sms.queue_depth", self._queue.qsize())
+        return batch
+
+    async def send(self, batch: List[SMSMessage]):
+        """Send one batch now; failures are rescheduled or given up on"""
+        now = time.time()
+        live = [m for m in batch if m.expires_at is None or m.expires_at > now]
+        if len(live) < len(batch):
+            metrics.incr("sms.expired", len(batch) - len(live))
+        if not live:
+            return
+
+        for message in live:
+            message.attempts += 1
+        started = time.monotonic()
+        try:
+            results = await asyncio.wait_for(self.provider.send_batch(live), timeout=self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e if isinstance(e, SMSDeliveryError) else SMSDeliveryError(repr(e))
+            results = [error] * len(live)
+        metrics.set_gauge("sms.batch_seconds", round(time.monotonic() - started, 4))
+        metrics.set_gauge("sms.batch_size", len(live))
+
+        for message, error in zip(live, results):
+            if error is None:
+                metrics.incr("sms.sent")
+            elif error.retryable and message.attempts < self.max_attempts:
+                metrics.incr("sms.retried")
+                self._schedule_retry(message)
+            else:
+                metrics.incr("sms.failed")
+                logger.error("SMS to %s failed after %s attempts: %s", message.to, message.attempts, error.reason)
+
+    def _schedule_retry(self, message: SMSMessage):
+        # Full jitter: uniform in [0, min(cap, base * 2^attempts)]
+        delay = random.uniform(0, min(self.retry_max, self.retry_base * 2 ** message.attempts))
+        loop = asyncio.get_running_loop()
+        handle = None
+
+        def requeue():
+            self._retries.discard(handle)
+            try:
+                self._queue.put_nowait(message)
+            except asyncio.QueueFull:
+                metrics.incr("sms.failed")
+                logger.error("SMS to %s dropped on retry: queue full", message.to)
+
+        handle = loop.call_later(delay, requeue)
+        self._retries.add(handle)
+
+
+sms_dispatcher = SMSDispatcher()
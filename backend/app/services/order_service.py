@@ -1,10 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import Tuple, Optional, List
+from datetime import datetime
 from decimal import Decimal
+import base64
 from app.repositories.order_repository import OrderRepository
 from app.repositories.coupon_repository import CouponRepository
-from app.schemas.order import OrderResponse, OrderItemResponse, OrderListResponse
 
 class OrderService:
     def __init__(self, db: AsyncSession):
@@ -66,53 +67,113 @@ class OrderService:
         error_msg = row[1] if row else "Failed to cancel order"
         return False, error_msg
 
-    async def get_order(self, order_id: int, user_id: int) -> Optional[OrderResponse]:
+    async def get_order(self, order_id: int, user_id: int) -> Optional[dict]:
         order = await self.order_repo.get_by_id(order_id)
         if not order or order.user_id != user_id:
             return None
         return self._to_response(order)
 
-    async def get_user_orders(self, user_id: int, status: Optional[str], page: int, page_size: int) -> OrderListResponse:
+    async def get_user_orders(
+        self,
+        user_id: int,
+        status: Optional[str],
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None
+    ) -> dict:
+        """
+        Recent (live) orders by page. The last page carries a `next_cursor`
+        when the user has archived orders; passing it pages through those,
+        newest first, with a fresh `next_cursor` until they run out. Raises
+        ValueError for a malformed cursor.
+        """
+        if cursor is not None:
+            return await self._get_archived_orders(user_id, status, page, page_size, cursor)
+
         orders, total = await self.order_repo.get_user_orders(
             user_id, status, skip=(page - 1) * page_size, limit=page_size
         )
-        return OrderListResponse(
-            orders=[self._to_response(o) for o in orders],
-            total=total,
-            page=page,
-            page_size=page_size
+        next_cursor = None
+        if (page - 1) * page_size + len(orders) >= total and await self.order_repo.has_archived_orders(user_id, status):
+            next_cursor = self._encode_cursor(None)
+        return {
+            "orders": [self._to_response(o) for o in orders],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor
+        }
+
+    async def _get_archived_orders(
+        self,
+        user_id: int,
+        status: Optional[str],
+        page: int,
+        page_size: int,
+        cursor: str
+    ) -> dict:
+        orders, total = await self.order_repo.get_archived_user_orders(
+            user_id, status, before=self._decode_cursor(cursor), limit=page_size
         )
+        next_cursor = None
+        if len(orders) == page_size:
+            next_cursor = self._encode_cursor((orders[-1].created_at, orders[-1].id))
+        return {
+            "orders": [self._to_response(o) for o in orders],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor
+        }
 
-    def _to_response(self, order) -> OrderResponse:
+    # A cursor is the (created_at, id) of the last archived order shown, or
+    # "-" for the start of the archive, base64url-encoded
+
+    def _encode_cursor(self, position: Optional[Tuple[datetime, int]]) -> str:
+        raw = "-" if position is None else f"{position[0].isoformat()}|{position[1]}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def _decode_cursor(self, cursor: str) -> Optional[Tuple[datetime, int]]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            if raw == "-":
+                return None
+            created_at, order_id = raw.rsplit("|", 1)
+            return datetime.fromisoformat(created_at), int(order_id)
+        except ValueError:
+            raise ValueError("Invalid cursor")
+
+    def _to_response(self, order) -> dict:
+        """OrderResponse-shaped dict built from ORM rows without re-validation"""
         items = [
-            OrderItemResponse(
-                id=item.id,
-                product_id=item.product_id,
-                product_name=item.product_name,
-                product_sku=item.product_sku,
-                product_image_url=item.product_image_url,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                discount_percent=item.discount_percent,
-                total_price=item.total_price
-            ) for item in order.items
+            {
+                "id": item.id,
+                "product_id": item.product_id,
+                "product_name": item.product_name,
+                "product_sku": item.product_sku,
+                "product_image_url": item.product_image_url,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "discount_percent": item.discount_percent,
+                "total_price": item.total_price
+            } for item in order.items
         ]
 
-        return OrderResponse(
-            id=order.id,
-            order_number=order.order_number,
-            user_id=order.user_id,
-            subtotal=order.subtotal,
-            discount_amount=order.discount_amount,
-            delivery_fee=order.delivery_fee,
-            platform_fee=order.platform_fee,
-            total_amount=order.total_amount,
-            status=order.status,
-            payment_status=order.payment_status,
-            items=items,
-            estimated_delivery=order.estimated_delivery,
-            shipped_at=order.shipped_at,
-            delivered_at=order.delivered_at,
-            created_at=order.created_at,
-            updated_at=order.updated_at
-        )
+        return {
+            "id": order.id,
+            "order_number": order.order_number,
+            "user_id": order.user_id,
+            "subtotal": order.subtotal,
+            "discount_amount": order.discount_amount,
+            "delivery_fee": order.delivery_fee,
+            "platform_fee": order.platform_fee,
+            "total_amount": order.total_amount,
+            "status": order.status,
+            "payment_status": order.payment_status,
+            "items": items,
+            "estimated_delivery": order.estimated_delivery,
+            "shipped_at": order.shipped_at,
+            "delivered_at": order.delivered_at,
+            "created_at": order.created_at,
+            "updated_at": order.updated_at
+        }
@@ -0,0 +1,166 @@
+"""
+Outbox dispatcher: drains events that procedures append to the `outbox` table
+and hands them to local sinks.
+
+Delivery is at-least-once. A batch is claimed with FOR UPDATE SKIP LOCKED, so
+several workers can drain concurrently without double-claiming, and events
+are only marked dispatched after every matching sink succeeded. A crash
+between the sinks and the commit redelivers the batch, so sinks must be
+idempotent; the event id is stable across redeliveries.
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.invalidation import OUTBOX, bus
+from app.core.metrics import metrics
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+OutboxSink = Callable[[OutboxEvent], Awaitable[None]]
+
+
+async def log_sink(event: OutboxEvent):
+    logger.info(
+        "outbox event %s %s %s:%s %s",
+        event.id, event.event_type, event.aggregate_type, event.aggregate_id, event.payload
+    )
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+        sink_timeout: float = settings.OUTBOX_SINK_TIMEOUT_SECONDS
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.sink_timeout = sink_timeout
+        self._sinks: List[Tuple[Optional[frozenset], OutboxSink]] = []
+        self._wakeup = asyncio.Event()
+
+    def register(self, sink: OutboxSink, event_types: Optional[Iterable[str]] = None):
+        """Deliver events to `sink`; all events, or only the given event types"""
+        self._sinks.append((frozenset(event_types) if event_types else None, sink))
+
+    def wake(self):
+        """Start the next drain now instead of waiting out the poll interval"""
+        self._wakeup.set()
+
+    async def run(self):
+        while True:
+            try:
+                claimed = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Outbox drain failed")
+                claimed = 0
+
+            # A full batch means there is probably more waiting
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def drain_once(self) -> int:
+        """Claim and deliver one batch; returns the number of events claimed"""
+        async with AsyncSessionLocal() as db:
+            stmt = select(OutboxEvent).where(
+                OutboxEvent.dispatched_at.is_(None),
+                OutboxEvent.available_at <= func.now(),
+                OutboxEvent.attempts < self.max_attempts
+            ).order_by(OutboxEvent.available_at, OutboxEvent.id).limit(self.batch_size).with_for_update(skip_locked=True)
+            events = (await db.execute(stmt)).scalars().all()
+
+            now = datetime.now(timezone.utc)
+            for event in events:
+                error = await self._deliver(event)
+                if error is None:
+                    event.dispatched_at = now
+                    metrics.incr("outbox.dispatched")
+                    metrics.set_gauge("outbox.delivery_lag_seconds", round((now - event.created_at).total_seconds(), 3))
+                else:
+                    event.attempts += 1
+                    event.last_error = error[:1000]
+                    event.available_at = now + self._backoff(event.attempts)
+                    metrics.incr("outbox.failed")
+                    if event.attempts >= self.max_attempts:
+                        metrics.incr("outbox.dead")
+                        logger.error("Outbox event %s gave up after %s attempts: %s", event.id, event.attempts, error)
+
+            await db.commit()
+            await self._record_backlog(db)
+            return len(events)
+
+    async def _deliver(self, event: OutboxEvent) -> Optional[str]:
+        for event_types, sink in self._sinks:
+            if event_types is not None and event.event_type not in event_types:
+                continue
+            try:
+                await asyncio.wait_for(sink(event), timeout=self.sink_timeout)
+            except Exception as e:
+                return f"{getattr(sink, '__name__', sink)}: {e!r}"
+        return None
+
+    @staticmethod
+    def _backoff(attempts: int) -> timedelta:
+        delay = min(300, 2 ** attempts)
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    async def _record_backlog(self, db: AsyncSession):
+        """Age of the oldest event still due for delivery; reads only pending rows"""
+        oldest = (await db.execute(
+            select(func.min(OutboxEvent.created_at)).where(
+                OutboxEvent.dispatched_at.is_(None),
+                OutboxEvent.attempts < self.max_attempts
+            )
+        )).scalar()
+        lag = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0
+        metrics.set_gauge("outbox.lag_seconds", round(lag, 3))
+
+
+# Ids grow with time, so walking the primary key finds the prunable rows first
+_PRUNE_DISPATCHED_SQL = text("""
+    DELETE FROM outbox WHERE id IN (
+        SELECT id FROM outbox
+        WHERE dispatched_at < :cutoff
+        ORDER BY id
+        LIMIT :limit
+    )
+""")
+
+
+async def prune_dispatched_events() -> int:
+    """
+    Delete delivered events older than OUTBOX_RETENTION_DAYS (never less than
+    the analytics applied-event retention), a batch per transaction. Pending
+    and dead events are kept.
+    """
+    days = max(settings.OUTBOX_RETENTION_DAYS, settings.ANALYTICS_APPLIED_EVENTS_RETENTION_DAYS)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    total = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(_PRUNE_DISPATCHED_SQL, {"cutoff": cutoff, "limit": settings.OUTBOX_PRUNE_BATCH})
+        total += result.rowcount
+        if result.rowcount < settings.OUTBOX_PRUNE_BATCH:
+            return total
+
+
+dispatcher = OutboxDispatcher()
+dispatcher.register(log_sink)
+bus.subscribe(OUTBOX, lambda keys: dispatcher.wake())
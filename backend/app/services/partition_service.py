@@ -0,0 +1,149 @@
+"""
+Partition maintenance for the append-only tables range-partitioned on their
+creation time (see the `partitioning` migration).
+
+Partitions are named <table>_pYYYYMMDD (daily) or <table>_pYYYYMM (monthly)
+after their lower bound, in UTC. The manager job keeps PARTITION_PREMAKE
+partitions ahead of now, so inserts never find a missing range, and drops a
+partition once its whole range is past the table's retention: a detach and
+drop, O(1) whatever it holds, instead of a DELETE that bloats table and
+indexes. There is no default partition; a row outside every range fails
+loudly instead of accumulating where nothing can drop it.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    table: str
+    period: str  # "day" | "month"
+    retention: timedelta  # a partition is dropped once its upper bound is this old
+
+    def floor(self, ts: datetime) -> datetime:
+        ts = ts.astimezone(timezone.utc)
+        if self.period == "day":
+            return datetime(ts.year, ts.month, ts.day, tzinfo=timezone.utc)
+        return datetime(ts.year, ts.month, 1, tzinfo=timezone.utc)
+
+    def next(self, start: datetime) -> datetime:
+        if self.period == "day":
+            return start + timedelta(days=1)
+        return datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+    def name(self, start: datetime) -> str:
+        return f"{self.table}_p{start.strftime('%Y%m%d' if self.period == 'day' else '%Y%m')}"
+
+    def parse(self, name: str) -> datetime:
+        suffix = name[len(self.table) + 2:]
+        return datetime.strptime(suffix, "%Y%m%d" if self.period == "day" else "%Y%m").replace(tzinfo=timezone.utc)
+
+    def ranges(self, since: datetime, until: datetime) -> Iterator[Tuple[datetime, datetime]]:
+        """Partition bounds covering [since, until)"""
+        start = self.floor(since)
+        while start < until:
+            end = self.next(start)
+            yield start, end
+            start = end
+
+
+PARTITIONED_TABLES = [
+    # An OTP is useless after OTP_EXPIRE_MINUTES; a day is kept for diagnostics
+    PartitionSpec("otp_verifications", "day", timedelta(days=1)),
+    # Refresh tokens expire REFRESH_TOKEN_EXPIRE_DAYS after creation
+    PartitionSpec("refresh_tokens", "day", timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS + 1)),
+    PartitionSpec("payment_attempts", "month", timedelta(days=settings.PARTITION_PAYMENT_ATTEMPTS_RETENTION_DAYS)),
+    # Per-user coupon limits count usages since the coupon's valid_from, so
+    # keep this longer than any coupon runs
+    PartitionSpec("coupon_usage", "month", timedelta(days=settings.PARTITION_COUPON_USAGE_RETENTION_DAYS)),
+]
+
+_SPECS = {spec.table: spec for spec in PARTITIONED_TABLES}
+
+_LIST_PARTITIONS_SQL = text("""
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = CAST(:parent AS regclass)
+""")
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> List[str]:
+    spec = _SPECS[table]
+    pattern = re.compile(rf"^{re.escape(table)}_p\d{{{8 if spec.period == 'day' else 6}}}$")
+    rows = await conn.execute(_LIST_PARTITIONS_SQL, {"parent": table})
+    return sorted(name for (name,) in rows if pattern.match(name))
+
+
+async def ensure_partitions(conn: AsyncConnection, table: str, since: datetime, until: datetime = None) -> int:
+    """
+    Create any missing partitions of `table` covering [since, until), by
+    default through PARTITION_PREMAKE periods ahead. Returns how many were made.
+    """
+    spec = _SPECS[table]
+    if until is None:
+        until = datetime.now(timezone.utc)
+        for _ in range(settings.PARTITION_PREMAKE):
+            until = spec.next(spec.floor(until))
+    existing = set(await list_partitions(conn, table))
+    created = 0
+    for start, end in spec.ranges(since, until):
+        name = spec.name(start)
+        if name in existing:
+            continue
+        await conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        created += 1
+    return created
+
+
+async def drop_expired_partitions(conn: AsyncConnection, table: str) -> int:
+    spec = _SPECS[table]
+    cutoff = datetime.now(timezone.utc) - spec.retention
+    dropped = 0
+    for name in await list_partitions(conn, table):
+        start = spec.parse(name)
+        if spec.next(start) > cutoff:
+            break  # sorted by start, so every later partition is newer
+        # Detaching needs a brief exclusive lock on the parent; give up rather
+        # than queue every writer behind a long-running reader, and retry next run
+        await conn.execute(text("SET LOCAL lock_timeout = '2s'"))
+        await conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+        await conn.execute(text(f'DROP TABLE "{name}"'))
+        dropped += 1
+    return dropped
+
+
+async def manage_partitions() -> int:
+    """Pre-create upcoming partitions and drop expired ones for every table"""
+    changed, failed = 0, []
+    for spec in PARTITIONED_TABLES:
+        try:
+            async with engine.begin() as conn:
+                created = await ensure_partitions(conn, spec.table, datetime.now(timezone.utc))
+            async with engine.begin() as conn:
+                dropped = await drop_expired_partitions(conn, spec.table)
+        except Exception:
+            # One table's failure (say, a lock timeout) must not starve the others
+            logger.exception("Partition maintenance failed for %s", spec.table)
+            failed.append(spec.table)
+            continue
+        if created or dropped:
+            logger.info("Partitions of %s: %s created, %s dropped", spec.table, created, dropped)
+        changed += created + dropped
+    if failed:
+        raise RuntimeError(f"partition maintenance failed for {', '.join(failed)}")
+    return changed
@@ -0,0 +1,80 @@
+"""
+Minimal in-process HTTP client for driving the ASGI app from benchmarks.
+
+Requests go straight into the application callable (middleware, routing,
+dependencies and the database included) without a socket or server in
+between, so the numbers measure the app rather than the network stack.
+"""
+import asyncio
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+from app.core.serialization import dumps
+
+
+class ASGIClient:
+    def __init__(self, app, default_headers: Optional[Dict[str, str]] = None):
+        self.app = app
+        self.default_headers = {"accept-encoding": "gzip, br", **(default_headers or {})}
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json=None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, bytes]:
+        body = dumps(json) if json is not None else b""
+        merged = {**self.default_headers, **(headers or {})}
+        if json is not None:
+            merged["content-type"] = "application/json"
+        merged["content-length"] = str(len(body))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}, doseq=True).encode(),
+            "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in merged.items()],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+        status = 0
+        chunks = []
+        done = asyncio.Event()
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Only reached by apps that watch for disconnects while streaming
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    done.set()
+
+        await self.app(scope, receive, send)
+        done.set()
+        return status, b"".join(chunks)
+
+    async def get(self, path: str, **kwargs) -> Tuple[int, bytes]:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> Tuple[int, bytes]:
+        return await self.request("POST", path, **kwargs)
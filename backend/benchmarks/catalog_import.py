@@ -0,0 +1,99 @@
+"""
+Throughput benchmark for the bulk catalog import.
+
+Generates N synthetic CSV rows on the fly (nothing is written to disk or held
+in memory), imports them into DATABASE_URL with CatalogImportService and
+reports rows per second and the process's peak RSS, which should stay flat as
+--rows grows since only one chunk is in memory at a time.
+
+Benchmark products use the SKU prefix BENCH- and are deleted afterwards
+unless --keep is given. Run it against a scratch database.
+
+Usage:
+    cd backend
+    python -m benchmarks.catalog_import [--rows 1000000] [--chunk-size 5000] [--category-id 1] [--keep]
+"""
+import argparse
+import asyncio
+import os
+import resource
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.core.config import settings
+from app.services.catalog_import_service import CatalogImportService
+
+HEADER = "sku,name,description,category_id,brand,mrp,selling_price,discount_percent,age_min_months,age_max_months,gender,size,color,stock,image_urls\n"
+BRANDS = ["BabyHug", "Babyoye", "Hola Bonita", "Kookie Kids", "Carter's"]
+
+
+def generate_rows(n: int, category_id: int):
+    """CSV lines for n products, produced lazily"""
+    yield HEADER
+    for i in range(n):
+        mrp = 299 + (i % 50) * 20
+        age_min = (i % 8) * 12
+        yield (
+            f"BENCH-{i:08d},Cotton Romper {i},Soft cotton romper,{category_id},{BRANDS[i % len(BRANDS)]},"
+            f"{mrp}.00,{mrp - (i % 5) * 10}.00,{(i % 5) * 3},{age_min},{age_min + 24},"
+            f"{'boy' if i % 2 else 'girl'},{i % 6 + 1}Y,blue,{i % 200},"
+            f"https://cdn.example.com/p/{i}/front.jpg|https://cdn.example.com/p/{i}/back.jpg\n"
+        )
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def cleanup():
+    async with engine.begin() as conn:
+        bench = "SELECT id FROM products WHERE sku LIKE 'BENCH-%'"
+        await conn.execute(text(f"DELETE FROM product_images WHERE product_id IN ({bench})"))
+        await conn.execute(text(f"DELETE FROM inventory WHERE product_id IN ({bench})"))
+        await conn.execute(text("DELETE FROM products WHERE sku LIKE 'BENCH-%'"))
+
+
+async def main(args) -> int:
+    category_id = args.category_id
+    if category_id is None:
+        async with engine.connect() as conn:
+            category_id = (await conn.execute(text("SELECT MIN(id) FROM categories"))).scalar()
+        if category_id is None:
+            print("No categories found; create one or pass --category-id")
+            return 1
+
+    rss_before = peak_rss_mb()
+    service = CatalogImportService(chunk_size=args.chunk_size)
+    try:
+        report = await service.import_stream(generate_rows(args.rows, category_id), "csv")
+    finally:
+        if not args.keep:
+            await cleanup()
+        await engine.dispose()
+
+    rate = report.rows_read / report.duration_seconds if report.duration_seconds else 0
+    print(f"rows            {report.rows_read:>12,}")
+    print(f"chunks          {report.chunks:>12,}  ({args.chunk_size} rows each)")
+    print(f"inserted        {report.products_inserted:>12,}")
+    print(f"updated         {report.products_updated:>12,}")
+    print(f"images          {report.images_loaded:>12,}")
+    print(f"rejected        {report.rows_rejected:>12,}")
+    print(f"duration        {report.duration_seconds:>12,.1f} s")
+    print(f"throughput      {rate:>12,.0f} rows/s")
+    print(f"peak RSS        {peak_rss_mb():>12,.1f} MB  (before import {rss_before:,.1f} MB)")
+    return 1 if report.rows_rejected else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    parser.add_argument("--category-id", type=int)
+    parser.add_argument("--keep", action="store_true", help="keep the BENCH- products")
+    sys.exit(asyncio.run(main(parser.parse_args())))
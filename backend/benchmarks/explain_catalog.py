@@ -0,0 +1,100 @@
+"""
+EXPLAIN regression check for catalog listing queries.
+
+Builds the exact statements ProductRepository.get_all issues for each filter
+combination, runs EXPLAIN (FORMAT JSON) against DATABASE_URL and asserts the
+expected product_cards index appears in the plan. Sequential scans are
+disabled for the check so small development databases still prove the index
+is usable; run it after migrations that touch product_cards or its queries.
+
+Usage:
+    cd backend
+    python -m benchmarks.explain_catalog
+"""
+import asyncio
+import json
+import os
+import sys
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import engine
+from app.repositories.product_repository import ProductRepository
+
+# (label, get_all kwargs, index expected in the listing plan)
+CASES = [
+    ("newest", {}, "ix_product_cards_active_created"),
+    ("category + newest", {"category_id": 1}, "ix_product_cards_category_created"),
+    ("category + price asc", {"category_id": 1, "sort": "price_asc"}, "ix_product_cards_category_price"),
+    ("category + price desc", {"category_id": 1, "sort": "price_desc"}, "ix_product_cards_category_price"),
+    ("category + rating", {"category_id": 1, "sort": "rating"}, "ix_product_cards_category_rating"),
+    ("category + popularity", {"category_id": 1, "sort": "popularity"}, "ix_product_cards_category_popularity"),
+    ("category + price range", {"category_id": 1, "min_price": Decimal("200"), "max_price": Decimal("900")},
+     "ix_product_cards_category_"),
+    ("price range", {"min_price": Decimal("200"), "max_price": Decimal("900"), "sort": "price_asc"},
+     "ix_product_cards_price"),
+    ("rating", {"sort": "rating"}, "ix_product_cards_rating"),
+    ("popularity", {"sort": "popularity"}, "ix_product_cards_popularity"),
+    ("gender + newest", {"gender": "girl"}, "ix_product_cards_gender_created"),
+    ("age window", {"age_months": 18}, "ix_product_cards_age_range"),
+]
+
+
+class _CapturingSession:
+    """Stands in for AsyncSession and records the statements get_all builds"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return _EmptyResult()
+
+
+class _EmptyResult:
+    def scalar(self):
+        return 0
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+def _index_names(plan: dict) -> set:
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+async def main() -> int:
+    failures = 0
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        for label, kwargs, expected in CASES:
+            session = _CapturingSession()
+            # The uncoalesced body, which runs on the given session
+            await ProductRepository(session)._get_all(**kwargs)
+            list_stmt = session.statements[-1]
+            sql = list_stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            used = _index_names(plan[0]["Plan"])
+            ok = any(name.startswith(expected) for name in used)
+            failures += not ok
+            print(f"{'PASS' if ok else 'FAIL'}  {label:<24} expected {expected}, used {sorted(used) or 'no index'}")
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,70 @@
+"""
+EXPLAIN regression check for order history queries.
+
+Builds the statements OrderRepository.get_user_orders issues (count and page)
+with and without a status filter, plus the admin finance export, runs EXPLAIN
+(FORMAT JSON) against DATABASE_URL and asserts the expected orders index
+appears in each plan. Like explain_catalog, sequential scans are disabled for
+the check; run it after migrations that touch orders or its queries.
+
+Usage:
+    cd backend
+    python -m benchmarks.explain_orders
+"""
+import asyncio
+import json
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import engine
+from app.repositories.order_repository import OrderRepository
+from app.services.export_service import build_orders_export_query
+from benchmarks.explain_catalog import _CapturingSession, _index_names
+
+
+async def _user_orders(**kwargs):
+    """The [count, page] statements get_user_orders builds"""
+    session = _CapturingSession()
+    await OrderRepository(session).get_user_orders(1, **kwargs)
+    return session.statements
+
+
+async def _export():
+    return [build_orders_export_query(date(2025, 1, 1), date(2025, 1, 31))]
+
+
+# (label, statement builder, index expected in the plan of each statement)
+CASES = [
+    ("user orders", lambda: _user_orders(), "ix_orders_user_id_created_at"),
+    ("user orders + status", lambda: _user_orders(status="DELIVERED"), "ix_orders_user_id_status_created_at"),
+    ("export date range", _export, "ix_orders_created_at_brin"),
+]
+
+
+async def main() -> int:
+    failures = 0
+    async with engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        for label, build, expected in CASES:
+            for i, stmt in enumerate(await build()):
+                sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+                result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                plan = result.scalar()
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                used = _index_names(plan[0]["Plan"])
+                ok = expected in used
+                failures += not ok
+                name = f"{label} [{i}]"
+                print(f"{'PASS' if ok else 'FAIL'}  {name:<28} expected {expected}, used {sorted(used) or 'no index'}")
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
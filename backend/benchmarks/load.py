@@ -0,0 +1,378 @@
+"""
+Load benchmark for the API's critical paths.
+
+Drives scripted scenarios against the ASGI app in-process (full middleware,
+routing, auth and database path; no socket) with N concurrent workers and
+reports throughput and p50/p95/p99 latency per scenario and per endpoint:
+
+- browse: category listing pages, product detail, facets
+- search: free-text listing search
+- add_to_cart: add an in-stock product to a customer's cart, view the cart
+- checkout: add to cart, place the order, initiate payment
+- webhook_storm: gateway callbacks for pending payments, each delivered
+  several times concurrently the way gateways retry
+
+Needs a database seeded with `python -m benchmarks.seed`; checkout and
+webhook_storm write to it. The app's lifespan (outbox dispatcher) is not
+started, so only request handling is measured.
+
+Results can be saved as a baseline and later runs compared against it; a
+scenario or endpoint whose p95 grows, or whose throughput drops, by more
+than --tolerance is reported as a regression and the exit status is 1.
+
+Usage:
+    cd backend
+    python -m benchmarks.load [--scenarios browse,search] [--concurrency 20] [--duration 30]
+    python -m benchmarks.load --save-baseline        # store results as the baseline
+    python -m benchmarks.load --output run.json      # compare with the baseline, keep the results
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.security import create_access_token
+from app.main import app
+from app.schemas.product import ProductSort
+from benchmarks.asgi_client import ASGIClient
+
+API = settings.API_V1_STR
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "load.json")
+SEARCH_TERMS = ["romper", "cotton", "organic frock", "denim jacket", "fleece", "pyjama", "babyhug", "sweater"]
+SORTS = [s.value for s in ProductSort]
+IDENTITY = {"accept-encoding": "identity"}
+
+
+class ScenarioExhausted(Exception):
+    """The scenario has no more work (e.g. every pending payment was delivered)"""
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+
+    def add(self, label: str, seconds: float, status: int, ok: bool):
+        self.latencies[label].append(seconds)
+        self.statuses[label][status] += 1
+        if not ok:
+            self.errors[label] += 1
+
+
+class Session:
+    """One worker's view of the app; times and records every request"""
+
+    def __init__(self, client: ASGIClient, recorder: Recorder, worker: int, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.worker = worker
+        self.rng = rng
+
+    async def call(self, label: str, method: str, path: str, ok=(200,), **kwargs):
+        started = time.perf_counter()
+        status, body = await self.client.request(method, API + path, **kwargs)
+        self.recorder.add(label, time.perf_counter() - started, status, status in ok)
+        return status, body
+
+
+class LoadContext:
+    def __init__(self, customers, product_ids, category_ids, pending_payments, concurrency: int):
+        self.customers = customers  # [(user_id, address_id, auth headers)]
+        self.product_ids = product_ids
+        self.category_ids = category_ids
+        self.pending_payments = pending_payments
+        # Checkout mutates the customer's cart, so workers never share a customer
+        self.customers_by_worker = [customers[i::concurrency] for i in range(concurrency)]
+
+    @classmethod
+    async def load(cls, concurrency: int, max_customers: int) -> "LoadContext":
+        async with engine.connect() as conn:
+            customers = (await conn.execute(text("""
+                SELECT u.id, a.id FROM users u
+                JOIN addresses a ON a.user_id = u.id AND a.is_default
+                WHERE u.email LIKE '%@load.bench'
+                ORDER BY u.id LIMIT :n
+            """), {"n": max_customers})).all()
+            product_ids = (await conn.execute(text("""
+                SELECT product_id FROM product_cards
+                WHERE sku LIKE 'LOAD-%' AND is_active AND stock_available > 0
+            """))).scalars().all()
+            category_ids = (await conn.execute(text(
+                "SELECT id FROM categories WHERE slug LIKE 'load-cat-%'"
+            ))).scalars().all()
+            pending = (await conn.execute(text("""
+                SELECT order_id, transaction_id, amount, payment_method::text FROM payments
+                WHERE status = 'PENDING' AND transaction_id LIKE 'LOADTXN%'
+                ORDER BY order_id
+            """))).all()
+
+        tokens = [
+            (user_id, address_id, {"authorization": "Bearer " + create_access_token(
+                {"sub": str(user_id), "role": "CUSTOMER"}, expires_delta=timedelta(hours=4)
+            )})
+            for user_id, address_id in customers
+        ]
+        return cls(tokens, list(product_ids), list(category_ids), list(pending), concurrency)
+
+
+# ---------------------------------------------------------------------------
+# Scenarios: one iteration each
+# ---------------------------------------------------------------------------
+
+async def browse(s: Session, ctx: LoadContext):
+    category_id = s.rng.choice(ctx.category_ids)
+    await s.call("GET /products?category_id", "GET", "/products", params={
+        "category_id": category_id, "page": s.rng.randint(1, 5), "sort": s.rng.choice(SORTS)
+    })
+    await s.call("GET /products/{id}", "GET", f"/products/{s.rng.choice(ctx.product_ids)}")
+    if s.rng.random() < 0.25:
+        await s.call("GET /products/facets", "GET", "/products/facets", params={"category_id": category_id})
+
+
+async def search(s: Session, ctx: LoadContext):
+    params = {"search": s.rng.choice(SEARCH_TERMS), "page": s.rng.randint(1, 3)}
+    if s.rng.random() < 0.3:
+        params["sort"] = s.rng.choice(SORTS)
+    await s.call("GET /products?search", "GET", "/products", params=params)
+
+
+async def add_to_cart(s: Session, ctx: LoadContext):
+    _, _, auth = s.rng.choice(ctx.customers_by_worker[s.worker])
+    await s.call("POST /cart/items", "POST", "/cart/items", headers=auth, json={
+        "product_id": s.rng.choice(ctx.product_ids), "quantity": 1
+    })
+    await s.call("GET /cart", "GET", "/cart", headers=auth)
+
+
+async def checkout(s: Session, ctx: LoadContext):
+    _, address_id, auth = s.rng.choice(ctx.customers_by_worker[s.worker])
+    await s.call("POST /cart/items", "POST", "/cart/items", headers=auth, json={
+        "product_id": s.rng.choice(ctx.product_ids), "quantity": 1
+    })
+    status, body = await s.call("POST /orders", "POST", "/orders", headers={**auth, **IDENTITY}, json={
+        "address_id": address_id
+    })
+    if status != 200:
+        return
+    order_id = json.loads(body)["data"]["order_id"]
+    await s.call("POST /payments/initiate", "POST", "/payments/initiate", headers=auth, json={
+        "order_id": order_id, "payment_method": "UPI", "upi_id": "load@upi"
+    })
+
+
+async def webhook_storm(s: Session, ctx: LoadContext, duplicates: int = 3):
+    if not ctx.pending_payments:
+        raise ScenarioExhausted()
+    order_id, transaction_id, amount, method = ctx.pending_payments.pop()
+    failed = order_id % 10 == 0
+    payload = {
+        "event": "payment.failed" if failed else "payment.captured",
+        "order_id": order_id,
+        "transaction_id": transaction_id,
+        "status": "FAILED" if failed else "SUCCESS",
+        "amount": str(amount),
+        "payment_method": method,
+        "gateway_response": {"id": f"pay_{transaction_id}", "bench": True},
+        "signature": "bench",
+    }
+    await asyncio.gather(*[
+        s.call("POST /payments/webhook", "POST", "/payments/webhook", json=payload)
+        for _ in range(duplicates)
+    ])
+
+
+SCENARIOS = {
+    "browse": browse,
+    "search": search,
+    "add_to_cart": add_to_cart,
+    "checkout": checkout,
+    "webhook_storm": webhook_storm,
+}
+
+
+# ---------------------------------------------------------------------------
+# Runner and reporting
+# ---------------------------------------------------------------------------
+
+async def run_scenario(name: str, ctx: LoadContext, concurrency: int, duration: float, warmup: float, seed: int) -> dict:
+    scenario = SCENARIOS[name]
+    client = ASGIClient(app)
+
+    async def worker(index: int, recorder: Recorder, until: float):
+        session = Session(client, recorder, index, random.Random(seed * 1000 + index))
+        while time.perf_counter() < until:
+            try:
+                await scenario(session, ctx)
+            except ScenarioExhausted:
+                return
+            except Exception as e:
+                recorder.errors[f"{type(e).__name__}"] += 1
+
+    if warmup and name != "webhook_storm":
+        until = time.perf_counter() + warmup
+        await asyncio.gather(*[worker(i, Recorder(), until) for i in range(concurrency)])
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(i, recorder, started + duration) for i in range(concurrency)])
+    return summarize(recorder, time.perf_counter() - started)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _stats(latencies: List[float], errors: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+    }
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    all_latencies = [v for values in recorder.latencies.values() for v in values]
+    result = _stats(all_latencies, sum(recorder.errors.values()), elapsed)
+    result["elapsed_s"] = round(elapsed, 2)
+    result["endpoints"] = {
+        label: {**_stats(values, recorder.errors[label], elapsed), "statuses": dict(recorder.statuses[label])}
+        for label, values in sorted(recorder.latencies.items())
+    }
+    exceptions = {k: v for k, v in recorder.errors.items() if k not in recorder.latencies}
+    if exceptions:
+        result["exceptions"] = exceptions
+    return result
+
+
+def print_results(results: dict):
+    print(f"{'scenario / endpoint':<36}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in results["scenarios"].items():
+        rows = [(name, r)] + [("  " + label, e) for label, e in r["endpoints"].items()]
+        for label, s in rows:
+            print(
+                f"{label:<36}{s['requests']:>10,}{s['errors']:>8,}{s['rps']:>10,.1f}"
+                f"{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}"
+            )
+        if r.get("exceptions"):
+            print(f"  exceptions: {r['exceptions']}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Print p95/throughput deltas against the baseline; returns the regressions"""
+    regressions = []
+    print(f"\n{'vs baseline':<36}{'p95 ms':>18}{'Δ':>9}{'req/s':>20}{'Δ':>9}")
+    for name, r in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            print(f"{name:<36}  (not in baseline)")
+            continue
+        rows = [(name, r, base)] + [
+            ("  " + label, e, base["endpoints"][label])
+            for label, e in r["endpoints"].items() if label in base.get("endpoints", {})
+        ]
+        for label, cur, old in rows:
+            p95_delta = (cur["p95_ms"] / old["p95_ms"] - 1) if old["p95_ms"] else 0.0
+            rps_delta = (cur["rps"] / old["rps"] - 1) if old["rps"] else 0.0
+            flag = ""
+            if p95_delta > tolerance or rps_delta < -tolerance:
+                flag = "  REGRESSION"
+                regressions.append(label.strip() if label.startswith("  ") else name)
+            print(
+                f"{label:<36}{old['p95_ms']:>8.2f} → {cur['p95_ms']:<7.2f}{p95_delta:>+9.0%}"
+                f"{old['rps']:>9,.1f} → {cur['rps']:<8,.1f}{rps_delta:>+9.0%}{flag}"
+            )
+    return regressions
+
+
+async def main(args) -> int:
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+        return 2
+
+    try:
+        ctx = await LoadContext.load(args.concurrency, args.customers)
+        if not ctx.customers or not ctx.product_ids or not ctx.category_ids:
+            print("No seeded data found; run `python -m benchmarks.seed` first")
+            return 1
+        if len(ctx.customers) < args.concurrency:
+            print(f"Need at least {args.concurrency} seeded customers for --concurrency {args.concurrency}")
+            return 1
+
+        results = {
+            "meta": {
+                "concurrency": args.concurrency, "duration_s": args.duration, "seed": args.seed,
+                "products": len(ctx.product_ids), "customers": len(ctx.customers),
+                "pending_payments": len(ctx.pending_payments),
+            },
+            "scenarios": {},
+        }
+        for name in names:
+            print(f"Running {name} ({args.concurrency} workers, {args.duration:g} s)...")
+            results["scenarios"][name] = await run_scenario(
+                name, ctx, args.concurrency, args.duration, args.warmup, args.seed
+            )
+    finally:
+        await engine.dispose()
+
+    print()
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond ±{args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated, run in order")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unrecorded seconds before each scenario")
+    parser.add_argument("--customers", type=int, default=2000, help="seeded customers to act as")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for request mixes")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed p95/throughput change")
+    parser.add_argument("--output", help="also write this run's results as JSON")
+    sys.exit(asyncio.run(main(parser.parse_args())))
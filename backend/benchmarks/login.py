@@ -0,0 +1,129 @@
+"""
+Login throughput benchmark for POST /auth/verify-otp.
+
+Plants one valid OTP per synthetic phone number directly in the database
+(bypassing send-otp), then logs every phone in exactly once through the ASGI
+app with N concurrent workers. Reports logins per second, p50/p95/p99 latency,
+and the SQL statements and commits issued per login, counted on the engine.
+
+--returning seeds the users first, so every login takes the existing-user
+branch of the upsert; the default measures first-time sign-ups (user and cart
+created). Benchmark phones start with +9169 and are removed afterwards unless
+--keep is given. Run it against a scratch database.
+
+Usage:
+    cd backend
+    python -m benchmarks.login [--logins 5000] [--concurrency 50] [--returning] [--keep]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.main import app
+from benchmarks.asgi_client import ASGIClient
+from benchmarks.load import percentile
+
+OTP = "246810"
+PHONES = "phone LIKE '+9169%'"
+BENCH_USERS = f"SELECT id FROM users WHERE {PHONES}"
+
+
+def phone(i: int) -> str:
+    return f"+9169{i:08d}"
+
+
+async def cleanup():
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DELETE FROM refresh_tokens WHERE user_id IN ({BENCH_USERS})"))
+        await conn.execute(text(f"DELETE FROM carts WHERE user_id IN ({BENCH_USERS})"))
+        await conn.execute(text(f"DELETE FROM users WHERE {PHONES}"))
+        await conn.execute(text(f"DELETE FROM otp_verifications WHERE {PHONES}"))
+
+
+async def prepare(n: int, returning: bool):
+    async with engine.begin() as conn:
+        if returning:
+            await conn.execute(text("""
+                INSERT INTO users (phone, role, is_expecting, is_active, is_verified)
+                SELECT '+9169' || lpad(g::text, 8, '0'), 'CUSTOMER', FALSE, TRUE, TRUE
+                FROM generate_series(0, :n - 1) g
+            """), {"n": n})
+            await conn.execute(text(f"INSERT INTO carts (user_id) {BENCH_USERS}"))
+        await conn.execute(text("""
+            INSERT INTO otp_verifications (phone, otp, expires_at, retry_count, is_used, is_verified)
+            SELECT '+9169' || lpad(g::text, 8, '0'), :otp, NOW() + interval '30 minutes', 0, FALSE, FALSE
+            FROM generate_series(0, :n - 1) g
+        """), {"n": n, "otp": OTP})
+
+
+async def run(n: int, concurrency: int):
+    client = ASGIClient(app)
+    pending = list(range(n))
+    latencies, failures = [], 0
+
+    async def worker():
+        nonlocal failures
+        while pending:
+            i = pending.pop()
+            started = time.perf_counter()
+            status, _ = await client.post(
+                f"{settings.API_V1_STR}/auth/verify-otp", json={"phone": phone(i), "otp": OTP}
+            )
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return sorted(latencies), failures, time.perf_counter() - started
+
+
+async def main(args) -> int:
+    counts = {"statements": 0, "commits": 0}
+
+    def on_execute(*_):
+        counts["statements"] += 1
+
+    def on_commit(*_):
+        counts["commits"] += 1
+
+    try:
+        await cleanup()
+        await prepare(args.logins, args.returning)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+        event.listen(engine.sync_engine, "commit", on_commit)
+        latencies, failures, elapsed = await run(args.logins, args.concurrency)
+        event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
+        event.remove(engine.sync_engine, "commit", on_commit)
+    finally:
+        if not args.keep:
+            await cleanup()
+        await engine.dispose()
+
+    kind = "returning users" if args.returning else "new users"
+    print(f"logins          {len(latencies):>10,}  ({kind}, {args.concurrency} concurrent)")
+    print(f"failed          {failures:>10,}")
+    print(f"throughput      {len(latencies) / elapsed:>10,.0f} logins/s")
+    for p in (50, 95, 99):
+        print(f"p{p:<14}{percentile(latencies, p) * 1000:>10.2f} ms")
+    print(f"statements      {counts['statements'] / max(1, len(latencies)):>10.2f} per login")
+    print(f"commits         {counts['commits'] / max(1, len(latencies)):>10.2f} per login")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--returning", action="store_true", help="log in existing users instead of new sign-ups")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark users and tokens")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,275 @@
+"""
+Seed a scratch database with a realistic data set for the load benchmarks.
+
+Everything is generated server-side with generate_series, so seeding the full
+default set (100k products with two images and stock each, 5k customers with
+addresses and carts, 20k historical orders with items and payments) takes
+seconds rather than minutes. Card triggers are skipped for the load and the
+product cards are refreshed once at the end.
+
+Seeded rows are tagged so they can be removed again with --reset:
+categories `load-*`, products `LOAD-*`, users `*@load.bench` (and everything
+hanging off them, including orders placed by the checkout scenario).
+
+The last --pending-payments orders are left PENDING with a PENDING payment;
+they are the targets of the webhook_storm scenario. Re-seed (or --reset and
+seed) to get a fresh set after a storm.
+
+Usage:
+    cd backend
+    python -m benchmarks.seed [--products 100000] [--users 5000] [--orders 20000] [--pending-payments 2000]
+    python -m benchmarks.seed --reset
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.services.partition_service import ensure_partitions
+
+CATEGORY_COUNT = 24
+
+LOAD_USERS = "SELECT id FROM users WHERE email LIKE '%@load.bench'"
+LOAD_PRODUCTS = "SELECT id FROM products WHERE sku LIKE 'LOAD-%'"
+LOAD_ORDERS = f"SELECT id FROM orders WHERE user_id IN ({LOAD_USERS})"
+LOAD_CARTS = f"SELECT id FROM carts WHERE user_id IN ({LOAD_USERS})"
+
+RESET_SQL = [
+    f"DELETE FROM refunds WHERE order_id IN ({LOAD_ORDERS})",
+    f"DELETE FROM payment_attempts WHERE payment_id IN (SELECT id FROM payments WHERE order_id IN ({LOAD_ORDERS}))",
+    f"DELETE FROM payments WHERE order_id IN ({LOAD_ORDERS})",
+    f"DELETE FROM coupon_usage WHERE order_id IN ({LOAD_ORDERS})",
+    f"DELETE FROM inventory_locks WHERE order_id IN ({LOAD_ORDERS}) OR cart_id IN ({LOAD_CARTS}) OR product_id IN ({LOAD_PRODUCTS})",
+    f"DELETE FROM order_items WHERE order_id IN ({LOAD_ORDERS})",
+    f"DELETE FROM orders WHERE id IN ({LOAD_ORDERS})",
+    f"DELETE FROM cart_items WHERE cart_id IN ({LOAD_CARTS}) OR product_id IN ({LOAD_PRODUCTS})",
+    f"DELETE FROM carts WHERE id IN ({LOAD_CARTS})",
+    f"DELETE FROM wishlists WHERE user_id IN ({LOAD_USERS}) OR product_id IN ({LOAD_PRODUCTS})",
+    f"DELETE FROM addresses WHERE user_id IN ({LOAD_USERS})",
+    f"DELETE FROM refresh_tokens WHERE user_id IN ({LOAD_USERS})",
+    "DELETE FROM users WHERE email LIKE '%@load.bench'",
+    f"DELETE FROM product_images WHERE product_id IN ({LOAD_PRODUCTS})",
+    f"DELETE FROM inventory WHERE product_id IN ({LOAD_PRODUCTS})",
+    "DELETE FROM products WHERE sku LIKE 'LOAD-%'",
+    "DELETE FROM categories WHERE slug LIKE 'load-cat-%'",
+    "DELETE FROM categories WHERE slug = 'load-root'",
+]
+
+CATALOG_SQL = [
+    ("categories", """
+    INSERT INTO categories (name, slug, parent_id, is_active, display_order)
+    VALUES ('Load Test', 'load-root', NULL, TRUE, 999)
+    """),
+    ("categories", """
+    INSERT INTO categories (name, slug, parent_id, is_active, display_order)
+    SELECT 'Load Category ' || g, 'load-cat-' || g, (SELECT id FROM categories WHERE slug = 'load-root'), TRUE, g
+    FROM generate_series(1, :categories) g
+    """),
+    # Names combine a material, a garment and the row number so that search
+    # terms hit a realistic fraction of the catalog
+    ("products", """
+    WITH cats AS (SELECT array_agg(id ORDER BY id) AS ids FROM categories WHERE slug LIKE 'load-cat-%'),
+    src AS (
+        SELECT g, 299 + (g % 60) * 25 AS mrp, (g % 8) * 12 AS age_min
+        FROM generate_series(1, :products) g
+    )
+    INSERT INTO products (
+        sku, name, description, category_id, brand, mrp, selling_price, discount_percent,
+        age_min_months, age_max_months, gender, size, color, weight_grams,
+        is_active, is_featured, rating_avg, rating_count, order_count, created_at
+    )
+    SELECT
+        'LOAD-' || lpad(g::text, 8, '0'),
+        (ARRAY['Cotton', 'Organic', 'Printed', 'Striped', 'Knitted', 'Denim', 'Fleece', 'Linen'])[1 + g % 8]
+            || ' ' || (ARRAY['Romper', 'Onesie', 'Frock', 'T-Shirt', 'Shorts', 'Jacket', 'Pyjama Set',
+                             'Dungaree', 'Sweater', 'Bodysuit', 'Leggings', 'Cap'])[1 + (g / 8) % 12]
+            || ' ' || g,
+        'Soft, breathable everyday wear for babies and kids',
+        cats.ids[1 + g % array_length(cats.ids, 1)],
+        (ARRAY['BabyHug', 'Babyoye', 'Hola Bonita', 'Kookie Kids', 'Carter''s', 'Pine Kids'])[1 + g % 6],
+        mrp,
+        mrp - (g % 5) * 20,
+        round(((g % 5) * 20)::numeric * 100 / mrp, 2),
+        age_min, age_min + 24,
+        (ARRAY['boy', 'girl', 'unisex'])[1 + g % 3],
+        (g % 6 + 1) || 'Y',
+        (ARRAY['blue', 'pink', 'white', 'yellow', 'green', 'grey'])[1 + g % 6],
+        150 + g % 400,
+        g % 50 <> 0,
+        g % 97 = 0,
+        round(((g % 41) / 10.0)::numeric + 1, 1),
+        g % 300,
+        0,
+        NOW() - (g || ' minutes')::interval
+    FROM src, cats
+    """),
+    ("product_images", f"""
+    INSERT INTO product_images (product_id, image_url, angle, display_order, is_primary)
+    SELECT id, 'https://cdn.example.com/load/' || id || '/' || angle || '.jpg', angle, n, n = 0
+    FROM ({LOAD_PRODUCTS}) p
+    CROSS JOIN (VALUES (0, 'front'), (1, 'back')) AS a(n, angle)
+    """),
+    ("inventory", f"""
+    INSERT INTO inventory (product_id, quantity_available, quantity_reserved, low_stock_threshold, reorder_point)
+    SELECT id, CASE WHEN id % 40 = 0 THEN 0 ELSE 100 + id % 900 END, 0, 10, 20
+    FROM ({LOAD_PRODUCTS}) p
+    """),
+]
+
+CUSTOMER_SQL = [
+    ("users", """
+    INSERT INTO users (phone, email, name, role, is_expecting, is_active, is_verified)
+    SELECT '+917' || lpad(g::text, 9, '0'), 'load' || g || '@load.bench', 'Load User ' || g,
+           'CUSTOMER', g % 10 = 0, TRUE, TRUE
+    FROM generate_series(1, :users) g
+    """),
+    ("addresses", f"""
+    INSERT INTO addresses (
+        user_id, address_type, recipient_name, phone, address_line1, city, state, pincode,
+        country, is_default, is_active
+    )
+    SELECT u.id, 'HOME', u.name, u.phone, (u.id % 400 + 1) || ', MG Road',
+           (ARRAY['Bengaluru', 'Mumbai', 'Delhi', 'Chennai', 'Pune', 'Hyderabad'])[1 + u.id % 6],
+           'Karnataka', lpad((560001 + u.id % 90)::text, 6, '0'), 'India', TRUE, TRUE
+    FROM users u WHERE u.id IN ({LOAD_USERS})
+    """),
+    ("carts", f"INSERT INTO carts (user_id) SELECT id FROM ({LOAD_USERS}) u"),
+    # Two in three customers have one to three items sitting in their cart
+    ("cart_items", f"""
+    WITH prods AS (SELECT array_agg(id ORDER BY id) AS ids FROM ({LOAD_PRODUCTS}) p)
+    INSERT INTO cart_items (cart_id, product_id, quantity, price_at_add)
+    SELECT c.id, pr.id, 1 + n % 2, pr.selling_price
+    FROM carts c
+    CROSS JOIN generate_series(0, 2) n
+    CROSS JOIN prods
+    JOIN products pr ON pr.id = prods.ids[1 + (c.id * 7919 + n * 104729) % array_length(prods.ids, 1)]
+    WHERE c.id IN ({LOAD_CARTS}) AND c.id % 3 <> 0 AND n <= c.id % 3
+    """),
+]
+
+ORDER_SQL = [
+    ("orders", f"""
+    WITH custs AS (
+        SELECT array_agg(a.user_id ORDER BY a.user_id) AS users, array_agg(a.id ORDER BY a.user_id) AS addrs
+        FROM addresses a WHERE a.user_id IN ({LOAD_USERS})
+    )
+    INSERT INTO orders (
+        order_number, user_id, address_id, subtotal, discount_amount, delivery_fee, platform_fee,
+        total_amount, status, payment_status, created_at, delivered_at, cancelled_at
+    )
+    SELECT
+        'LOAD-ORD-' || lpad(g::text, 8, '0'),
+        custs.users[1 + (g * 31) % array_length(custs.users, 1)],
+        custs.addrs[1 + (g * 31) % array_length(custs.users, 1)],
+        0, 0, 0, 0, 0,
+        CASE WHEN g > :orders - :pending THEN 'PENDING'
+             WHEN g % 20 = 0 THEN 'CANCELLED'
+             WHEN g % 7 = 0 THEN 'CONFIRMED'
+             ELSE 'DELIVERED' END::orderstatus,
+        CASE WHEN g > :orders - :pending THEN 'PENDING' ELSE 'SUCCESS' END,
+        NOW() - ((:orders - g) * 365.0 / :orders || ' days')::interval,
+        CASE WHEN g <= :orders - :pending AND g % 20 <> 0 AND g % 7 <> 0
+             THEN NOW() - ((:orders - g) * 365.0 / :orders - 3 || ' days')::interval END,
+        CASE WHEN g <= :orders - :pending AND g % 20 = 0
+             THEN NOW() - ((:orders - g) * 365.0 / :orders || ' days')::interval END
+    FROM generate_series(1, :orders) g, custs
+    """),
+    ("order_items", f"""
+    WITH prods AS (SELECT array_agg(id ORDER BY id) AS ids FROM ({LOAD_PRODUCTS}) p)
+    INSERT INTO order_items (
+        order_id, product_id, product_name, product_sku, product_image_url,
+        quantity, unit_price, discount_percent, total_price, created_at
+    )
+    SELECT o.id, pr.id, pr.name, pr.sku, 'https://cdn.example.com/load/' || pr.id || '/front.jpg',
+           1 + n % 2, pr.selling_price, pr.discount_percent, pr.selling_price * (1 + n % 2), o.created_at
+    FROM orders o
+    CROSS JOIN generate_series(0, 2) n
+    CROSS JOIN prods
+    JOIN products pr ON pr.id = prods.ids[1 + (o.id * 7907 + n * 6007) % array_length(prods.ids, 1)]
+    WHERE o.id IN ({LOAD_ORDERS}) AND n <= o.id % 3
+    """),
+    ("orders", f"""
+    UPDATE orders o
+    SET subtotal = t.subtotal,
+        delivery_fee = CASE WHEN t.subtotal >= 499 THEN 0 ELSE 49 END,
+        platform_fee = 9,
+        total_amount = t.subtotal + CASE WHEN t.subtotal >= 499 THEN 0 ELSE 49 END + 9
+    FROM (SELECT order_id, SUM(total_price) AS subtotal FROM order_items GROUP BY order_id) t
+    WHERE t.order_id = o.id AND o.id IN ({LOAD_ORDERS})
+    """),
+    ("payments", f"""
+    INSERT INTO payments (
+        order_id, payment_method, payment_provider, amount, currency, status,
+        transaction_id, attempts, created_at, completed_at
+    )
+    SELECT id,
+           (ARRAY['UPI', 'CARD', 'NET_BANKING', 'WALLET'])[1 + id % 4]::paymentmethod,
+           'razorpay', total_amount, 'INR',
+           CASE WHEN status = 'PENDING' THEN 'PENDING' ELSE 'SUCCESS' END::paymentstatus,
+           'LOADTXN' || lpad(id::text, 10, '0'), 1, created_at,
+           CASE WHEN status <> 'PENDING' THEN created_at + interval '2 minutes' END
+    FROM orders WHERE id IN ({LOAD_ORDERS})
+    """),
+    ("payment_attempts", f"""
+    INSERT INTO payment_attempts (payment_id, attempt_number, payment_method, status, created_at)
+    SELECT id, 1, payment_method, status, created_at
+    FROM payments WHERE order_id IN ({LOAD_ORDERS})
+    """),
+]
+
+
+async def reset(conn):
+    for sql in RESET_SQL:
+        await conn.execute(text(sql))
+
+
+async def main(args) -> int:
+    params = {
+        "categories": CATEGORY_COUNT, "products": args.products, "users": args.users,
+        "orders": args.orders, "pending": min(args.pending_payments, args.orders)
+    }
+    started = time.monotonic()
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("SET LOCAL app.bulk_load = 'on'"))
+            await reset(conn)
+            if args.reset:
+                print("Removed seeded benchmark data")
+                return 0
+
+            # Order history goes back a year; payment_attempts is partitioned
+            # by month and normally only has partitions from its migration on
+            await ensure_partitions(conn, "payment_attempts", datetime.now(timezone.utc) - timedelta(days=366))
+            for table, sql in CATALOG_SQL + CUSTOMER_SQL + ORDER_SQL:
+                step = time.monotonic()
+                result = await conn.execute(text(sql), params)
+                print(f"{table:<18}{result.rowcount:>10,} rows  {time.monotonic() - step:6.1f} s")
+
+            step = time.monotonic()
+            cards = (await conn.execute(
+                text(f"SELECT refresh_product_cards(ARRAY({LOAD_PRODUCTS}))")
+            )).scalar()
+            print(f"{'product_cards':<18}{cards:>10,} rows  {time.monotonic() - step:6.1f} s")
+            await conn.execute(text("ANALYZE"))
+    finally:
+        await engine.dispose()
+
+    print(f"Seeded in {time.monotonic() - started:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--pending-payments", type=int, default=2_000, help="PENDING orders for webhook_storm")
+    parser.add_argument("--reset", action="store_true", help="only remove previously seeded data")
+    sys.exit(asyncio.run(main(parser.parse_args())))
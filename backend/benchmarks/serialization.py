@@ -0,0 +1,152 @@
+"""
+Microbenchmark: per-item serialization cost for large list endpoints.
+
+Compares the previous path (validated Pydantic construction, a second
+validation against response_model, then stdlib json) with the fast path
+(plain dicts built from the ORM rows + orjson) for a 100-product page and a 50-order page.
+
+Usage:
+    cd backend
+    python -m benchmarks.serialization [--rounds 200]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the routes creates the (lazy) engine, no connection is made
+os.environ.setdefault("DATABASE_URL", "postgresql://bench@localhost/bench")
+
+from app.core.serialization import dumps
+from app.models.order import OrderStatus
+from app.routes.products import _card_to_response as product_fast
+from app.schemas.order import OrderResponse, OrderItemResponse, OrderListResponse
+from app.schemas.product import ProductCardResponse, ProductListResponse
+from app.services.order_service import OrderService
+
+NOW = datetime(2025, 12, 1, 10, 30, tzinfo=timezone.utc)
+
+
+def fake_products(n: int):
+    # product_cards rows, as read by the /products listing
+    return [
+        SimpleNamespace(
+            product_id=i, sku=f"SKU{i:06d}", name=f"Cotton Romper {i}",
+            category_id=i % 12 + 1, brand="BabyHug", mrp=Decimal("999.00"),
+            selling_price=Decimal("749.00"), discount_percent=Decimal("25.00"),
+            primary_image_url=f"https://cdn.example.com/p/{i}.jpg",
+            rating_avg=Decimal("4.3"), rating_count=120 + i,
+            is_featured=i % 5 == 0, stock_available=47,
+        )
+        for i in range(n)
+    ]
+
+
+def fake_orders(n: int, items_per_order: int = 3):
+    return [
+        SimpleNamespace(
+            id=i, order_number=f"JK20251201{i:06d}", user_id=1,
+            subtotal=Decimal("2247.00"), discount_amount=Decimal("100.00"),
+            delivery_fee=Decimal("0.00"), platform_fee=Decimal("5.00"),
+            total_amount=Decimal("2152.00"), status=OrderStatus.CONFIRMED,
+            payment_status="SUCCESS", estimated_delivery=NOW, shipped_at=None,
+            delivered_at=None, created_at=NOW, updated_at=NOW,
+            items=[
+                SimpleNamespace(
+                    id=i * 10 + j, product_id=j + 1, product_name=f"Product {j}",
+                    product_sku=f"SKU{j:06d}", product_image_url="https://cdn.example.com/p.jpg",
+                    quantity=1, unit_price=Decimal("749.00"),
+                    discount_percent=Decimal("25.00"), total_price=Decimal("749.00"),
+                )
+                for j in range(items_per_order)
+            ],
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_products(products) -> bytes:
+    responses = [
+        ProductCardResponse(
+            id=c.product_id, sku=c.sku, name=c.name, category_id=c.category_id,
+            brand=c.brand, mrp=c.mrp, selling_price=c.selling_price,
+            discount_percent=c.discount_percent, primary_image_url=c.primary_image_url,
+            rating_avg=c.rating_avg, rating_count=c.rating_count,
+            is_featured=c.is_featured, stock_available=c.stock_available
+        )
+        for c in products
+    ]
+    page = ProductListResponse(products=responses, total=1000, page=1, page_size=100, total_pages=10)
+    return _fastapi_default(ProductListResponse, page)
+
+
+def fast_products(products) -> bytes:
+    return dumps({
+        "products": [product_fast(p) for p in products],
+        "total": 1000, "page": 1, "page_size": 100, "total_pages": 10
+    })
+
+
+def legacy_orders(orders) -> bytes:
+    page = OrderListResponse(
+        orders=[
+            OrderResponse(
+                **{k: getattr(o, k) for k in OrderResponse.model_fields if k != "items"},
+                items=[OrderItemResponse.model_validate(it, from_attributes=True) for it in o.items],
+            )
+            for o in orders
+        ],
+        total=500, page=1, page_size=50
+    )
+    return _fastapi_default(OrderListResponse, page)
+
+
+def fast_orders(orders) -> bytes:
+    service = OrderService.__new__(OrderService)
+    return dumps({
+        "orders": [service._to_response(o) for o in orders],
+        "total": 500, "page": 1, "page_size": 50, "next_cursor": None
+    })
+
+
+def _fastapi_default(model, content) -> bytes:
+    # What FastAPI does with response_model: validate again, dump, json.dumps
+    validated = model.model_validate(content, from_attributes=True)
+    return json.dumps(validated.model_dump(mode="json"), ensure_ascii=False,
+                      allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _per_item_us(fn, arg, items: int, rounds: int) -> float:
+    best = min(timeit.repeat(lambda: fn(arg), number=rounds, repeat=5))
+    return best / rounds / items * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    products = fake_products(100)
+    orders = fake_orders(50)
+
+    # The fast path must produce the same document as the validated one
+    assert json.loads(legacy_products(products)) == json.loads(fast_products(products))
+    assert json.loads(legacy_orders(orders)) == json.loads(fast_orders(orders))
+
+    print(f"{'page':<16}{'legacy us/item':>16}{'fast us/item':>16}{'speedup':>10}")
+    for label, legacy, fast, data in (
+        ("100 products", legacy_products, fast_products, products),
+        ("50 orders", legacy_orders, fast_orders, orders),
+    ):
+        slow_us = _per_item_us(legacy, data, len(data), args.rounds)
+        fast_us = _per_item_us(fast, data, len(data), args.rounds)
+        print(f"{label:<16}{slow_us:>16.2f}{fast_us:>16.2f}{slow_us / fast_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Maintenance commands for the CloudKidd backend
+
+Usage:
+    python manage.py rebuild-product-cards
+    python manage.py import-catalog products.csv [--format csv|jsonl] [--chunk-size N]
+    python manage.py sync-inventory stock.csv [--dry-run]
+    python manage.py export-orders --from 2024-01-01 --to 2024-01-31 [--format csv|jsonl] [--output FILE]
+    python manage.py run-job expire_inventory_locks
+    python manage.py rebuild-analytics [--since 2024-01-01]
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import AsyncSessionLocal, engine
+
+
+async def rebuild_product_cards(args):
+    """Rebuild the product_cards listing projection from source tables"""
+    from app.repositories.product_repository import ProductRepository
+
+    async with AsyncSessionLocal() as db:
+        count = await ProductRepository(db).rebuild_cards()
+    print(f"Rebuilt product_cards: {count} rows")
+
+
+async def import_catalog(args):
+    """Bulk create or update products, images and stock from a CSV or JSONL file"""
+    from app.services.catalog_import_service import CatalogImportService
+
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+    service = CatalogImportService(chunk_size=args.chunk_size) if args.chunk_size else CatalogImportService()
+    with open(args.path, encoding="utf-8-sig", newline="") as stream:
+        report = await service.import_stream(stream, fmt)
+
+    print(
+        f"Imported {report.rows_read} rows in {report.duration_seconds}s: "
+        f"{report.products_inserted} inserted, {report.products_updated} updated, "
+        f"{report.images_loaded} images, {report.inventory_rows} stock rows, "
+        f"{report.rows_rejected} rejected"
+    )
+    for error in report.errors:
+        print(f"  row {error.row} ({error.sku or '-'}): {error.error}")
+
+
+async def sync_inventory(args):
+    """Apply a CSV stock feed (sku plus quantity or delta) in one transaction"""
+    import csv
+    from pydantic import ValidationError
+    from app.schemas.inventory import InventorySyncItem
+    from app.services.inventory_sync_service import InventorySyncService
+
+    items, invalid = [], 0
+    with open(args.path, encoding="utf-8-sig", newline="") as stream:
+        for row_no, row in enumerate(csv.DictReader(stream), start=1):
+            data = {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+            try:
+                items.append(InventorySyncItem.model_validate(data))
+            except ValidationError as e:
+                invalid += 1
+                print(f"  row {row_no}: {e.errors()[0]['msg']}")
+    if invalid:
+        raise ValueError(f"{invalid} invalid rows; nothing applied")
+
+    report = await InventorySyncService().sync(items, dry_run=args.dry_run)
+    print(
+        f"{'Checked' if report.dry_run else 'Synced'} {report.rows} rows in {report.duration_seconds}s: "
+        f"{report.updated} updated, {report.unchanged} unchanged, {report.conflicts_total} conflicts"
+    )
+    for conflict in report.conflicts:
+        print(
+            f"  row {conflict.row} ({conflict.sku}): {conflict.reason}"
+            f" [available={conflict.quantity_available}, reserved={conflict.quantity_reserved}]"
+        )
+
+
+async def export_orders(args):
+    """Export orders with their payment and refunds for a date range as CSV or JSONL"""
+    from app.services.export_service import stream_orders_export
+
+    if args.date_to < args.date_from:
+        raise ValueError("--to must not be before --from")
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async for chunk in stream_orders_export(args.date_from, args.date_to, args.format):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+        else:
+            output.flush()
+
+
+async def run_job(args):
+    """Run a scheduled maintenance job once now, unless another replica is running it"""
+    from app.core.scheduler import scheduler
+    from app.services import maintenance_service  # noqa: F401 (registers the jobs)
+
+    if args.name not in scheduler.jobs:
+        raise ValueError(f"Unknown job {args.name!r}; one of: {', '.join(sorted(scheduler.jobs))}")
+    status = await scheduler.run_job(args.name, force=True)
+    print(f"{args.name}: {status or 'skipped, running on another replica'}")
+
+
+async def rebuild_analytics(args):
+    """Recompute the sales rollups from payments, refunds and orders"""
+    from datetime import datetime, time, timezone
+    from app.services.analytics_service import rebuild_sales_rollups
+
+    since = datetime.combine(args.since or date(2000, 1, 1), time.min, tzinfo=timezone.utc)
+    rows = await rebuild_sales_rollups(since)
+    print(f"Rebuilt sales rollups since {since.date()}: {rows} rows")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="CloudKidd maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("rebuild-product-cards", help=rebuild_product_cards.__doc__)
+    cmd.set_defaults(handler=rebuild_product_cards)
+
+    cmd = commands.add_parser("import-catalog", help=import_catalog.__doc__)
+    cmd.add_argument("path")
+    cmd.add_argument("--format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    cmd.add_argument("--chunk-size", type=int)
+    cmd.set_defaults(handler=import_catalog)
+
+    cmd = commands.add_parser("sync-inventory", help=sync_inventory.__doc__)
+    cmd.add_argument("path")
+    cmd.add_argument("--dry-run", action="store_true", help="report conflicts without writing")
+    cmd.set_defaults(handler=sync_inventory)
+
+    cmd = commands.add_parser("export-orders", help=export_orders.__doc__)
+    cmd.add_argument("--from", dest="date_from", type=date.fromisoformat, required=True, help="first order date (UTC)")
+    cmd.add_argument("--to", dest="date_to", type=date.fromisoformat, required=True, help="last order date (UTC), inclusive")
+    cmd.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    cmd.add_argument("--output", help="defaults to stdout")
+    cmd.set_defaults(handler=export_orders)
+
+    cmd = commands.add_parser("run-job", help=run_job.__doc__)
+    cmd.add_argument("name")
+    cmd.set_defaults(handler=run_job)
+
+    cmd = commands.add_parser("rebuild-analytics", help=rebuild_analytics.__doc__)
+    cmd.add_argument("--since", type=date.fromisoformat, help="first day (UTC) to recompute; defaults to all history")
+    cmd.set_defaults(handler=rebuild_analytics)
+
+    return parser
+
+
+async def run(args):
+    try:
+        await args.handler(args)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        asyncio.run(run(args))
+    except Exception as e:
+        print(f"Command failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+CREATE OR REPLACE FUNCTION append_outbox_event(
+    p_aggregate_type VARCHAR(30),
+    p_aggregate_id INTEGER,
+    p_event_type VARCHAR(50),
+    p_payload JSONB
+)
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_event_id BIGINT;
+BEGIN
+    -- Runs inside the caller's transaction: the event exists iff the state change commits
+    INSERT INTO outbox (aggregate_type, aggregate_id, event_type, payload)
+    VALUES (p_aggregate_type, p_aggregate_id, p_event_type, COALESCE(p_payload, '{}'::JSONB))
+    RETURNING id INTO v_event_id;
+
+    -- Wakes the dispatchers instead of leaving the event to their next poll
+    PERFORM notify_invalidation('outbox', '');
+
+    RETURN v_event_id;
+END;
+$$;
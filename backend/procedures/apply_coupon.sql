@@ -66,7 +66,8 @@ BEGIN
     FROM coupon_usage
     WHERE coupon_id = v_coupon.id
       AND user_id = p_user_id
-      AND is_reversed = FALSE;
+      AND is_reversed = FALSE
+      AND used_at >= v_coupon.valid_from;
     
     IF v_user_usage_count >= v_coupon.usage_limit_per_user THEN
         p_error_message := 'You have already used this coupon the maximum number of times';
@@ -15,7 +15,7 @@ BEGIN
     p_success := FALSE;
     p_error_message := NULL;
     
-    SELECT id, user_id, status, coupon_id, payment_status
+    SELECT id, user_id, status, coupon_id, payment_status, created_at
     INTO v_order
     FROM orders
     WHERE id = p_order_id
@@ -53,7 +53,8 @@ BEGIN
     IF v_order.coupon_id IS NOT NULL THEN
         UPDATE coupon_usage
         SET is_reversed = TRUE, reversed_at = NOW()
-        WHERE order_id = p_order_id AND is_reversed = FALSE;
+        WHERE order_id = p_order_id AND is_reversed = FALSE
+          AND used_at >= v_order.created_at;
         
         UPDATE coupons
         SET times_used = GREATEST(0, times_used - 1)
@@ -71,6 +72,13 @@ BEGIN
         UPDATE orders SET payment_status = 'REFUND_PENDING' WHERE id = p_order_id;
     END IF;
     
+    PERFORM append_outbox_event('order', p_order_id, 'order.cancelled', jsonb_build_object(
+        'user_id', p_user_id,
+        'from_status', v_order.status::TEXT,
+        'reason', p_reason,
+        'refund_pending', v_order.payment_status = 'SUCCESS'
+    ));
+    
     p_success := TRUE;
     
     COMMIT;
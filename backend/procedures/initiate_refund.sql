@@ -103,6 +103,15 @@ BEGIN
         updated_at = NOW()
     WHERE id = p_order_id;
     
+    PERFORM append_outbox_event('refund', p_refund_id, 'refund.requested', jsonb_build_object(
+        'order_id', p_order_id,
+        'user_id', p_user_id,
+        'refund_number', p_refund_number,
+        'refund_type', p_refund_type,
+        'amount', v_refund_amount,
+        'reason', p_reason
+    ));
+    
     p_success := TRUE;
     
     COMMIT;
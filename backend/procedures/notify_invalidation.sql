@@ -0,0 +1,13 @@
+CREATE OR REPLACE FUNCTION notify_invalidation(
+    p_topic VARCHAR(30),
+    p_key TEXT
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Delivered to every listening API process when the caller's transaction
+    -- commits; identical messages within one transaction are sent once
+    PERFORM pg_notify('invalidation', p_topic || ':' || COALESCE(p_key, ''));
+END;
+$$;
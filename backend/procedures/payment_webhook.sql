@@ -18,7 +18,7 @@ BEGIN
     p_success := FALSE;
     p_error_message := NULL;
     
-    SELECT p.id, p.order_id, p.status AS payment_status, p.amount, p.attempts
+    SELECT p.id, p.order_id, p.status AS payment_status, p.amount, p.attempts, p.created_at
     INTO v_payment
     FROM payments p
     WHERE p.order_id = p_order_id AND p.transaction_id = p_transaction_id
@@ -36,7 +36,7 @@ BEGIN
         RETURN;
     END IF;
     
-    SELECT id, status, coupon_id INTO v_order
+    SELECT id, status, coupon_id, created_at INTO v_order
     FROM orders WHERE id = p_order_id FOR UPDATE;
     
     IF p_status = 'SUCCESS' OR p_event = 'payment.captured' THEN
@@ -48,7 +48,8 @@ BEGIN
         
         UPDATE payment_attempts
         SET status = 'SUCCESS', gateway_response = p_gateway_response
-        WHERE payment_id = v_payment.id AND attempt_number = v_payment.attempts;
+        WHERE payment_id = v_payment.id AND attempt_number = v_payment.attempts
+          AND created_at >= v_payment.created_at;
         
         UPDATE orders
         SET payment_status = 'SUCCESS',
@@ -56,6 +57,13 @@ BEGIN
             updated_at = NOW()
         WHERE id = p_order_id;
         
+        PERFORM append_outbox_event('payment', v_payment.id, 'payment.succeeded', jsonb_build_object(
+            'order_id', p_order_id,
+            'transaction_id', p_transaction_id,
+            'amount', v_payment.amount,
+            'event', p_event
+        ));
+        
     ELSIF p_status = 'FAILED' OR p_event = 'payment.failed' THEN
         UPDATE payments
         SET status = 'FAILED',
@@ -67,7 +75,8 @@ BEGIN
         SET status = 'FAILED',
             failure_reason = p_gateway_response,
             gateway_response = p_gateway_response
-        WHERE payment_id = v_payment.id AND attempt_number = v_payment.attempts;
+        WHERE payment_id = v_payment.id AND attempt_number = v_payment.attempts
+          AND created_at >= v_payment.created_at;
         
         UPDATE orders
         SET payment_status = 'FAILED',
@@ -84,11 +93,20 @@ BEGIN
         
         IF v_order.coupon_id IS NOT NULL THEN
             UPDATE coupon_usage SET is_reversed = TRUE, reversed_at = NOW()
-            WHERE order_id = p_order_id AND is_reversed = FALSE;
+            WHERE order_id = p_order_id AND is_reversed = FALSE
+              AND used_at >= v_order.created_at;
             
             UPDATE coupons SET times_used = GREATEST(0, times_used - 1)
             WHERE id = v_order.coupon_id;
         END IF;
+        
+        PERFORM append_outbox_event('payment', v_payment.id, 'payment.failed', jsonb_build_object(
+            'order_id', p_order_id,
+            'transaction_id', p_transaction_id,
+            'amount', v_payment.amount,
+            'event', p_event,
+            'reason', p_gateway_response
+        ));
     END IF;
     
     p_success := TRUE;
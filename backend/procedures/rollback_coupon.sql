@@ -11,10 +11,11 @@ BEGIN
     p_success := FALSE;
     p_error_message := NULL;
     
-    SELECT cu.id, cu.coupon_id, cu.discount_applied, cu.is_reversed
+    SELECT cu.id, cu.coupon_id, cu.discount_applied, cu.is_reversed, cu.used_at
     INTO v_usage
     FROM coupon_usage cu
     WHERE cu.order_id = p_order_id
+      AND cu.used_at >= (SELECT created_at FROM orders WHERE id = p_order_id)
     FOR UPDATE;
     
     IF v_usage IS NULL THEN
@@ -32,7 +33,7 @@ BEGIN
     UPDATE coupon_usage
     SET is_reversed = TRUE,
         reversed_at = NOW()
-    WHERE id = v_usage.id;
+    WHERE id = v_usage.id AND used_at = v_usage.used_at;
     
     UPDATE coupons
     SET times_used = GREATEST(0, times_used - 1)
@@ -71,6 +71,12 @@ BEGIN
         UPDATE orders SET estimated_delivery = NOW() + INTERVAL '5 days' WHERE id = p_order_id;
     END IF;
     
+    PERFORM append_outbox_event('order', p_order_id, 'order.status_changed', jsonb_build_object(
+        'from_status', v_order.status::TEXT,
+        'to_status', p_new_status,
+        'notes', p_notes
+    ));
+    
     p_success := TRUE;
     
     COMMIT;
@@ -15,7 +15,7 @@ BEGIN
     p_is_valid := FALSE;
     p_error_message := NULL;
     
-    SELECT usage_limit_total, usage_limit_per_user, times_used, is_active, valid_until
+    SELECT usage_limit_total, usage_limit_per_user, times_used, is_active, valid_from, valid_until
     INTO v_coupon
     FROM coupons
     WHERE id = p_coupon_id
@@ -54,7 +54,8 @@ BEGIN
     FROM coupon_usage
     WHERE coupon_id = p_coupon_id
       AND user_id = p_user_id
-      AND is_reversed = FALSE;
+      AND is_reversed = FALSE
+      AND used_at >= v_coupon.valid_from;
     
     p_remaining_user := v_coupon.usage_limit_per_user - v_user_usage_count;
     
@@ -17,7 +17,7 @@ BEGIN
     p_payment_status := 'PENDING';
     p_error_message := NULL;
     
-    SELECT p.id, p.order_id, p.status, p.transaction_id, p.attempts
+    SELECT p.id, p.order_id, p.status, p.transaction_id, p.amount, p.attempts, p.created_at
     INTO v_payment
     FROM payments p
     WHERE p.order_id = p_order_id
@@ -53,7 +53,8 @@ BEGIN
     UPDATE payment_attempts
     SET status = 'SUCCESS'
     WHERE payment_id = v_payment.id
-      AND attempt_number = v_payment.attempts;
+      AND attempt_number = v_payment.attempts
+      AND created_at >= v_payment.created_at;
     
     UPDATE orders
     SET payment_status = 'SUCCESS',
@@ -61,6 +62,13 @@ BEGIN
         updated_at = NOW()
     WHERE id = p_order_id;
     
+    PERFORM append_outbox_event('payment', v_payment.id, 'payment.succeeded', jsonb_build_object(
+        'order_id', p_order_id,
+        'transaction_id', p_transaction_id,
+        'amount', v_payment.amount,
+        'event', 'payment.verified'
+    ));
+    
     p_payment_status := 'SUCCESS';
     p_success := TRUE;
     
@@ -12,6 +12,8 @@ DB_CONFIG = {
 
 # List of SQL procedure files to execute
 PROCEDURE_FILES = [
+    'procedures/notify_invalidation.sql',
+    'procedures/append_outbox_event.sql',
     'procedures/add_to_cart.sql',
     'procedures/apply_coupon.sql',
     'procedures/cancel_order.sql',